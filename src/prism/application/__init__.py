@@ -5,6 +5,8 @@ from .index_queries import get_class, get_method, list_classes, get_index_stats,
 from .read_source import read_source
 from .hierarchy import get_hierarchy
 from .usages import find_usages
+from .grep import grep_sources
+from .api_diff import get_api_diff
 
 __all__ = [
     "search_api",
@@ -16,4 +18,6 @@ __all__ = [
     "read_source",
     "get_hierarchy",
     "find_usages",
+    "grep_sources",
+    "get_api_diff",
 ]
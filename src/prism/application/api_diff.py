@@ -0,0 +1,55 @@
+# Use case: precomputed API diff between release and prerelease.
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..ports import ConfigProvider, IndexRepository
+
+
+def get_api_diff(
+    config_provider: "ConfigProvider",
+    index_repository: "IndexRepository",
+    root: Path | None,
+    package_prefix: str | None = None,
+    change: str | None = None,
+    member_kind: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> tuple[dict | None, dict | None]:
+    """
+    Return ({"base", "target", "total", "summary", "changes"}, None) or (None, error_dict).
+    change: added|removed|changed; member_kind: class|method|constant (None -> all).
+    """
+    from ..domain.constants import DIFF_BASE_VERSION, DIFF_CHANGES, DIFF_MEMBER_KINDS, DIFF_TARGET_VERSION
+
+    root = root or config_provider.get_project_root()
+    change = (change or "").strip().lower() or None
+    member_kind = (member_kind or "").strip().lower() or None
+    if change is not None and change not in DIFF_CHANGES:
+        return (None, {"error": "invalid_change", "message": f"change must be one of: {', '.join(DIFF_CHANGES)}."})
+    if member_kind is not None and member_kind not in DIFF_MEMBER_KINDS:
+        return (None, {"error": "invalid_kind", "message": f"kind must be one of: {', '.join(DIFF_MEMBER_KINDS)}."})
+    for version in (DIFF_BASE_VERSION, DIFF_TARGET_VERSION):
+        if not config_provider.get_db_path(root, version).is_file():
+            return (None, {"error": "no_db", "message": f"Database for version {version} does not exist."})
+    limit = max(1, min(limit, 500))
+    offset = max(0, offset)
+    result = index_repository.get_api_diff(
+        config_provider.get_db_path(root, DIFF_TARGET_VERSION),
+        package_prefix=(package_prefix or "").strip() or None,
+        change=change,
+        member_kind=member_kind,
+        limit=limit,
+        offset=offset,
+    )
+    if result is None:
+        return (None, {"error": "no_diff", "message": "No API diff stored. Re-index both versions (ctx db --all)."})
+    changes, total, summary = result
+    return ({
+        "base": DIFF_BASE_VERSION,
+        "target": DIFF_TARGET_VERSION,
+        "total": total,
+        "summary": summary,
+        "changes": changes,
+    }, None)
@@ -0,0 +1,178 @@
+# Use case: regex search over the decompiled sources, narrowed by the trigram index of the DB.
+
+import fnmatch
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..ports import ConfigProvider, IndexRepository
+
+# Most lines of context returned before and after each match
+GREP_MAX_CONTEXT = 10
+
+
+def _skip_class(pattern: str, i: int) -> int:
+    """Index just past the character class that starts at pattern[i] ('[')."""
+    j = i + 1
+    if j < len(pattern) and pattern[j] == "^":
+        j += 1
+    if j < len(pattern) and pattern[j] == "]":
+        j += 1
+    while j < len(pattern) and pattern[j] != "]":
+        j += 2 if pattern[j] == "\\" else 1
+    return j + 1
+
+
+def _skip_escape(pattern: str, i: int) -> int:
+    """Index just past the escape that starts at pattern[i] ('\\'), digits included (\\x41, \\u0041, \\N{...}, \\012)."""
+    escaped = pattern[i + 1 : i + 2]
+    j = i + 2
+    if escaped in ("x", "u", "U"):
+        return j + {"x": 2, "u": 4, "U": 8}[escaped]
+    if escaped == "N" and pattern[j : j + 1] == "{":
+        end = pattern.find("}", j)
+        return end + 1 if end != -1 else len(pattern)
+    if escaped.isdigit():
+        # Octal escape (\\0, \\012) or group reference (\\1, \\12): at most three digits
+        while j < len(pattern) and j < i + 4 and pattern[j].isdigit():
+            j += 1
+    return j
+
+
+def required_literals(pattern: str) -> list[str]:
+    """
+    Literal substrings that every match of the regex must contain. Conservative: only runs of plain
+    characters outside groups count, a character made optional by ?, * or {..} is dropped, and a
+    top-level | means nothing is required ([]).
+    """
+    literals: list[str] = []
+    run: list[str] = []
+    depth = 0
+    i = 0
+
+    def flush() -> None:
+        if run:
+            literals.append("".join(run))
+            run.clear()
+
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            if depth == 0 and escaped and not escaped.isalnum():
+                run.append(escaped)
+            else:
+                flush()  # \w, \d, \b, \n, \x41, ... or inside a group
+            i = _skip_escape(pattern, i)
+            continue
+        if ch == "[":
+            flush()
+            i = _skip_class(pattern, i)
+            continue
+        if ch in "*?{":
+            if run:
+                run.pop()
+            flush()
+            if ch == "{":
+                end = pattern.find("}", i)
+                i = end + 1 if end != -1 else len(pattern)
+            else:
+                i += 1
+            continue
+        if ch == "|" and depth == 0:
+            return []
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        if ch in "()|.^$+" or depth > 0:
+            flush()
+        else:
+            run.append(ch)
+        i += 1
+    flush()
+    return literals
+
+
+def _match_lines(regex: re.Pattern, content: str) -> list[int]:
+    """1-based numbers of the lines where a match starts, in order, each once."""
+    lines = []
+    line = 1
+    pos = 0
+    for m in regex.finditer(content):
+        line += content.count("\n", pos, m.start())
+        pos = m.start()
+        if not lines or lines[-1] != line:
+            lines.append(line)
+    return lines
+
+
+def grep_sources(
+    config_provider: "ConfigProvider",
+    index_repository: "IndexRepository",
+    root: Path | None,
+    version: str,
+    pattern: str,
+    glob: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    context: int = 0,
+    ignore_case: bool = False,
+) -> tuple[dict | None, dict | None]:
+    """
+    Regex search (Python re, multiline) over the decompiled sources of a version, one result per
+    matching line: {"file_path", "line", "content"} plus "before"/"after" with context lines.
+    The trigram index built by ctx db narrows the files to read when the pattern has a literal of
+    3+ characters; otherwise (or for indexes without it) every source is scanned.
+    glob filters relative paths (fnmatch, e.g. "*/player/*.java"). offset skips matches (pagination).
+    Returns ({"matches", "files_scanned", "indexed"}, None) or (None, error_dict).
+    """
+    from ..domain.constants import normalize_version
+
+    root = root or config_provider.get_project_root()
+    version = normalize_version(version)
+    if not (pattern or "").strip():
+        return (None, {"error": "missing_params", "message": "pattern is required"})
+    try:
+        regex = re.compile(pattern, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+    except re.error as e:
+        return (None, {"error": "invalid_pattern", "message": f"Invalid regex: {e}"})
+    store = config_provider.get_source_store(root, version)
+    if not store.exists():
+        return (None, {"error": "no_source", "message": f"Source directory for {version} not found."})
+    limit = max(1, min(limit, 500))
+    offset = max(0, offset)
+    context = max(0, min(context, GREP_MAX_CONTEXT))
+
+    # Verbose patterns ignore whitespace, so their plain runs are not literals of the match
+    literals = [] if regex.flags & re.VERBOSE else required_literals(pattern)
+    candidates = index_repository.get_grep_candidates(config_provider.get_db_path(root, version), literals)
+    files = candidates if candidates is not None else sorted(store.iter_files(".java"))
+
+    matches: list[dict] = []
+    skipped = files_scanned = 0
+    for rel_path in files:
+        if glob and not fnmatch.fnmatch(rel_path, glob):
+            continue
+        try:
+            content = store.read_text(rel_path)
+        except Exception:
+            continue
+        files_scanned += 1
+        line_numbers = _match_lines(regex, content)
+        if not line_numbers:
+            continue
+        lines = content.splitlines()
+        for line_no in line_numbers:
+            if skipped < offset:
+                skipped += 1
+                continue
+            match = {"file_path": rel_path, "line": line_no, "content": lines[line_no - 1].strip() if line_no <= len(lines) else ""}
+            if context:
+                match["before"] = lines[max(0, line_no - 1 - context) : line_no - 1]
+                match["after"] = lines[line_no : line_no + context]
+            matches.append(match)
+            if len(matches) >= limit:
+                return ({"matches": matches, "files_scanned": files_scanned, "indexed": candidates is not None}, None)
+    return ({"matches": matches, "files_scanned": files_scanned, "indexed": candidates is not None}, None)
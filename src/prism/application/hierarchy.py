@@ -62,7 +62,7 @@ def _find_class_by_name_or_fqcn(conn, name_ref, current_package):
         if res: return res
         
         # Search globally if unique
-        rows = db.search_fts(conn, name_ref, limit=2)
+        rows = db.search_fts(conn, name_ref, limit=2, subwords=False)
         if len(rows) == 1 or (len(rows) > 1 and all(r["class_name"] == name_ref for r in rows)):
              # Heuristic: if only one class with that name exists, it's likely that one
              return db.get_class_and_methods(conn, rows[0]["package"], rows[0]["class_name"])
@@ -91,33 +91,45 @@ def get_index_stats(
     root: Path | None,
     version: str | None,
 ) -> tuple[dict | None, dict | None]:
-    """Return ({"version", "classes", "methods"}, None) or (None, error_dict)."""
-    from ..infrastructure import config_impl as _config
+    """
+    Return ({"version", "classes", "methods", "constants", "build"}, None) or (None, error_dict).
+    Counts and build come from the build_info of the index (no table scans); build is None for
+    indexes built before it existed, whose counts are computed instead.
+    """
     from ..domain.constants import normalize_version
 
     root = root or config_provider.get_project_root()
-    cfg = config_provider.load_config(root)
     resolved_version = version
     if resolved_version is None:
-        resolved_version = cfg.get(_config.CONFIG_KEY_ACTIVE_SERVER) or "release"
+        resolved_version = config_provider.get_active_server(root) or "release"
     resolved_version = normalize_version(resolved_version)
     db_path = config_provider.get_db_path(root, resolved_version)
     if not db_path.is_file():
         return (None, {"error": "no_db", "message": f"Database for version {resolved_version or 'active'} does not exist. Run prism index first."})
-    classes, methods, constants = index_repository.get_stats(db_path)
-    return ({"version": resolved_version, "classes": classes, "methods": methods, "constants": constants}, None)
+    info = index_repository.get_build_info(db_path)
+    if info is not None and all(k in info for k in ("classes", "methods", "constants")):
+        classes, methods, constants = info["classes"], info["methods"], info["constants"]
+    else:
+        classes, methods, constants = index_repository.get_stats(db_path)
+    build = None
+    if info is not None:
+        build = {k: v for k, v in info.items() if k not in ("classes", "methods", "constants")}
+    return (
+        {"version": resolved_version, "classes": classes, "methods": methods, "constants": constants, "build": build},
+        None,
+    )
 
 
 def get_context_list(config_provider: "ConfigProvider", root: Path | None) -> dict:
-    """Return {"indexed": [...], "active": "release"|"prerelease"}."""
-    from ..infrastructure import config_impl as _config
+    """Return {"indexed": [...], "active": "release"|"prerelease", "builds": [archived build names]}."""
+    from ..infrastructure import build_archive as _builds
     from ..domain.constants import VALID_SERVER_VERSIONS
 
     root = root or config_provider.get_project_root()
-    cfg = config_provider.load_config(root)
-    active = cfg.get(_config.CONFIG_KEY_ACTIVE_SERVER) or "release"
+    active = config_provider.get_active_server(root) or "release"
     indexed = [
         v for v in VALID_SERVER_VERSIONS
         if config_provider.get_db_path(root, v).is_file()
     ]
-    return {"indexed": indexed, "active": active}
+    builds = [b["name"] for b in _builds.list_builds(root)]
+    return {"indexed": indexed, "active": active, "builds": builds}
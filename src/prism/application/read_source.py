@@ -1,4 +1,4 @@
-# Use case: read decompiled Java source file (with optional line range).
+# Use case: read decompiled Java source file (with optional line range) from the source store.
 
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -26,15 +26,16 @@ def read_source(
     path_str = (file_path or "").strip().replace("\\", "/").lstrip("/")
     if not path_str:
         return {"error": "missing_path", "message": "file_path is required"}
-    root = root or config_provider.get_project_root()
-    decompiled_dir = config_provider.get_decompiled_dir(root, version).resolve()
-    full_path = (decompiled_dir / path_str).resolve()
-    if not full_path.is_relative_to(decompiled_dir):
+    from ..infrastructure.source_store import normalize_rel_path
+
+    if normalize_rel_path(path_str) is None:
         return {"error": "invalid_path", "message": "file_path must be inside decompiled directory"}
-    if not full_path.is_file():
+    root = root or config_provider.get_project_root()
+    store = config_provider.get_source_store(root, version)
+    if not store.is_file(path_str):
         return {"error": "not_found", "message": f"File not found: {path_str}"}
     try:
-        content = full_path.read_text(encoding="utf-8", errors="replace")
+        content = store.read_text(path_str)
     except OSError as e:
         return {"error": "read_error", "message": str(e)}
     lines = content.splitlines()
@@ -19,10 +19,11 @@ def search_api(
     kind: str | None = None,
     unique_classes: bool = False,
     t: callable = None,
+    offset: int = 0,
 ) -> tuple[list[dict], dict | None]:
     """
     Run FTS5 search. Returns (results, None) on success or ([], error_dict) on failure.
-    t: optional i18n translate function for error messages.
+    t: optional i18n translate function for error messages. offset: results to skip (pagination).
     """
     from ..domain.constants import normalize_version
 
@@ -30,6 +31,7 @@ def search_api(
     version = normalize_version(version)
     term = (query or "").strip()
     limit = max(1, min(limit, 500))
+    offset = max(0, offset)
     db_path = config_provider.get_db_path(root, version)
     if not db_path.is_file():
         msg = f"Database for version {version} does not exist. Run prism index first."
@@ -38,7 +40,7 @@ def search_api(
         return ([], {"error": "no_db", "message": msg})
     try:
         results = index_repository.search(
-            db_path, term, limit=limit, package_prefix=package_prefix, kind=kind, unique_classes=unique_classes
+            db_path, term, limit=limit, package_prefix=package_prefix, kind=kind, unique_classes=unique_classes, offset=offset
         )
         return (list(results), None)
     except sqlite3.OperationalError as e:
@@ -15,18 +15,20 @@ def find_usages(
     version: str,
     target_class: str,
     limit: int = 100,
+    offset: int = 0,
 ) -> tuple[list[dict], dict | None]:
     """
     Search for usages of a class name in the decompiled Java source.
+    offset skips that many usages (pagination; files are walked in a stable order).
     Returns (results, None) or ([], error_dict).
     """
     from ..domain.constants import normalize_version
 
     root = root or config_provider.get_project_root()
     version = normalize_version(version)
-    source_dir = config_provider.get_decompiled_dir(root, version)
+    store = config_provider.get_source_store(root, version)
 
-    if not source_dir.is_dir():
+    if not store.exists():
         return ([], {"error": "no_source", "message": f"Source directory for {version} not found."})
 
     # We look for the class name. If it's a FQCN, we can try to be more specific.
@@ -44,11 +46,12 @@ def find_usages(
         
         # Simple implementation using python walking for maximum compatibility
         count = 0
-        for path in source_dir.rglob("*.java"):
+        skipped = 0
+        for rel_path in store.iter_files(".java"):
             if count >= limit:
                 break
             try:
-                content = path.read_text(encoding="utf-8", errors="replace")
+                content = store.read_text(rel_path)
                 # Look for the term as a whole word
                 # If target_class is FQCN, also check for it
                 pattern = r"\b" + re.escape(search_term) + r"\b"
@@ -57,10 +60,12 @@ def find_usages(
                 
                 matches = list(re.finditer(pattern, content))
                 if matches:
-                    rel_path = str(path.relative_to(source_dir)).replace("\\", "/")
                     # Extract lines for context
                     lines = content.splitlines()
                     for m in matches:
+                        if skipped < offset:
+                            skipped += 1
+                            continue
                         line_no = content.count("\n", 0, m.start()) + 1
                         results.append({
                             "file_path": rel_path,
@@ -1,7 +1,13 @@
-# Shared domain constants (server versions).
+# Shared domain constants (server versions, API diff).
 
 VALID_SERVER_VERSIONS = ("release", "prerelease")
 
+# API diff: what changed in DIFF_TARGET_VERSION with respect to DIFF_BASE_VERSION
+DIFF_BASE_VERSION = "release"
+DIFF_TARGET_VERSION = "prerelease"
+DIFF_CHANGES = ("added", "removed", "changed")
+DIFF_MEMBER_KINDS = ("class", "method", "constant")
+
 
 def normalize_version(version: str | None) -> str:
     """
@@ -1,6 +1,13 @@
 # Entrypoints: CLI and MCP server (use application + infrastructure).
 
 from .cli import main
-from .mcp_server import run
 
-__all__ = ["main", "run"]
\ No newline at end of file
+
+def run(*args, **kwargs) -> None:
+    """Starts the MCP server (see mcp_server.run). Imported on demand: mcp is slow to import."""
+    from .mcp_server import run as _run
+
+    _run(*args, **kwargs)
+
+
+__all__ = ["main", "run"]
@@ -6,14 +6,31 @@ from pathlib import Path
 from ...domain.constants import VALID_SERVER_VERSIONS, normalize_version
 
 VERSION_FLAG_ALL = ("--all", "-a")
+INIT_STREAM_FLAGS = ("--stream", "-s")
+PRUNE_STRATEGY_FLAGS = ("--strategy",)
+PRUNE_FULL_FLAGS = ("--full",)
+PRUNE_JOBS_FLAGS = ("--jobs",)
+PACK_DROP_TREE_FLAGS = ("--drop-tree",)
+DB_FROM_JAR_FLAGS = ("--from-jar",)
+DB_FTS_PROFILE_FLAGS = ("--fts-profile",)
 QUERY_JSON_FLAGS = ("--json", "-j")
 QUERY_LIMIT_FLAGS = ("--limit", "-n")
+QUERY_BATCH_FLAGS = ("--batch", "-b")
+DIFF_PACKAGE_FLAGS = ("--package",)
+DIFF_CHANGE_FLAGS = ("--change",)
+DIFF_KIND_FLAGS = ("--kind",)
+DIFF_OFFSET_FLAGS = ("--offset",)
+BENCH_THRESHOLD_FLAGS = ("--threshold",)
+BENCH_RUNS_FLAGS = ("--runs",)
 MCP_HTTP_FLAGS = ("--http", "-H")
 MCP_PORT_FLAGS = ("--port", "-p")
 MCP_HOST_FLAGS = ("--host",)
+MCP_NO_WARMUP_FLAGS = ("--no-warmup",)
 ENV_MCP_TRANSPORT = "MCP_TRANSPORT"
 ENV_MCP_PORT = "MCP_PORT"
 ENV_MCP_HOST = "MCP_HOST"
+# "0", "false", "no" or "off" disables the MCP warm-up phase
+ENV_MCP_WARMUP = "MCP_WARMUP"
 
 
 def parse_version_arg(args: list[str], start_index: int) -> tuple[str | None, bool]:
@@ -32,6 +49,31 @@ def parse_version_arg(args: list[str], start_index: int) -> tuple[str | None, bo
     return (None, True)
 
 
+def pop_flag(args: list[str], flags: tuple[str, ...], start_index: int = 0) -> tuple[list[str], bool]:
+    """
+    Removes every occurrence of the given flags from args[start_index:].
+    Returns (remaining_args, found) so positional parsing (e.g. parse_version_arg) is unaffected.
+    """
+    head, tail = args[:start_index], args[start_index:]
+    remaining = [a for a in tail if a not in flags]
+    return (head + remaining, len(remaining) != len(tail))
+
+
+def pop_option(args: list[str], flags: tuple[str, ...], start_index: int = 0) -> tuple[list[str], str | None]:
+    """
+    Removes an option that takes a value (e.g. --strategy hardlink) from args[start_index:].
+    Returns (remaining_args, value); value is None if the option is absent, "" if it has no value.
+    """
+    head, tail = args[:start_index], list(args[start_index:])
+    value = None
+    for i, a in enumerate(tail):
+        if a in flags:
+            value = tail[i + 1].strip() if i + 1 < len(tail) else ""
+            del tail[i : i + 2]
+            break
+    return (head + tail, value)
+
+
 def parse_query_args(args: list[str]) -> tuple[str | None, str, int, bool]:
     """
     Parses arguments from the query command (starting from args[1]).
@@ -67,11 +109,11 @@ def parse_query_args(args: list[str]) -> tuple[str | None, str, int, bool]:
     return (term, version, limit, output_json)
 
 
-def parse_mcp_args(args: list[str], start_index: int) -> tuple[str, str, int]:
+def parse_mcp_args(args: list[str], start_index: int) -> tuple[str, str, int, bool]:
     """
     Parses arguments from the mcp command (starting from args[start_index]).
-    Also reads MCP_TRANSPORT, MCP_HOST, MCP_PORT (CLI overrides environment variables).
-    Returns (transport, host, port). transport: "stdio" | "streamable-http".
+    Also reads MCP_TRANSPORT, MCP_HOST, MCP_PORT, MCP_WARMUP (CLI overrides environment variables).
+    Returns (transport, host, port, warmup). transport: "stdio" | "streamable-http".
     """
     transport = "stdio"
     host = "0.0.0.0"
@@ -85,6 +127,7 @@ def parse_mcp_args(args: list[str], start_index: int) -> tuple[str, str, int]:
     except ValueError:
         pass
     host = os.environ.get(ENV_MCP_HOST, "0.0.0.0").strip() or "0.0.0.0"
+    warmup = os.environ.get(ENV_MCP_WARMUP, "").strip().lower() not in ("0", "false", "no", "off")
     i = start_index
     while i < len(args):
         a = args[i]
@@ -107,8 +150,11 @@ def parse_mcp_args(args: list[str], start_index: int) -> tuple[str, str, int]:
                 i += 2
             else:
                 i += 1
+        elif a in MCP_NO_WARMUP_FLAGS:
+            warmup = False
+            i += 1
         elif a.startswith("-"):
             i += 1
         else:
             i += 1
-    return (transport, host, port)
+    return (transport, host, port, warmup)
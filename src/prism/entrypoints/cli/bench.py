@@ -0,0 +1,102 @@
+# bench command: CLI startup time per command (import cost, measured in fresh interpreters).
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from ... import i18n
+
+from . import args as cli_args
+from . import out
+
+# Command -> CLI module its dispatch imports (see main.COMMANDS)
+STARTUP_COMMANDS = {
+    "help": "help",
+    "query": "query",
+    "diff": "diff",
+    "mcp": "mcp_cmd",
+    "daemon": "daemon_cmd",
+    "context": "context",
+    "lang": "lang",
+    "config": "config_cmd",
+}
+# Regression threshold: median import time per command, in milliseconds
+STARTUP_THRESHOLD_MS = 100.0
+# Fresh interpreters started per command (the median is reported)
+STARTUP_RUNS = 5
+
+_SRC_DIR = Path(__file__).resolve().parents[3]
+
+# Runs in the child interpreter: imports the CLI entry point plus one command module
+_PROBE = """
+import importlib, sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import prism.entrypoints.cli.main
+importlib.import_module("prism.entrypoints.cli." + {module!r})
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def _sample(module: str) -> float:
+    """Import time (ms) of the CLI entry point + module in a new interpreter."""
+    code = _PROBE.format(src=str(_SRC_DIR), module=module)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(runs: int = STARTUP_RUNS) -> dict[str, dict]:
+    """{command: {"module", "median_ms", "min_ms", "max_ms"}} over runs fresh interpreters each."""
+    results = {}
+    for command, module in STARTUP_COMMANDS.items():
+        samples = [_sample(module) for _ in range(runs)]
+        results[command] = {
+            "module": module,
+            "median_ms": round(statistics.median(samples), 1),
+            "min_ms": round(min(samples), 1),
+            "max_ms": round(max(samples), 1),
+        }
+    return results
+
+
+def cmd_bench_startup(
+    threshold_ms: float = STARTUP_THRESHOLD_MS,
+    runs: int = STARTUP_RUNS,
+    output_json: bool = False,
+) -> int:
+    """
+    Measures the import time of every command and compares the medians with threshold_ms.
+    Returns 1 if any command is slower (usable as a regression check in CI), else 0.
+    """
+    results = measure_startup(runs)
+    slow = [command for command, r in results.items() if r["median_ms"] > threshold_ms]
+    if output_json:
+        print(json.dumps({"threshold_ms": threshold_ms, "runs": runs, "commands": results, "slow": slow}, ensure_ascii=False))
+        return 1 if slow else 0
+    print(i18n.t("cli.bench.header", runs=runs, threshold=threshold_ms))
+    for command, r in results.items():
+        print(i18n.t("cli.bench.row", command=f"{command:<8}", median=r["median_ms"], min=r["min_ms"], max=r["max_ms"]))
+    if slow:
+        out.error(i18n.t("cli.bench.slow", commands=", ".join(slow), threshold=threshold_ms))
+        return 1
+    out.success(i18n.t("cli.bench.ok", threshold=threshold_ms))
+    return 0
+
+
+def run_bench(args: list[str], root: Path) -> int:
+    """Dispatch of the bench command (startup [--threshold MS] [--runs N] [--json])."""
+    if len(args) < 2 or args[1].lower() != "startup":
+        print(i18n.t("cli.bench.usage"), file=sys.stderr)
+        return 1
+    args, output_json = cli_args.pop_flag(args, cli_args.QUERY_JSON_FLAGS, 2)
+    args, threshold_raw = cli_args.pop_option(args, cli_args.BENCH_THRESHOLD_FLAGS, 2)
+    args, runs_raw = cli_args.pop_option(args, cli_args.BENCH_RUNS_FLAGS, 2)
+    try:
+        threshold_ms = float(threshold_raw) if threshold_raw is not None else STARTUP_THRESHOLD_MS
+        runs = max(1, int(runs_raw)) if runs_raw is not None else STARTUP_RUNS
+    except ValueError:
+        print(i18n.t("cli.bench.usage"), file=sys.stderr)
+        return 1
+    return cmd_bench_startup(threshold_ms, runs, output_json)
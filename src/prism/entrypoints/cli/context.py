@@ -1,4 +1,4 @@
-# context / ctx commands: detect, init, clean, reset, decompile, prune, db, list, use.
+# context / ctx commands: detect, init, clean, reset, decompile, prune, pack, dedup, db, build, list, use.
 
 import os
 import sys
@@ -7,12 +7,12 @@ from pathlib import Path
 from ...application import get_context_list
 from ... import i18n
 from ...domain.constants import VALID_SERVER_VERSIONS
+from ...infrastructure import build_archive
 from ...infrastructure import config_impl
-from ...infrastructure import decompile
+from ...infrastructure import content_store
 from ...infrastructure import detection
-from ...infrastructure import extractor
 from ...infrastructure import file_config
-from ...infrastructure import prune
+from ...infrastructure import source_store
 from ...infrastructure import workspace_cleanup
 
 from . import args as cli_args
@@ -90,8 +90,60 @@ def _resolve_context_versions(root: Path, version: str | None) -> list[str] | No
     return versions if versions else None
 
 
-def cmd_context_init(root: Path | None = None, version: str | None = None) -> int:
-    """Full pipeline: detect (always at start) → decompile (JADX only) → prune → db. version=None -> all."""
+def _run_streaming_init(
+    root: Path, versions_list: list[str], fts_profile: str | None = None, prune_strategy: str | None = None
+) -> int:
+    """ctx init --stream: JADX, prune (with prune_strategy) and index overlap per version (see stream_pipeline)."""
+    from ...infrastructure import stream_pipeline
+
+    print(i18n.t("cli.decompile.may_take"))
+    missing = False
+    for v in versions_list:
+        out.phase(i18n.t("cli.build.phase_stream", version=v))
+        ok, payload = stream_pipeline.run_streaming_init_for_version(root, v, fts_profile, prune_strategy)
+        if ok:
+            classes, methods, constants = payload["stats"]
+            dest = config_impl.get_decompiled_dir(root, v)
+            print(i18n.t("cli.prune.done", files=payload["files"], dest=dest, subdir=payload["source_subdir"]))
+            out.success(i18n.t("cli.build.indexed", version=v, classes=classes, methods=methods, constants=constants))
+            if payload["failed"]:
+                out.error(i18n.t("cli.build.stream_failed_files", count=len(payload["failed"]), dest=dest, example=payload["failed"][0]))
+                missing = True
+        elif payload == "no_decompiled":
+            print(i18n.t("cli.build.skipped_no_code", version=v))
+        elif payload == "db_error":
+            out.error(i18n.t("cli.index.db_error"))
+            return 1
+        else:
+            out.error(i18n.t("cli.build.decompile_failed"))
+            out.error(i18n.t(f"cli.decompile.{payload}"))
+            return 1
+    if missing:
+        return 1
+    out.success(i18n.t("cli.build.success"))
+    return 0
+
+
+def cmd_context_init(
+    root: Path | None = None,
+    version: str | None = None,
+    stream: bool = False,
+    prune_strategy: str | None = None,
+    prune_incremental: bool = True,
+    prune_jobs: int | None = None,
+    fts_profile: str | None = None,
+) -> int:
+    """
+    Full pipeline: detect (always at start) → decompile (JADX only) → prune → db. version=None -> all.
+    stream=True overlaps the three stages: files are pruned and indexed as JADX writes them
+    (prune_strategy applies; prune_jobs is rejected, files are placed one at a time).
+    prune_strategy / prune_incremental / prune_jobs are passed to the prune stage (see cmd_prune);
+    fts_profile to the db stage (see cmd_index).
+    """
+    from ...infrastructure import decompile
+    from ...infrastructure import extractor
+    from ...infrastructure import prune
+
     root = root or config_impl.get_project_root()
     # Always run detect first (same as ctx detect) to ensure JAR and config are up to date.
     if cmd_init(root) != 0:
@@ -100,6 +152,8 @@ def cmd_context_init(root: Path | None = None, version: str | None = None) -> in
     if not versions_list:
         out.error(i18n.t("cli.decompile.no_jar"))
         return 1
+    if stream:
+        return _run_streaming_init(root, versions_list, fts_profile, prune_strategy)
 
     out.phase(i18n.t("cli.build.phase_decompile"))
     print(i18n.t("cli.decompile.may_take"))
@@ -110,7 +164,9 @@ def cmd_context_init(root: Path | None = None, version: str | None = None) -> in
         return 1
     out.phase(i18n.t("cli.build.phase_decompile_done"))
 
-    success, err = prune.run_prune_only(root, versions=versions_list)
+    success, err = prune.run_prune_only(
+        root, versions=versions_list, strategy=prune_strategy, incremental=prune_incremental, jobs=prune_jobs
+    )
     if not success:
         out.error(i18n.t("cli.prune." + err))
         return 1
@@ -118,7 +174,7 @@ def cmd_context_init(root: Path | None = None, version: str | None = None) -> in
     out.phase(i18n.t("cli.build.phase_index"))
     for v in versions_list:
         out.phase(i18n.t("cli.build.indexing_version", version=v))
-        ok, payload = extractor.run_index(root, v)
+        ok, payload = extractor.run_index(root, v, fts_profile)
         if ok:
             classes, methods, constants = payload
             out.success(i18n.t("cli.build.indexed", version=v, classes=classes, methods=methods, constants=constants))
@@ -162,6 +218,8 @@ def cmd_context_reset(root: Path | None = None) -> int:
 
 def cmd_context_decompile(root: Path | None = None, version: str | None = None) -> int:
     """Only JADX → decompiled_raw (without prune). version=None -> all."""
+    from ...infrastructure import decompile
+
     root = root or config_impl.get_project_root()
     versions = None if version is None else [version]
     print(i18n.t("cli.decompile.may_take"))
@@ -173,11 +231,24 @@ def cmd_context_decompile(root: Path | None = None, version: str | None = None)
     return 1
 
 
-def cmd_prune(root: Path | None = None, version: str | None = None) -> int:
-    """Only prune (raw → decompiled). version=None -> all that have raw."""
+def cmd_prune(
+    root: Path | None = None,
+    version: str | None = None,
+    strategy: str | None = None,
+    incremental: bool = True,
+    jobs: int | None = None,
+) -> int:
+    """
+    Only prune (raw → decompiled). version=None -> all that have raw.
+    strategy: auto|reflink|hardlink|move|copy (None -> prune_strategy from config).
+    incremental=False rebuilds decompiled/<version> instead of syncing changed files.
+    jobs: copy threads (None -> prune_jobs from config, default 1 = serial).
+    """
+    from ...infrastructure import prune
+
     root = root or config_impl.get_project_root()
     versions = None if version is None else [version]
-    success, err = prune.run_prune_only(root, versions=versions)
+    success, err = prune.run_prune_only(root, versions=versions, strategy=strategy, incremental=incremental, jobs=jobs)
     if success:
         if version:
             out.success(i18n.t("cli.prune.success", version=version))
@@ -188,23 +259,108 @@ def cmd_prune(root: Path | None = None, version: str | None = None) -> int:
     return 1
 
 
-def cmd_index(root: Path | None = None, version: str | None = None) -> int:
-    """Indexes into the DB. version=None -> release and prerelease."""
+def cmd_pack(root: Path | None = None, version: str | None = None, drop_tree: bool = False) -> int:
+    """
+    Packs decompiled/<version> into one archive (workspace/decompiled/<version>.zip) that read_source,
+    usages and the indexer read with random access. version=None -> all with decompiled code.
+    drop_tree=True deletes the directory tree afterwards (slim images / backups).
+    """
+    import shutil
+
+    root = root or config_impl.get_project_root()
+    versions = [version] if version is not None else list(VALID_SERVER_VERSIONS)
+    packed_any = False
+    for v in versions:
+        decompiled_dir = config_impl.get_decompiled_dir(root, v)
+        if not any(source_store.DirectorySourceStore(decompiled_dir).iter_files(".java")):
+            if version is not None:
+                out.error(i18n.t("cli.index.no_decompiled"))
+                return 1
+            continue
+        archive_path = config_impl.get_source_archive_path(root, v)
+        stats = source_store.pack_sources(decompiled_dir, archive_path)
+        packed_any = True
+        out.success(i18n.t(
+            "cli.pack.done",
+            version=v,
+            files=stats["files"],
+            size_mb=f"{stats['bytes'] / (1024 * 1024):.1f}",
+            packed_mb=f"{stats['packed_bytes'] / (1024 * 1024):.1f}",
+            path=archive_path,
+        ))
+        if drop_tree:
+            shutil.rmtree(decompiled_dir)
+            print(i18n.t("cli.pack.tree_removed", path=decompiled_dir))
+    if not packed_any:
+        out.error(i18n.t("cli.index.no_decompiled"))
+        return 1
+    return 0
+
+
+def cmd_dedup(root: Path | None = None, version: str | None = None) -> int:
+    """
+    Moves decompiled/<version> into the shared content-addressed store (workspace/objects):
+    identical files across versions become hardlinks to one object, and each version gets a
+    manifest in workspace/manifests. Unreferenced objects are removed. version=None -> all.
+    """
+    root = root or config_impl.get_project_root()
+    versions = [version] if version is not None else list(VALID_SERVER_VERSIONS)
+    deduped_any = False
+    for v in versions:
+        stats = content_store.dedup_version(root, v)
+        if stats is None:
+            if version is not None:
+                out.error(i18n.t("cli.index.no_decompiled"))
+                return 1
+            continue
+        deduped_any = True
+        out.success(i18n.t(
+            "cli.dedup.done",
+            version=v,
+            files=stats["files"],
+            new_objects=stats["new_objects"],
+            shared=stats["shared"],
+            saved_mb=f"{stats['saved_bytes'] / (1024 * 1024):.1f}",
+        ))
+    if not deduped_any:
+        out.error(i18n.t("cli.index.no_decompiled"))
+        return 1
+    kept, removed = content_store.gc_objects(root)
+    print(i18n.t("cli.dedup.objects", objects=kept, removed=removed, path=content_store.get_objects_dir(root)))
+    return 0
+
+
+def cmd_index(
+    root: Path | None = None,
+    version: str | None = None,
+    from_jar: bool = False,
+    fts_profile: str | None = None,
+) -> int:
+    """
+    Indexes into the DB. version=None -> release and prerelease.
+    from_jar=True reads the .class files of the server JAR instead of the decompiled sources.
+    fts_profile: FTS layout (see db.FTS_PROFILES); None uses fts_profile from .prism.json.
+    """
+    from ...infrastructure import extractor
+
     root = root or config_impl.get_project_root()
     if version is not None and version not in VALID_SERVER_VERSIONS:
         out.error(i18n.t("cli.context.use.invalid"))
         return 1
+    run = extractor.run_index_from_jar if from_jar else extractor.run_index
+    # Nothing to index for this version: skipped when indexing all versions
+    missing = ("no_jar", "no_classes") if from_jar else ("no_decompiled",)
     if version is None:
         for v in VALID_SERVER_VERSIONS:
-            ok, payload = extractor.run_index(root, v)
+            ok, payload = run(root, v, fts_profile)
             if ok:
                 classes, methods, constants = payload
                 out.success(i18n.t("cli.index.success", classes=classes, methods=methods, constants=constants, version=v))
-            elif payload != "no_decompiled":
+            elif payload not in missing:
                 out.error(i18n.t("cli.index.db_error"))
                 return 1
         return 0
-    success, payload = extractor.run_index(root, version)
+    success, payload = run(root, version, fts_profile)
     if success:
         classes, methods, constants = payload
         out.success(i18n.t("cli.index.success", classes=classes, methods=methods, constants=constants, version=version))
@@ -213,6 +369,99 @@ def cmd_index(root: Path | None = None, version: str | None = None) -> int:
     return 1
 
 
+def cmd_optimize(root: Path | None = None, version: str | None = None) -> int:
+    """
+    Optimizes the index DB (FTS segment merge, ANALYZE, VACUUM) and prints size and query
+    latency before/after. ctx db runs it automatically; this is for DBs built before that or
+    touched since. version=None -> every indexed version.
+    """
+    from ...infrastructure import db_optimize
+
+    root = root or config_impl.get_project_root()
+    versions = [version] if version is not None else list(VALID_SERVER_VERSIONS)
+    optimized_any = False
+    for v in versions:
+        ok, payload = db_optimize.run_optimize(root, v)
+        if ok:
+            optimized_any = True
+            out.success(i18n.t("cli.optimize.done", version=v, **db_optimize.summary_params(payload)))
+        elif payload == "db_error":
+            out.error(i18n.t("cli.index.db_error"))
+            return 1
+    if not optimized_any:
+        out.error(i18n.t("cli.optimize.no_db"))
+        return 1
+    return 0
+
+
+def cmd_build_add(root: Path | None, name: str, version: str) -> int:
+    """Archives the current index of <version> as a named game build."""
+    root = root or config_impl.get_project_root()
+    ok, result = build_archive.add_build(root, name, version)
+    if not ok:
+        if result == "no_db":
+            out.error(i18n.t("cli.query.no_db", version=version))
+        else:
+            out.error(i18n.t(f"cli.build.{result}", name=name))
+        return 1
+    out.success(i18n.t(
+        "cli.build.added",
+        name=name,
+        version=version,
+        classes=result["classes"],
+        methods=result["methods"],
+        constants=result["constants"],
+    ))
+    print(i18n.t(
+        "cli.build.storage",
+        new_records=result["new_records"],
+        size_mb=f"{result['archive_bytes'] / (1024 * 1024):.1f}",
+    ))
+    if not result["sources"]:
+        print(i18n.t("cli.build.no_sources"))
+    return 0
+
+
+def cmd_build_list(root: Path | None = None) -> int:
+    """Lists archived game builds, oldest first."""
+    root = root or config_impl.get_project_root()
+    builds = build_archive.list_builds(root)
+    print(i18n.t("cli.build.list_title"))
+    if not builds:
+        print(i18n.t("cli.build.list_none"))
+        return 0
+    for b in builds:
+        print(i18n.t("cli.build.list_row", **b))
+    return 0
+
+
+def cmd_build_remove(root: Path | None, name: str) -> int:
+    """Removes an archived game build."""
+    root = root or config_impl.get_project_root()
+    if not build_archive.remove_build(root, name):
+        out.error(i18n.t("cli.build.unknown", name=name))
+        return 1
+    out.success(i18n.t("cli.build.removed", name=name))
+    return 0
+
+
+def run_build(args: list[str], root: Path) -> int:
+    """Dispatch for ctx build add|list|remove."""
+    action = args[2].lower() if len(args) > 2 else ""
+    if action == "list":
+        return cmd_build_list(root)
+    if action == "add" and len(args) > 3:
+        version_arg, invalid = cli_args.parse_version_arg(args, 4)
+        if invalid or version_arg is None:
+            out.error(i18n.t("cli.context.use.invalid"))
+            return 1
+        return cmd_build_add(root, args[3], version_arg)
+    if action == "remove" and len(args) > 3:
+        return cmd_build_remove(root, args[3])
+    out.error(i18n.t("cli.build.usage"))
+    return 1
+
+
 def cmd_context_list(root: Path | None = None) -> int:
     """Lists indexed versions and shows which one is active."""
     root = root or config_impl.get_project_root()
@@ -228,6 +477,8 @@ def cmd_context_list(root: Path | None = None) -> int:
         if v in installed:
             prefix = "  * " if v == active else "    "
             print(prefix + v)
+    if ctx["builds"]:
+        print(i18n.t("cli.context.list.builds", builds=", ".join(ctx["builds"])))
     return 0
 
 
@@ -247,6 +498,50 @@ def cmd_context_use(version_str: str, root: Path | None = None) -> int:
     return 0
 
 
+def _pop_prune_options(args: list[str]) -> tuple[list[str], dict | None]:
+    """
+    Strips --strategy <name>, --full and --jobs N from args.
+    Returns (args, {"strategy", "incremental", "jobs"}) or (args, None) after printing an error.
+    """
+    from ...infrastructure import prune
+
+    args, strategy = cli_args.pop_option(args, cli_args.PRUNE_STRATEGY_FLAGS, 2)
+    args, full = cli_args.pop_flag(args, cli_args.PRUNE_FULL_FLAGS, 2)
+    args, jobs_raw = cli_args.pop_option(args, cli_args.PRUNE_JOBS_FLAGS, 2)
+    if strategy is not None:
+        strategy = strategy.lower()
+        if strategy not in prune.PRUNE_STRATEGIES:
+            out.error(i18n.t("cli.prune.invalid_strategy", strategy=strategy, valid="|".join(prune.PRUNE_STRATEGIES)))
+            return (args, None)
+    jobs = None
+    if jobs_raw is not None:
+        try:
+            jobs = int(jobs_raw)
+        except ValueError:
+            jobs = 0
+        if jobs < 1:
+            out.error(i18n.t("cli.prune.invalid_jobs", jobs=jobs_raw, max=prune.MAX_PRUNE_JOBS))
+            return (args, None)
+    return (args, {"strategy": strategy, "incremental": not full, "jobs": jobs})
+
+
+def _pop_fts_profile(args: list[str]) -> tuple[list[str], str | None, bool]:
+    """
+    Strips --fts-profile <name> from args. Returns (args, profile, ok): profile is None if absent;
+    ok is False after printing an error for an unknown profile.
+    """
+    from ...infrastructure import db
+
+    args, profile = cli_args.pop_option(args, cli_args.DB_FTS_PROFILE_FLAGS, 2)
+    if profile is None:
+        return (args, None, True)
+    profile = profile.lower()
+    if profile not in db.FTS_PROFILES:
+        out.error(i18n.t("cli.index.invalid_fts_profile", profile=profile, valid="|".join(db.FTS_PROFILES)))
+        return (args, None, False)
+    return (args, profile, True)
+
+
 def run_context(args: list[str], root: Path) -> int:
     """Dispatch for the context | ctx command."""
     if len(args) < 2:
@@ -255,11 +550,29 @@ def run_context(args: list[str], root: Path) -> int:
     if sub in ("detect", "detec"):
         return cmd_context_detect(root)
     if sub == "init":
+        args, stream = cli_args.pop_flag(args, cli_args.INIT_STREAM_FLAGS, 2)
+        args, prune_opts = _pop_prune_options(args)
+        if prune_opts is None:
+            return 1
+        if stream and prune_opts["jobs"] is not None:
+            out.error(i18n.t("cli.init.stream_jobs"))
+            return 1
+        args, fts_profile, ok = _pop_fts_profile(args)
+        if not ok:
+            return 1
         version_arg, invalid = cli_args.parse_version_arg(args, 2)
         if invalid:
             out.error(i18n.t("cli.context.use.invalid"))
             return 1
-        return cmd_context_init(root, version=version_arg)
+        return cmd_context_init(
+            root,
+            version=version_arg,
+            stream=stream,
+            prune_strategy=prune_opts["strategy"],
+            prune_incremental=prune_opts["incremental"],
+            prune_jobs=prune_opts["jobs"],
+            fts_profile=fts_profile,
+        )
     if sub == "clean":
         target = args[2] if len(args) > 2 else ""
         return cmd_context_clean(root, target=target)
@@ -272,17 +585,46 @@ def run_context(args: list[str], root: Path) -> int:
             return 1
         return cmd_context_decompile(root, version=version_arg)
     if sub == "prune":
+        args, prune_opts = _pop_prune_options(args)
+        if prune_opts is None:
+            return 1
+        version_arg, invalid = cli_args.parse_version_arg(args, 2)
+        if invalid:
+            out.error(i18n.t("cli.context.use.invalid"))
+            return 1
+        return cmd_prune(root, version=version_arg, **prune_opts)
+    if sub == "pack":
+        args, drop_tree = cli_args.pop_flag(args, cli_args.PACK_DROP_TREE_FLAGS, 2)
         version_arg, invalid = cli_args.parse_version_arg(args, 2)
         if invalid:
             out.error(i18n.t("cli.context.use.invalid"))
             return 1
-        return cmd_prune(root, version=version_arg)
+        return cmd_pack(root, version=version_arg, drop_tree=drop_tree)
+    if sub == "dedup":
+        # Sharing is across versions, so no argument means all of them
+        version_arg, invalid = cli_args.parse_version_arg(args, 2) if len(args) > 2 else (None, False)
+        if invalid:
+            out.error(i18n.t("cli.context.use.invalid"))
+            return 1
+        return cmd_dedup(root, version=version_arg)
     if sub == "db":
+        args, from_jar = cli_args.pop_flag(args, cli_args.DB_FROM_JAR_FLAGS, 2)
+        args, fts_profile, ok = _pop_fts_profile(args)
+        if not ok:
+            return 1
         version_arg, invalid = cli_args.parse_version_arg(args, 2)
         if invalid:
             out.error(i18n.t("cli.context.use.invalid"))
             return 1
-        return cmd_index(root, version=version_arg)
+        return cmd_index(root, version=version_arg, from_jar=from_jar, fts_profile=fts_profile)
+    if sub == "optimize":
+        version_arg, invalid = cli_args.parse_version_arg(args, 2) if len(args) > 2 else (None, False)
+        if invalid:
+            out.error(i18n.t("cli.context.use.invalid"))
+            return 1
+        return cmd_optimize(root, version=version_arg)
+    if sub == "build":
+        return run_build(args, root)
     if sub == "list":
         return cmd_context_list(root)
     if sub == "use":
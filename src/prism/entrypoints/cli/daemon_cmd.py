@@ -0,0 +1,68 @@
+# daemon command: start, stop and inspect the local query daemon.
+
+import sys
+from pathlib import Path
+
+from ... import i18n
+from ...infrastructure import config_impl
+from .. import daemon
+
+from . import out
+
+
+def cmd_daemon_start(root: Path | None = None) -> int:
+    """Runs the daemon in the foreground (Ctrl+C or daemon stop to end it)."""
+    root = root or config_impl.get_project_root()
+    if not hasattr(daemon.socket, "AF_UNIX"):
+        out.error(i18n.t("cli.daemon.unsupported"))
+        return 1
+
+    def on_ready(path: Path) -> None:
+        print(i18n.t("cli.daemon.ready", path=path), file=sys.stderr)
+
+    if not daemon.serve(root, on_ready=on_ready):
+        out.error(i18n.t("cli.daemon.already_running", path=daemon.get_socket_path(root)))
+        return 1
+    print(i18n.t("cli.daemon.stopped"), file=sys.stderr)
+    return 0
+
+
+def cmd_daemon_stop(root: Path | None = None) -> int:
+    """Asks the running daemon to shut down."""
+    root = root or config_impl.get_project_root()
+    if daemon.call(root, {"op": "shutdown"}) is None:
+        out.error(i18n.t("cli.daemon.not_running"))
+        return 1
+    out.success(i18n.t("cli.daemon.stop_sent"))
+    return 0
+
+
+def cmd_daemon_status(root: Path | None = None) -> int:
+    """Prints pid, uptime and requests served of the running daemon (exit 1 if none)."""
+    root = root or config_impl.get_project_root()
+    response = daemon.call(root, {"op": "ping"})
+    if response is None:
+        print(i18n.t("cli.daemon.not_running"))
+        return 1
+    info = response["result"]
+    print(i18n.t(
+        "cli.daemon.status",
+        pid=info["pid"],
+        uptime=info["uptime_seconds"],
+        requests=info["requests"],
+        path=daemon.get_socket_path(root),
+    ))
+    return 0
+
+
+def run_daemon(args: list[str], root: Path) -> int:
+    """Dispatch of the daemon command ([start] | stop | status)."""
+    sub = args[1].lower() if len(args) > 1 else "start"
+    if sub == "start":
+        return cmd_daemon_start(root)
+    if sub == "stop":
+        return cmd_daemon_stop(root)
+    if sub == "status":
+        return cmd_daemon_status(root)
+    print(i18n.t("cli.unknown_command", cmd=f"daemon {sub}"), file=sys.stderr)
+    return 1
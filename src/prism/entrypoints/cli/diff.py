@@ -0,0 +1,92 @@
+# diff command: precomputed API diff between release and prerelease.
+
+import json
+import sys
+from pathlib import Path
+
+from ... import i18n
+from ...infrastructure import config_impl
+from .. import daemon
+
+from . import args as cli_args
+from . import out
+
+# Marker per change type in text output
+_CHANGE_MARKS = {"added": "+", "removed": "-", "changed": "~"}
+
+
+def cmd_diff(
+    root: Path | None = None,
+    package_prefix: str | None = None,
+    change: str | None = None,
+    kind: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    output_json: bool = False,
+) -> int:
+    """
+    Prints the stored API diff (prerelease vs release). output_json: only prints JSON.
+    Answered by the daemon if one is running for this workspace, otherwise in-process.
+    """
+    root = root or config_impl.get_project_root()
+    request = {"op": "diff", "package_prefix": package_prefix, "change": change, "kind": kind, "limit": limit, "offset": offset}
+    response = daemon.call(root, request)
+    if response is None:
+        from ...infrastructure.file_config import FileConfigProvider
+        from ...infrastructure.sqlite_repository import SqliteIndexRepository
+
+        response = daemon.execute(FileConfigProvider(), SqliteIndexRepository(), root, request)
+    if not response["ok"]:
+        err = response["error"]
+        key = f"cli.diff.{err['error']}"
+        message = i18n.t(key)
+        out.error(message if message != key else err.get("message", key))
+        return 1
+    data = response["result"]
+    if output_json:
+        print(json.dumps({**data, "count": len(data["changes"]), "offset": offset}, ensure_ascii=False))
+        return 0
+    print(i18n.t(
+        "cli.diff.header",
+        base=data["base"],
+        target=data["target"],
+        total=data["total"],
+        shown=len(data["changes"]),
+        offset=offset,
+    ))
+    for ch in data["changes"]:
+        fqcn = f"{ch['package']}.{ch['class_name']}"
+        name = fqcn if ch["member_kind"] == "class" else f"{fqcn} :: {ch['member']}"
+        print(f"  {_CHANGE_MARKS[ch['change']]} [{ch['member_kind']}] {name}")
+        if ch["change"] == "changed":
+            print(f"      - {ch['old_signature']}")
+            print(f"      + {ch['new_signature']}")
+    return 0
+
+
+def run_diff(args: list[str], root: Path) -> int:
+    """Dispatch of the diff command."""
+    args, output_json = cli_args.pop_flag(args, cli_args.QUERY_JSON_FLAGS, 1)
+    args, package_prefix = cli_args.pop_option(args, cli_args.DIFF_PACKAGE_FLAGS, 1)
+    args, change = cli_args.pop_option(args, cli_args.DIFF_CHANGE_FLAGS, 1)
+    args, kind = cli_args.pop_option(args, cli_args.DIFF_KIND_FLAGS, 1)
+    args, limit_raw = cli_args.pop_option(args, cli_args.QUERY_LIMIT_FLAGS, 1)
+    args, offset_raw = cli_args.pop_option(args, cli_args.DIFF_OFFSET_FLAGS, 1)
+    try:
+        limit = int(limit_raw) if limit_raw is not None else 100
+        offset = int(offset_raw) if offset_raw is not None else 0
+    except ValueError:
+        print(i18n.t("cli.diff.usage"), file=sys.stderr)
+        return 1
+    if len(args) > 1:
+        print(i18n.t("cli.diff.usage"), file=sys.stderr)
+        return 1
+    return cmd_diff(
+        root,
+        package_prefix=package_prefix,
+        change=change,
+        kind=kind,
+        limit=limit,
+        offset=offset,
+        output_json=output_json,
+    )
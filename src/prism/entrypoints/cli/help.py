@@ -11,18 +11,27 @@ def print_help() -> None:
     print(i18n.t("cli.help.usage"))
     print()
     print(i18n.t("cli.help.commands"))
-    print(fmt.format("context | ctx init [release|prerelease|--all|-a]") + i18n.t("cli.help.context_init_desc"))
+    print(fmt.format("context | ctx init [release|prerelease|--all|-a] [--stream|-s]") + i18n.t("cli.help.context_init_desc"))
     print(fmt.format("context | ctx detect") + i18n.t("cli.help.context_detect_desc"))
     print(fmt.format("context | ctx clean <db|build|all>") + i18n.t("cli.help.context_clean_desc"))
     print(fmt.format("context | ctx reset") + i18n.t("cli.help.context_reset_desc"))
     print(fmt.format("context | ctx decompile [release|prerelease|--all|-a]") + i18n.t("cli.help.context_decompile_desc"))
-    print(fmt.format("context | ctx prune [release|prerelease|--all|-a]") + i18n.t("cli.help.context_prune_desc"))
-    print(fmt.format("context | ctx db [release|prerelease|--all|-a]") + i18n.t("cli.help.context_db_desc"))
+    print(fmt.format("context | ctx prune [release|prerelease|--all|-a] [--strategy S] [--full] [--jobs N]") + i18n.t("cli.help.context_prune_desc"))
+    print(fmt.format("context | ctx pack [release|prerelease|--all|-a] [--drop-tree]") + i18n.t("cli.help.context_pack_desc"))
+    print(fmt.format("context | ctx dedup [release|prerelease|--all|-a]") + i18n.t("cli.help.context_dedup_desc"))
+    print(fmt.format("context | ctx db [release|prerelease|--all|-a] [--from-jar] [--fts-profile P]") + i18n.t("cli.help.context_db_desc"))
+    print(fmt.format("context | ctx optimize [release|prerelease|--all|-a]") + i18n.t("cli.help.context_optimize_desc"))
+    print(fmt.format("context | ctx build add <nombre> [release|prerelease]") + i18n.t("cli.help.context_build_add_desc"))
+    print(fmt.format("context | ctx build list | remove <nombre>") + i18n.t("cli.help.context_build_desc"))
     print(fmt.format("context | ctx list") + i18n.t("cli.help.context_list_desc"))
     print(fmt.format("context | ctx use <release|prerelease>") + i18n.t("cli.help.context_use_desc"))
     print()
     print(fmt.format("query [--json|-j] [--limit N] <término> [release|prerelease]") + i18n.t("cli.help.query_desc"))
+    print(fmt.format("query --batch|-b [release|prerelease]") + i18n.t("cli.help.query_batch_desc"))
+    print(fmt.format("diff [--package P] [--change C] [--kind K] [--limit N] [--offset N] [--json|-j]") + i18n.t("cli.help.diff_desc"))
     print(fmt.format("mcp") + i18n.t("cli.help.mcp_desc"))
+    print(fmt.format("daemon [start|stop|status]") + i18n.t("cli.help.daemon_desc"))
+    print(fmt.format("bench startup [--threshold MS] [--runs N] [--json|-j]") + i18n.t("cli.help.bench_desc"))
     print()
     print(fmt.format("lang list") + i18n.t("cli.help.lang_list_desc"))
     print(fmt.format("lang set <código>") + i18n.t("cli.help.lang_set_desc"))
@@ -1,24 +1,42 @@
 # Punto de entrada del CLI: dispatch por subcomando.
 
+import importlib
 import sys
 from pathlib import Path
 
-import colorama
-
 from ... import i18n
 from ...infrastructure import config_impl
 
-from . import context
 from . import help as cli_help
-from . import lang
-from . import config_cmd
-from . import query
-from . import mcp_cmd
+
+# Subcomando -> (módulo de este paquete, función de dispatch). Los módulos se importan bajo
+# demanda: cada comando paga solo sus dependencias (query no carga JADX/prune/tqdm ni mcp).
+COMMANDS = {
+    "config_impl": ("config_cmd", "run_config"),
+    "query": ("query", "run_query"),
+    "diff": ("diff", "run_diff"),
+    "mcp": ("mcp_cmd", "run_mcp"),
+    "context": ("context", "run_context"),
+    "ctx": ("context", "run_context"),
+    "lang": ("lang", "run_lang"),
+    "daemon": ("daemon_cmd", "run_daemon"),
+    "bench": ("bench", "run_bench"),
+}
+# Subcomandos que muestran la ayuda si no reciben acción
+COMMANDS_NEEDING_ACTION = ("context", "ctx", "lang")
+
+
+def _dispatch(subcommand: str):
+    """Función run_* del subcomando (importando su módulo), o None si no existe."""
+    entry = COMMANDS.get(subcommand)
+    if entry is None:
+        return None
+    module = importlib.import_module(f".{entry[0]}", __package__)
+    return getattr(module, entry[1])
 
 
 def main() -> int:
     """Punto de entrada del CLI."""
-    colorama.init()
     args = sys.argv[1:]
     if not args or args[0] in ("-h", "--help"):
         cli_help.print_help()
@@ -27,29 +45,15 @@ def main() -> int:
     subcommand = args[0].lower()
     root = config_impl.get_project_root()
 
-    if subcommand == "config_impl":
-        result = config_cmd.run_config(args, root)
-        if result != 0:
-            return result
+    if subcommand in COMMANDS_NEEDING_ACTION and len(args) < 2:
         cli_help.print_help()
         return 0
-    if subcommand == "query":
-        return query.run_query(args, root)
-    if subcommand == "mcp":
-        return mcp_cmd.run_mcp(args, root)
-
-    if subcommand in ("context", "ctx"):
-        if len(args) < 2:
-            cli_help.print_help()
-            return 0
-        return context.run_context(args, root)
-
-    if subcommand == "lang":
-        if len(args) < 2:
-            cli_help.print_help()
-            return 0
-        return lang.run_lang(args, root)
-
-    print(i18n.t("cli.unknown_command", cmd=subcommand), file=sys.stderr)
-    cli_help.print_help()
-    return 1
+    run = _dispatch(subcommand)
+    if run is None:
+        print(i18n.t("cli.unknown_command", cmd=subcommand), file=sys.stderr)
+        cli_help.print_help()
+        return 1
+    result = run(args, root)
+    if subcommand == "config_impl" and result == 0:
+        cli_help.print_help()
+    return result
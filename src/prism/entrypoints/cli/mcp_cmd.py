@@ -14,14 +14,17 @@ def cmd_mcp(
     transport: str = "stdio",
     host: str = "0.0.0.0",
     port: int = 8000,
+    warmup: bool = True,
 ) -> int:
-    """Starts the MCP server for AI. Default is stdio; with transport sse (HTTP) listens on host:port."""
+    """
+    Starts the MCP server for AI. Default is stdio; with transport sse (HTTP) listens on host:port.
+    warmup=False skips the warm-up phase (faster start, slower first calls).
+    """
     root = _root or config_impl.get_project_root()
-    if sys.stderr.isatty():
+    interactive = sys.stderr.isatty()
+    if interactive:
         if transport == "sse":
             print(i18n.t("cli.mcp.instructions_http_title"), file=sys.stderr)
-            print(i18n.t("cli.mcp.instructions_http_ready", host=host, port=port), file=sys.stderr)
-            print(i18n.t("cli.mcp.instructions_http_url", url=f"http://{host}:{port}/sse"), file=sys.stderr)
         else:
             cwd = str(root.resolve())
             command = sys.executable
@@ -31,10 +34,20 @@ def cmd_mcp(
             print(i18n.t("cli.mcp.instructions_command", command=command), file=sys.stderr)
             print(i18n.t("cli.mcp.instructions_args", args=args_str), file=sys.stderr)
             print(i18n.t("cli.mcp.instructions_cwd", cwd=cwd), file=sys.stderr)
+
+    def on_ready() -> None:
+        # Readiness is only reported once the warm-up has finished
+        if not interactive:
+            return
+        if transport == "sse":
+            print(i18n.t("cli.mcp.instructions_http_ready", host=host, port=port), file=sys.stderr)
+            print(i18n.t("cli.mcp.instructions_http_url", url=f"http://{host}:{port}/sse"), file=sys.stderr)
+        else:
             print(i18n.t("cli.mcp.instructions_ready"), file=sys.stderr)
+
     from .. import mcp_server
     try:
-        mcp_server.run(transport=transport, host=host, port=port)
+        mcp_server.run(transport=transport, host=host, port=port, warmup=warmup, on_ready=on_ready)
         return 0
     except KeyboardInterrupt:
         return 0
@@ -45,5 +58,5 @@ def cmd_mcp(
 
 def run_mcp(args: list[str], root: Path) -> int:
     """Dispatch of the mcp command."""
-    transport, host, port = cli_args.parse_mcp_args(args, 1)
-    return cmd_mcp(root, transport=transport, host=host, port=port)
+    transport, host, port, warmup = cli_args.parse_mcp_args(args, 1)
+    return cmd_mcp(root, transport=transport, host=host, port=port, warmup=warmup)
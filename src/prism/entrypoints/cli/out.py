@@ -3,7 +3,7 @@
 import os
 import sys
 
-from colorama import Fore, Style
+_colorama = None
 
 
 def _use_color(stream) -> bool:
@@ -11,10 +11,23 @@ def _use_color(stream) -> bool:
     return stream.isatty() and not os.environ.get("NO_COLOR")
 
 
+def _color(name: str) -> str:
+    """ANSI code of a colorama colour ("RESET" = Style.RESET_ALL). colorama is only imported for a TTY."""
+    global _colorama
+    if _colorama is None:
+        import colorama
+
+        colorama.init()
+        _colorama = colorama
+    if name == "RESET":
+        return _colorama.Style.RESET_ALL
+    return getattr(_colorama.Fore, name)
+
+
 def phase(msg: str) -> None:
     """Print a phase header to stdout (cyan when colour is enabled)."""
     if _use_color(sys.stdout):
-        print(Fore.CYAN + msg + Style.RESET_ALL)
+        print(_color("CYAN") + msg + _color("RESET"))
     else:
         print(msg)
 
@@ -22,7 +35,7 @@ def phase(msg: str) -> None:
 def success(msg: str) -> None:
     """Print a success message to stdout (green when colour is enabled)."""
     if _use_color(sys.stdout):
-        print(Fore.GREEN + msg + Style.RESET_ALL)
+        print(_color("GREEN") + msg + _color("RESET"))
     else:
         print(msg)
 
@@ -30,6 +43,6 @@ def success(msg: str) -> None:
 def error(msg: str) -> None:
     """Print an error message to stderr (red when colour is enabled)."""
     if _use_color(sys.stderr):
-        print(Fore.RED + msg + Style.RESET_ALL, file=sys.stderr)
+        print(_color("RED") + msg + _color("RESET"), file=sys.stderr)
     else:
         print(msg, file=sys.stderr)
@@ -1,17 +1,28 @@
-# query command: FTS5 search in the DB.
+# query command: FTS5 search in the DB, one term or a batch of NDJSON requests from stdin.
+# Single queries go through the query daemon when it is running (see entrypoints.daemon).
 
 import json
 import sys
+import time
 from pathlib import Path
 
-from ...application import search
 from ... import i18n
-from ...domain.constants import VALID_SERVER_VERSIONS
+from ...domain.constants import VALID_SERVER_VERSIONS, normalize_version
 from ...infrastructure import config_impl
+from .. import daemon
 
 from . import args as cli_args
 
 
+def _services():
+    """(config_provider, index_repository) backed by one pooled read connection per DB."""
+    from ...infrastructure import db_pool
+    from ...infrastructure.file_config import FileConfigProvider
+    from ...infrastructure.sqlite_repository import SqliteIndexRepository
+
+    return (FileConfigProvider(), SqliteIndexRepository(pool=db_pool.ReadConnectionPool(max_idle=1)))
+
+
 def cmd_query(
     root: Path | None = None,
     query_term: str = "",
@@ -19,7 +30,10 @@ def cmd_query(
     limit: int = 30,
     output_json: bool = False,
 ) -> int:
-    """Executes FTS5 search in the DB for the given version. output_json: only prints JSON."""
+    """
+    Executes FTS5 search in the DB for the given version. output_json: only prints JSON.
+    Answered by the daemon if one is running for this workspace, otherwise in-process.
+    """
     root = root or config_impl.get_project_root()
     if not query_term or not query_term.strip():
         print(i18n.t("cli.query.usage"), file=sys.stderr)
@@ -27,12 +41,18 @@ def cmd_query(
     if version not in VALID_SERVER_VERSIONS:
         print(i18n.t("cli.context.use.invalid"), file=sys.stderr)
         return 1
-    results, err = search.search_api(root, version, query_term.strip(), limit=limit)
-    if err is not None:
+    request = {"op": "search", "query": query_term.strip(), "version": version, "limit": limit}
+    response = daemon.call(root, request)
+    if response is None:
+        provider, repository = _services()
+        response = daemon.execute(provider, repository, root, request, version)
+    if not response["ok"]:
+        err = response["error"]
         print(err["message"], file=sys.stderr)
         if err.get("hint"):
             print(err["hint"], file=sys.stderr)
         return 1
+    results = response["result"]["results"]
     if output_json:
         out = {"version": version, "term": query_term.strip(), "count": len(results), "results": results}
         print(json.dumps(out, ensure_ascii=False))
@@ -43,8 +63,49 @@ def cmd_query(
     return 0
 
 
+def cmd_query_batch(root: Path | None = None, version: str = "release", stream=None) -> int:
+    """
+    Batch mode: reads one JSON request per line from stream (default stdin), e.g.
+    {"id": 1, "op": "search", "query": "Player", "limit": 5} (ops: daemon.REQUEST_OPS), and writes
+    one JSON response per line to stdout in the same order (see daemon.execute).
+    All requests share one process and one read connection per DB. The totals and throughput
+    go to stderr at the end. Returns 1 if any request failed, else 0.
+    """
+    root = root or config_impl.get_project_root()
+    stream = stream or sys.stdin
+    provider, repository = _services()
+    count = errors = 0
+    start = time.perf_counter()
+    for line in stream:
+        if not line.strip():
+            continue
+        count += 1
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"id": None, "ok": False, "error": {"error": "invalid_request", "message": str(e)}}
+        else:
+            response = daemon.execute(provider, repository, root, request, version)
+        if not response["ok"]:
+            errors += 1
+        print(json.dumps(response, ensure_ascii=False), flush=True)
+    seconds = time.perf_counter() - start
+    print(i18n.t(
+        "cli.query.batch_done",
+        count=count,
+        errors=errors,
+        seconds=f"{seconds:.2f}",
+        rate=f"{count / seconds if seconds > 0 else 0:.0f}",
+    ), file=sys.stderr)
+    return 1 if errors else 0
+
+
 def run_query(args: list[str], root: Path) -> int:
     """Dispatch of the query command."""
+    args, batch = cli_args.pop_flag(args, cli_args.QUERY_BATCH_FLAGS, 1)
+    if batch:
+        positionals = [a for a in args[1:] if not a.startswith("-")]
+        return cmd_query_batch(root, version=normalize_version(positionals[0] if positionals else None))
     query_term, version, limit, output_json = cli_args.parse_query_args(args)
     if not query_term:
         print(i18n.t("cli.query.usage"), file=sys.stderr)
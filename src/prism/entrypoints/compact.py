@@ -0,0 +1,135 @@
+# Response shaping for list-returning MCP tools: compact columnar format, byte budgets and cursors.
+
+import base64
+import json
+import os
+
+# Values of the format parameter of prism_search, prism_list_classes and prism_find_usages
+RESPONSE_FORMATS = ("json", "compact")
+# Bounds for max_bytes (a budget below the minimum could not fit the response header)
+MIN_RESPONSE_BYTES = 1024
+MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+# Columns whose shared leading segments are factored out in the compact format
+PREFIX_SEPARATORS = {"package": ".", "file_path": "/"}
+
+
+def encode_cursor(offset: int) -> str:
+    """Opaque continuation token for the next page (clients pass it back as cursor)."""
+    raw = json.dumps({"o": offset}, separators=(",", ":")).encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> int:
+    """Offset encoded in a continuation token. Raises ValueError if it is not one of ours."""
+    try:
+        padded = token.strip() + "=" * (-len(token.strip()) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["o"]
+    except (ValueError, KeyError, TypeError, UnicodeError) as e:
+        raise ValueError(f"invalid cursor: {token}") from e
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError(f"invalid cursor: {token}")
+    return offset
+
+
+def _common_prefix(values: list[str], sep: str) -> str:
+    """Longest common prefix of values that ends at a separator ('' if none)."""
+    prefix = os.path.commonprefix(values)
+    cut = prefix.rfind(sep)
+    return prefix[: cut + 1] if cut >= 0 else ""
+
+
+def to_columns(rows: list[dict]) -> dict:
+    """
+    {"columns": [...], "prefixes": {column: prefix}, "rows": [[...], ...]} for a list of dicts:
+    keys are listed once, and package/file_path values lose their common leading segments
+    (prepend prefixes[column] to restore them).
+    """
+    columns: list[str] = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+    prefixes: dict[str, str] = {}
+    if len(rows) > 1:
+        for column, sep in PREFIX_SEPARATORS.items():
+            values = [row.get(column) for row in rows]
+            if column in columns and all(isinstance(v, str) for v in values):
+                prefix = _common_prefix(values, sep)
+                if prefix:
+                    prefixes[column] = prefix
+    table = []
+    for row in rows:
+        out = []
+        for column in columns:
+            value = row.get(column)
+            if column in prefixes:
+                value = value[len(prefixes[column]):]
+            out.append(value)
+        table.append(out)
+    return {"columns": columns, "prefixes": prefixes, "rows": table}
+
+
+def dumps(payload: dict, compact: bool) -> str:
+    """JSON text of a response; the compact format also drops whitespace between tokens."""
+    if compact:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def rows_response(
+    header: dict,
+    rows_key: str,
+    rows: list[dict],
+    offset: int,
+    limit: int,
+    response_format: str = "json",
+    max_bytes: int | None = None,
+) -> tuple[str, int]:
+    """
+    Serializes header plus rows (under rows_key) in the requested format. With max_bytes, rows
+    that would exceed the budget are dropped (always keeping at least one) and the response gets
+    "truncated": true; the whole response, envelope included, stays within max_bytes unless its
+    first row alone does not fit. "next_cursor" continues after the last returned row whenever it was cut
+    by the budget or filled the whole page. Returns (json_text, rows_returned).
+    """
+    compact = response_format == "compact"
+    table = to_columns(rows) if compact else None
+
+    def build(keep: int) -> dict:
+        page = rows[:keep]
+        payload = {**header, "count": len(page)}
+        if compact:
+            page_table = to_columns(page)
+            payload.update(format="compact", columns=page_table["columns"], prefixes=page_table["prefixes"])
+            payload[rows_key] = page_table["rows"]
+        else:
+            payload[rows_key] = page
+        if keep < len(rows):
+            payload["truncated"] = True
+        if keep < len(rows) or len(rows) >= limit:
+            payload["next_cursor"] = encode_cursor(offset + keep)
+        return payload
+
+    if max_bytes is None:
+        return (dumps(build(len(rows)), compact), len(rows))
+    max_bytes = max(MIN_RESPONSE_BYTES, min(int(max_bytes), MAX_RESPONSE_BYTES))
+    # Envelope with the largest values it can take (full-page columns and prefixes, truncated,
+    # longest cursor), so the budget covers everything but the rows themselves
+    envelope = {**header, "count": len(rows)}
+    if compact:
+        envelope.update(format="compact", columns=table["columns"], prefixes=table["prefixes"])
+    envelope.update({rows_key: [], "truncated": True, "next_cursor": encode_cursor(offset + len(rows))})
+    used = len(dumps(envelope, compact).encode("utf-8"))
+    keep = 0
+    for row in (table["rows"] if compact else rows):
+        used += len(dumps(row, compact).encode("utf-8")) + 2
+        if used > max_bytes and keep > 0:
+            break
+        keep += 1
+    text = dumps(build(keep), compact)
+    # Page-level prefixes can be longer than the estimate's: trim further if still over
+    while keep > 1 and len(text.encode("utf-8")) > max_bytes:
+        keep -= 1
+        text = dumps(build(keep), compact)
+    return (text, keep)
@@ -0,0 +1,276 @@
+# Query daemon: keeps the indexes, connections and caches warm behind a Unix domain socket.
+# Also the request executor shared with query --batch. Only stdlib at import time: the CLI
+# client path (call) must stay cheap to import.
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+# Read operations served by execute (query --batch and the daemon)
+REQUEST_OPS = ("search", "get_class", "get_method", "hierarchy", "usages", "grep", "diff", "stats")
+# Set to 0/false/no/off to make CLI commands ignore a running daemon
+ENV_DAEMON = "PRISM_DAEMON"
+# Seconds to wait for the daemon to accept a connection before falling back to in-process
+CONNECT_TIMEOUT = 0.5
+# Seconds to wait for a response (usages scans the sources)
+RESPONSE_TIMEOUT = 120.0
+# Seconds between checks of the pooled index DBs for a new generation
+INDEX_WATCH_INTERVAL = 2.0
+
+
+def _run_request(provider, repository, root: Path, request: dict, default_version: str) -> tuple[object, dict | None]:
+    """
+    Runs one request. Returns (result, None) or (None, error_dict).
+    Missing required fields raise KeyError (reported as missing_params by execute).
+    """
+    from .. import i18n
+    from ..application import (
+        find_usages,
+        get_api_diff,
+        get_class,
+        get_hierarchy,
+        get_index_stats,
+        get_method,
+        grep_sources,
+        search_api,
+    )
+    from ..domain.constants import normalize_version
+
+    op = request.get("op")
+    version = normalize_version(request.get("version") or default_version)
+    if op == "search":
+        results, err = search_api(
+            provider,
+            repository,
+            root,
+            version,
+            str(request["query"]),
+            limit=int(request.get("limit") or 30),
+            package_prefix=request.get("package_prefix"),
+            kind=request.get("kind"),
+            unique_classes=bool(request.get("unique_classes")),
+            t=i18n.t,
+            offset=int(request.get("offset") or 0),
+        )
+        return (None, err) if err is not None else ({"version": version, "count": len(results), "results": results}, None)
+    if op == "get_class":
+        return get_class(provider, repository, root, version, request["package"], request["class_name"])
+    if op == "get_method":
+        return get_method(provider, repository, root, version, request["package"], request["class_name"], request["method_name"])
+    if op == "hierarchy":
+        if not provider.get_db_path(root, version).is_file():
+            return (None, {"error": "no_db", "message": i18n.t("cli.query.no_db", version=version)})
+        data = get_hierarchy(provider, version, request["package"], request["class_name"], root)
+        return (None, data) if "error" in data else (data, None)
+    if op == "usages":
+        results, err = find_usages(
+            provider,
+            root,
+            version,
+            request["target_class"],
+            limit=int(request.get("limit") or 100),
+            offset=int(request.get("offset") or 0),
+        )
+        return (None, err) if err is not None else ({"version": version, "count": len(results), "usages": results}, None)
+    if op == "grep":
+        data, err = grep_sources(
+            provider,
+            repository,
+            root,
+            version,
+            str(request["pattern"]),
+            glob=request.get("glob"),
+            limit=int(request.get("limit") or 100),
+            offset=int(request.get("offset") or 0),
+            context=int(request.get("context") or 0),
+            ignore_case=bool(request.get("ignore_case")),
+        )
+        return (None, err) if err is not None else ({"version": version, **data, "count": len(data["matches"])}, None)
+    if op == "diff":
+        return get_api_diff(
+            provider,
+            repository,
+            root,
+            package_prefix=request.get("package_prefix"),
+            change=request.get("change"),
+            member_kind=request.get("kind"),
+            limit=int(request.get("limit") or 100),
+            offset=int(request.get("offset") or 0),
+        )
+    if op == "stats":
+        return get_index_stats(provider, repository, root, request.get("version"))
+    return (None, {"error": "invalid_op", "message": i18n.t("cli.query.batch_invalid_op", op=op, valid="|".join(REQUEST_OPS))})
+
+
+def execute(provider, repository, root: Path, request: dict, default_version: str = "release") -> dict:
+    """
+    Runs one request dict ({"op", ...}) and returns its response envelope:
+    {"id", "ok": true, "result"} or {"id", "ok": false, "error": {"error", "message"}}.
+    Never raises: malformed requests and DB errors become error responses.
+    """
+    from .. import i18n
+
+    request_id = request.get("id") if isinstance(request, dict) else None
+    try:
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        result, err = _run_request(provider, repository, root, request, default_version)
+    except KeyError as e:
+        result, err = None, {"error": "missing_params", "message": i18n.t("cli.query.batch_missing", field=e.args[0])}
+    except (TypeError, ValueError) as e:
+        result, err = None, {"error": "invalid_request", "message": str(e)}
+    except Exception as e:
+        result, err = None, {"error": "db", "message": str(e)}
+    if err is not None:
+        return {"id": request_id, "ok": False, "error": err}
+    return {"id": request_id, "ok": True, "result": result}
+
+
+def get_socket_path(root: Path | None = None) -> Path:
+    """Unix socket of the daemon of a workspace."""
+    from ..infrastructure import config_impl
+
+    return config_impl.get_workspace_dir(root) / "prism.sock"
+
+
+def _daemon_enabled() -> bool:
+    return os.environ.get(ENV_DAEMON, "").strip().lower() not in ("0", "false", "no", "off")
+
+
+def call(root: Path | None, request: dict, socket_path: Path | None = None) -> dict | None:
+    """
+    Sends one request to the running daemon and returns its response envelope (see execute).
+    Returns None when no daemon answers (not started, stale socket, no AF_UNIX, PRISM_DAEMON=0)
+    so the caller runs the request in-process instead.
+    """
+    if not hasattr(socket, "AF_UNIX") or not _daemon_enabled():
+        return None
+    path = socket_path or get_socket_path(root)
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(RESPONSE_TIMEOUT)
+            sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection: one JSON request per line, one JSON response per line."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"id": None, "ok": False, "error": {"error": "invalid_request", "message": str(e)}}
+            else:
+                response = self.server.dispatch(request)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if isinstance(request, dict) and request.get("op") == "shutdown":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server sharing one config provider, connection pool and repository."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, root: Path):
+        from ..infrastructure import db_pool
+        from ..infrastructure.file_config import FileConfigProvider
+        from ..infrastructure.sqlite_repository import SqliteIndexRepository
+
+        super().__init__(str(socket_path), _Handler)
+        self.root = root
+        self.started = time.time()
+        self.requests = 0
+        self.pool = db_pool.ReadConnectionPool()
+        self.provider = FileConfigProvider()
+        self.repository = SqliteIndexRepository(pool=self.pool)
+        self._count_lock = threading.Lock()
+
+    def dispatch(self, request) -> dict:
+        with self._count_lock:
+            self.requests += 1
+        op = request.get("op") if isinstance(request, dict) else None
+        if op in ("ping", "shutdown"):
+            return {
+                "id": request.get("id"),
+                "ok": True,
+                "result": {
+                    "pid": os.getpid(),
+                    "root": str(self.root),
+                    "uptime_seconds": round(time.time() - self.started, 1),
+                    "requests": self.requests,
+                },
+            }
+        return execute(self.provider, self.repository, self.root, request)
+
+
+def serve(root: Path, socket_path: Path | None = None, on_ready=None) -> bool:
+    """
+    Runs the daemon in the foreground until shutdown (daemon stop, SIGTERM or Ctrl+C): warms every
+    index DB, then serves requests on socket_path (default get_socket_path(root)), readable only by
+    the current user. Returns False without serving if another daemon already answers there.
+    """
+    import signal
+
+    from ..domain.constants import VALID_SERVER_VERSIONS
+    from ..infrastructure import db_pool
+
+    path = socket_path or get_socket_path(root)
+    if call(root, {"op": "ping"}, path) is not None:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()  # Stale socket of a daemon that did not exit cleanly
+    # The socket is created by bind() with the umask's mode: restrict it there, so it is never
+    # reachable by other users, not even before a chmod
+    old_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(path, root)
+    finally:
+        os.umask(old_umask)
+    server.pool.add_listener(db_pool.reload_listener)
+    for version in VALID_SERVER_VERSIONS:
+        db_path = server.provider.get_db_path(root, version)
+        if db_pool.warm_index(db_path):
+            with server.pool.connection(db_path):
+                pass
+    watcher = db_pool.GenerationWatcher(server.pool, server.pool.watched_paths, INDEX_WATCH_INTERVAL)
+    watcher.start()
+    if hasattr(signal, "SIGTERM") and threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    if on_ready is not None:
+        on_ready(path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+        server.server_close()
+        server.pool.close()
+        if path.exists():
+            path.unlink()
+    return True
@@ -1,6 +1,11 @@
 # MCP server for Orbis Prism (official SDK: https://github.com/modelcontextprotocol# Exposes prism_* tools; uses application layer + infrastructure adapters.
 
+import asyncio
+import functools
 import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from mcp.server.fastmcp import FastMCP
 
@@ -15,13 +20,122 @@ from ..application import (
     search_api as app_search_api,
     get_hierarchy as app_get_hierarchy,
     find_usages as app_find_usages,
+    grep_sources as app_grep_sources,
+    get_api_diff as app_get_api_diff,
 )
-from ..domain.constants import normalize_version
+from ..domain.constants import VALID_SERVER_VERSIONS, normalize_version
+from ..infrastructure import build_archive
+from ..infrastructure import db_pool
+from . import compact
+from ..infrastructure import metrics
 from ..infrastructure.file_config import FileConfigProvider
 from ..infrastructure.sqlite_repository import SqliteIndexRepository
 
 _config_provider = FileConfigProvider()
-_index_repository = SqliteIndexRepository()
+_db_pool = db_pool.ReadConnectionPool()
+_index_repository = SqliteIndexRepository(pool=_db_pool)
+
+# Seconds between checks of the pooled index DBs for a new generation (ctx db / ctx init)
+INDEX_WATCH_INTERVAL = 2.0
+
+# Threads running blocking tool work (SQLite queries, source reads) off the event loop
+TOOL_EXECUTOR_WORKERS = 8
+# Calls of one tool allowed to run at once; scans over the sources get a small share of the
+# executor so lookups always find a free worker
+TOOL_CONCURRENCY = {
+    "prism_find_usages": 2,
+    "prism_grep": 2,
+    "prism_read_source": 4,
+    "prism_search": 4,
+    "prism_diff": 2,
+}
+DEFAULT_TOOL_CONCURRENCY = 6
+
+_tool_executor: ThreadPoolExecutor | None = None
+_tool_semaphores: dict[str, asyncio.Semaphore] = {}
+# In-flight tool calls by (tool, args, kwargs), shared by identical concurrent calls
+_inflight: dict[tuple, asyncio.Future] = {}
+_metrics = metrics.MetricsRegistry()
+
+
+def _get_tool_executor() -> ThreadPoolExecutor:
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = ThreadPoolExecutor(max_workers=TOOL_EXECUTOR_WORKERS, thread_name_prefix="prism-tool")
+    return _tool_executor
+
+
+async def _run_limited(tool: str, fn, args: tuple, kwargs: dict) -> str:
+    semaphore = _tool_semaphores.get(tool)
+    if semaphore is None:
+        semaphore = _tool_semaphores[tool] = asyncio.Semaphore(TOOL_CONCURRENCY.get(tool, DEFAULT_TOOL_CONCURRENCY))
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_tool_executor(), functools.partial(_metrics.timed, tool, fn, *args, **kwargs))
+
+
+async def _offload(tool: str, fn, *args, **kwargs) -> str:
+    """
+    Runs a blocking _run_* function in the tool executor, within the tool's concurrency limit,
+    and records the call in the tool metrics. Identical concurrent calls (same tool and arguments)
+    are coalesced: they await the one in-flight computation and share its JSON result.
+    """
+    key = (tool, args, tuple(sorted(kwargs.items())))
+    pending = _inflight.get(key)
+    if pending is not None:
+        _metrics.record_coalesced(tool)
+        return await asyncio.shield(pending)
+    future = asyncio.ensure_future(_run_limited(tool, fn, args, kwargs))
+    _inflight[key] = future
+
+    def _done(f: asyncio.Future) -> None:
+        if _inflight.get(key) is f:
+            del _inflight[key]
+        if not f.cancelled():
+            f.exception()  # Retrieved here too, in case every caller was cancelled
+
+    future.add_done_callback(_done)
+    # Shielded so a cancelled caller does not cancel the computation other callers share
+    return await asyncio.shield(future)
+
+
+_db_pool.add_listener(db_pool.reload_listener)
+
+
+def _build_provider(build: str | None):
+    """
+    (config_provider, None) for the tool call: the workspace config, or the view of an archived
+    build when build is given (see build_archive). (None, error_json) if the build is unknown.
+    """
+    name = (build or "").strip()
+    if not name:
+        return (_config_provider, None)
+    provider = build_archive.open_build_provider(_config_provider, None, name)
+    if provider is None:
+        return (None, json.dumps({"error": "unknown_build", "message": f"Build {name} is not archived (see prism ctx build list)."}, ensure_ascii=False))
+    return (provider, None)
+
+
+def _paging(offset: int | None, cursor: str | None, response_format: str | None) -> tuple[int, str, str | None]:
+    """
+    (offset, format, None) for a list-returning tool: a continuation cursor overrides offset.
+    (0, "json", error_json) if the cursor or format is invalid.
+    """
+    fmt = (response_format or "json").strip().lower()
+    if fmt not in compact.RESPONSE_FORMATS:
+        return (0, "json", json.dumps({"error": "invalid_format", "message": f"format must be one of: {', '.join(compact.RESPONSE_FORMATS)}."}, ensure_ascii=False))
+    if (cursor or "").strip():
+        try:
+            return (compact.decode_cursor(cursor), fmt, None)
+        except ValueError as e:
+            return (0, fmt, json.dumps({"error": "invalid_cursor", "message": str(e)}, ensure_ascii=False))
+    return (max(0, int(offset)) if offset is not None else 0, fmt, None)
+
+
+def _scope(version: str | None, build: str | None) -> dict:
+    """Response keys identifying what was queried: version, plus build if one was requested."""
+    name = (build or "").strip()
+    return {"version": version, "build": name} if name else {"version": version}
 
 
 def _run_search(
@@ -31,10 +145,21 @@ def _run_search(
     package_prefix: str | None = None,
     kind: str | None = None,
     unique_classes: bool = False,
+    build: str | None = None,
+    offset: int = 0,
+    cursor: str | None = None,
+    response_format: str | None = None,
+    max_bytes: int | None = None,
 ) -> str:
     version = normalize_version(version)
+    offset, response_format, page_err = _paging(offset, cursor, response_format)
+    if page_err is not None:
+        return page_err
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
     results, err = app_search_api(
-        _config_provider,
+        provider,
         _index_repository,
         None,
         version,
@@ -44,15 +169,16 @@ def _run_search(
         kind=kind or None,
         unique_classes=unique_classes,
         t=i18n.t,
+        offset=offset,
     )
     if err is not None:
         return json.dumps(err, ensure_ascii=False)
-    return json.dumps({
-        "version": version,
-        "term": query.strip(),
-        "count": len(results),
-        "results": results,
-    }, ensure_ascii=False)
+    text, returned = compact.rows_response(
+        {**_scope(version, build), "term": query.strip()},
+        "results", results, offset, limit, response_format, max_bytes,
+    )
+    metrics.count_rows(returned)
+    return text
 
 
 def _parse_fqcn(fqcn: str) -> tuple[str, str] | None:
@@ -68,6 +194,7 @@ def _run_get_class(
     package: str | None = None,
     class_name: str | None = None,
     fqcn: str | None = None,
+    build: str | None = None,
 ) -> str:
     version = normalize_version(version)
     p = (package or "").strip()
@@ -82,10 +209,14 @@ def _run_get_class(
     if not c:
         return json.dumps({"error": "missing_params", "message": "Provide class_name or fqcn."}, ensure_ascii=False)
     
-    data, err = app_get_class(_config_provider, _index_repository, None, version, p, c)
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    data, err = app_get_class(provider, _index_repository, None, version, p, c)
     if err is not None:
         return json.dumps(err, ensure_ascii=False)
-    return json.dumps({"version": version, **data}, ensure_ascii=False)
+    metrics.count_rows(1 + len(data.get("methods") or []) + len(data.get("constants") or []))
+    return json.dumps({**_scope(version, build), **data}, ensure_ascii=False)
 
 
 def _run_list_classes(
@@ -94,23 +225,31 @@ def _run_list_classes(
     prefix_match: bool = True,
     limit: int = 100,
     offset: int = 0,
+    build: str | None = None,
+    cursor: str | None = None,
+    response_format: str | None = None,
+    max_bytes: int | None = None,
 ) -> str:
     version = normalize_version(version)
     p = (package_prefix or "").strip()
     if not p:
         return json.dumps({"error": "missing_param", "message": "package_prefix is required"}, ensure_ascii=False)
     limit = max(1, min(int(limit), 500)) if limit is not None else 100
-    offset = max(0, int(offset)) if offset is not None else 0
-    classes, err = app_list_classes(_config_provider, _index_repository, None, version, p, prefix_match=prefix_match, limit=limit, offset=offset)
+    offset, response_format, page_err = _paging(offset, cursor, response_format)
+    if page_err is not None:
+        return page_err
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    classes, err = app_list_classes(provider, _index_repository, None, version, p, prefix_match=prefix_match, limit=limit, offset=offset)
     if err is not None:
         return json.dumps(err, ensure_ascii=False)
-    return json.dumps({
-        "version": version,
-        "package_prefix": p,
-        "prefix_match": prefix_match,
-        "count": len(classes),
-        "classes": classes,
-    }, ensure_ascii=False)
+    text, returned = compact.rows_response(
+        {**_scope(version, build), "package_prefix": p, "prefix_match": prefix_match},
+        "classes", classes, offset, limit, response_format, max_bytes,
+    )
+    metrics.count_rows(returned)
+    return text
 
 
 def _run_context_list() -> str:
@@ -118,13 +257,16 @@ def _run_context_list() -> str:
     return json.dumps(ctx, ensure_ascii=False)
 
 
-def _run_index_stats(version: str | None) -> str:
+def _run_index_stats(version: str | None, build: str | None = None) -> str:
     if version and str(version).strip():
         version = normalize_version(version)
-    data, err = app_get_index_stats(_config_provider, _index_repository, None, version)
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    data, err = app_get_index_stats(provider, _index_repository, None, version)
     if err is not None:
         return json.dumps(err, ensure_ascii=False)
-    return json.dumps(data, ensure_ascii=False)
+    return json.dumps({**data, **_scope(data["version"], build)}, ensure_ascii=False)
 
 
 def _run_fts_help() -> str:
@@ -135,6 +277,10 @@ def _run_fts_help() -> str:
         "- AND: term1 AND term2 (both must appear).\n"
         "- OR: term1 OR term2 (either can appear).\n"
         "- Prefix: term* matches tokens that start with 'term'.\n"
+        "- Identifier parts: Inventory matches getPlayerInventory; a camelCase word such as\n"
+        "  PlayerInventory (or PlayerInv*) also matches inside longer method/constant names.\n"
+        "- Indexes built with the minimal FTS profile match quoted phrases and NEAR groups as their\n"
+        "  words in any order (AND) and do not index constant values.\n"
         "Examples: GameManager, \"getPlayer\" AND server, spawn OR despawn."
     )
 
@@ -144,22 +290,31 @@ def _run_read_source(
     file_path: str,
     start_line: int | None = None,
     end_line: int | None = None,
+    build: str | None = None,
 ) -> str:
     version = normalize_version(version)
-    payload = app_read_source(_config_provider, None, version, file_path, start_line=start_line, end_line=end_line)
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    payload = app_read_source(provider, None, version, file_path, start_line=start_line, end_line=end_line)
     if "error" in payload:
         return json.dumps({"error": payload["error"], "message": payload["message"]}, ensure_ascii=False)
-    return json.dumps(payload, ensure_ascii=False)
+    metrics.count_rows(payload["content"].count("\n") + 1 if payload["content"] else 0)
+    return json.dumps({**payload, **_scope(payload.get("version", version), build)}, ensure_ascii=False)
 
 
-def _run_get_method(version: str, package: str, class_name: str, method_name: str) -> str:
+def _run_get_method(version: str, package: str, class_name: str, method_name: str, build: str | None = None) -> str:
     version = normalize_version(version)
     if not (package or "").strip() or not (class_name or "").strip() or not (method_name or "").strip():
         return json.dumps({"error": "missing_params", "message": "package, class_name and method_name are required"}, ensure_ascii=False)
-    data, err = app_get_method(_config_provider, _index_repository, None, version, package.strip(), class_name.strip(), method_name.strip())
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    data, err = app_get_method(provider, _index_repository, None, version, package.strip(), class_name.strip(), method_name.strip())
     if err is not None:
         return json.dumps(err, ensure_ascii=False)
-    return json.dumps({"version": version, **data}, ensure_ascii=False)
+    metrics.count_rows(len(data.get("methods") or []))
+    return json.dumps({**_scope(version, build), **data}, ensure_ascii=False)
 
 
 def _run_get_hierarchy(
@@ -167,6 +322,7 @@ def _run_get_hierarchy(
     package: str | None = None,
     class_name: str | None = None,
     fqcn: str | None = None,
+    build: str | None = None,
 ) -> str:
     version = normalize_version(version)
     p = (package or "").strip()
@@ -178,147 +334,365 @@ def _run_get_hierarchy(
     if not p or not c:
         return json.dumps({"error": "missing_params", "message": "Provide package and class_name, or fqcn."}, ensure_ascii=False)
     
-    data = app_get_hierarchy(_config_provider, version, p, c, None)
-    return json.dumps({"version": version, **data}, ensure_ascii=False)
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    data = app_get_hierarchy(provider, version, p, c, None)
+    metrics.count_rows(len(data.get("parent_tree") or []) + len(data.get("interfaces") or []))
+    return json.dumps({**_scope(version, build), **data}, ensure_ascii=False)
 
 
 def _run_find_usages(
     version: str,
     target_class: str,
     limit: int = 100,
+    build: str | None = None,
+    offset: int = 0,
+    cursor: str | None = None,
+    response_format: str | None = None,
+    max_bytes: int | None = None,
 ) -> str:
     version = normalize_version(version)
-    results, err = app_find_usages(_config_provider, None, version, target_class, limit=limit)
+    offset, response_format, page_err = _paging(offset, cursor, response_format)
+    if page_err is not None:
+        return page_err
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    results, err = app_find_usages(provider, None, version, target_class, limit=limit, offset=offset)
+    if err is not None:
+        return json.dumps(err, ensure_ascii=False)
+    text, returned = compact.rows_response(
+        {**_scope(version, build), "target_class": target_class},
+        "usages", results, offset, limit, response_format, max_bytes,
+    )
+    metrics.count_rows(returned)
+    return text
+
+
+def _run_grep(
+    version: str,
+    pattern: str,
+    glob: str | None = None,
+    context: int = 0,
+    ignore_case: bool = False,
+    limit: int = 100,
+    build: str | None = None,
+    offset: int = 0,
+    cursor: str | None = None,
+    response_format: str | None = None,
+    max_bytes: int | None = None,
+) -> str:
+    version = normalize_version(version)
+    offset, response_format, page_err = _paging(offset, cursor, response_format)
+    if page_err is not None:
+        return page_err
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    data, err = app_grep_sources(
+        provider, _index_repository, None, version, pattern, glob=glob, limit=limit, offset=offset,
+        context=int(context or 0), ignore_case=bool(ignore_case),
+    )
+    if err is not None:
+        return json.dumps(err, ensure_ascii=False)
+    text, returned = compact.rows_response(
+        {**_scope(version, build), "pattern": pattern, "files_scanned": data["files_scanned"], "indexed": data["indexed"]},
+        "matches", data["matches"], offset, limit, response_format, max_bytes,
+    )
+    metrics.count_rows(returned)
+    return text
+
+
+def _run_diff(
+    package_prefix: str | None = None,
+    change: str | None = None,
+    kind: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    build: str | None = None,
+) -> str:
+    limit = max(1, min(int(limit), 500)) if limit is not None else 100
+    offset = max(0, int(offset)) if offset is not None else 0
+    provider, build_err = _build_provider(build)
+    if build_err is not None:
+        return build_err
+    data, err = app_get_api_diff(
+        provider,
+        _index_repository,
+        None,
+        package_prefix=package_prefix,
+        change=change,
+        member_kind=kind,
+        limit=limit,
+        offset=offset,
+    )
     if err is not None:
         return json.dumps(err, ensure_ascii=False)
-    return json.dumps({
-        "version": version,
-        "target_class": target_class,
-        "count": len(results),
-        "usages": results,
-    }, ensure_ascii=False)
+    if provider is not _config_provider:
+        # An archived build is diffed against the build archived before it
+        info = build_archive.get_build(None, provider.build) or {}
+        data = {**data, "base": info.get("previous"), "target": provider.build}
+    metrics.count_rows(len(data["changes"]))
+    return json.dumps({**data, "count": len(data["changes"]), "offset": offset}, ensure_ascii=False)
+
+
+def _run_metrics() -> str:
+    return json.dumps(_metrics.snapshot(), ensure_ascii=False)
 
 
 def _register_tools(app: FastMCP) -> None:
-    """Register prism_* tools on the given FastMCP instance with localized descriptions."""
+    """
+    Register prism_* tools on the given FastMCP instance with localized descriptions.
+    Handlers are async: blocking work runs in the tool executor (see _offload) so one slow call
+    does not stall other clients on the SSE transport.
+    """
 
-    def prism_search(
+    async def prism_search(
         query: str,
         version: str = "release",
         limit: int = 30,
         package_prefix: str | None = None,
         kind: str | None = None,
         unique_classes: bool = False,
+        build: str | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
+        format: str = "json",
+        max_bytes: int | None = None,
     ) -> str:
         if not query or not str(query).strip():
             return json.dumps({"error": "missing_query", "message": "query is required"}, ensure_ascii=False)
         limit = max(1, min(int(limit), 500)) if limit is not None else 30
-        return _run_search(query, version=version, limit=limit, package_prefix=package_prefix, kind=kind, unique_classes=unique_classes)
+        return await _offload(
+            "prism_search", _run_search, query, version=version, limit=limit, package_prefix=package_prefix, kind=kind,
+            unique_classes=unique_classes, build=build, offset=offset, cursor=cursor, response_format=format, max_bytes=max_bytes,
+        )
 
     prism_search.__doc__ = i18n.t("mcp.tools.prism_search.description")
     app.tool()(prism_search)
 
-    def prism_get_class(
+    async def prism_get_class(
         version: str,
         package: str | None = None,
         class_name: str | None = None,
         fqcn: str | None = None,
+        build: str | None = None,
     ) -> str:
-        return _run_get_class(version, package=package, class_name=class_name, fqcn=fqcn)
+        return await _offload("prism_get_class", _run_get_class, version, package=package, class_name=class_name, fqcn=fqcn, build=build)
 
     prism_get_class.__doc__ = i18n.t("mcp.tools.prism_get_class.description")
     app.tool()(prism_get_class)
 
-    def prism_list_classes(
+    async def prism_list_classes(
         version: str,
         package_prefix: str,
         prefix_match: bool = True,
         limit: int = 100,
         offset: int = 0,
+        build: str | None = None,
+        cursor: str | None = None,
+        format: str = "json",
+        max_bytes: int | None = None,
     ) -> str:
-        return _run_list_classes(version, package_prefix, prefix_match, limit=limit, offset=offset)
+        return await _offload(
+            "prism_list_classes", _run_list_classes, version, package_prefix, prefix_match, limit=limit, offset=offset,
+            build=build, cursor=cursor, response_format=format, max_bytes=max_bytes,
+        )
 
     prism_list_classes.__doc__ = i18n.t("mcp.tools.prism_list_classes.description")
     app.tool()(prism_list_classes)
 
-    def prism_context_list() -> str:
-        return _run_context_list()
+    async def prism_context_list() -> str:
+        return await _offload("prism_context_list", _run_context_list)
 
     prism_context_list.__doc__ = i18n.t("mcp.tools.prism_context_list.description")
     app.tool()(prism_context_list)
 
-    def prism_index_stats(version: str | None = None) -> str:
-        return _run_index_stats(version)
+    async def prism_index_stats(version: str | None = None, build: str | None = None) -> str:
+        return await _offload("prism_index_stats", _run_index_stats, version, build=build)
 
     prism_index_stats.__doc__ = i18n.t("mcp.tools.prism_index_stats.description")
     app.tool()(prism_index_stats)
 
-    def prism_read_source(
+    async def prism_read_source(
         version: str,
         file_path: str,
         start_line: int | None = None,
         end_line: int | None = None,
+        build: str | None = None,
     ) -> str:
-        return _run_read_source(version, file_path, start_line=start_line, end_line=end_line)
+        return await _offload("prism_read_source", _run_read_source, version, file_path, start_line=start_line, end_line=end_line, build=build)
 
     prism_read_source.__doc__ = i18n.t("mcp.tools.prism_read_source.description")
     app.tool()(prism_read_source)
 
-    def prism_get_method(version: str, package: str, class_name: str, method_name: str) -> str:
-        return _run_get_method(version, package, class_name, method_name)
+    async def prism_get_method(version: str, package: str, class_name: str, method_name: str, build: str | None = None) -> str:
+        return await _offload("prism_get_method", _run_get_method, version, package, class_name, method_name, build=build)
 
     prism_get_method.__doc__ = i18n.t("mcp.tools.prism_get_method.description")
     app.tool()(prism_get_method)
 
-    def prism_fts_help() -> str:
-        return _run_fts_help()
+    async def prism_fts_help() -> str:
+        return await _offload("prism_fts_help", _run_fts_help)
 
     prism_fts_help.__doc__ = i18n.t("mcp.tools.prism_fts_help.description")
     app.tool()(prism_fts_help)
 
-    def prism_get_hierarchy(
+    async def prism_get_hierarchy(
         version: str,
         package: str | None = None,
         class_name: str | None = None,
         fqcn: str | None = None,
+        build: str | None = None,
     ) -> str:
-        return _run_get_hierarchy(version, package=package, class_name=class_name, fqcn=fqcn)
+        return await _offload("prism_get_hierarchy", _run_get_hierarchy, version, package=package, class_name=class_name, fqcn=fqcn, build=build)
 
     prism_get_hierarchy.__doc__ = i18n.t("mcp.tools.prism_get_hierarchy.description")
     app.tool()(prism_get_hierarchy)
 
-    def prism_find_usages(
+    async def prism_find_usages(
         version: str,
         target_class: str,
         limit: int = 100,
+        build: str | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
+        format: str = "json",
+        max_bytes: int | None = None,
     ) -> str:
-        return _run_find_usages(version, target_class, limit=limit)
+        return await _offload(
+            "prism_find_usages", _run_find_usages, version, target_class, limit=limit, build=build,
+            offset=offset, cursor=cursor, response_format=format, max_bytes=max_bytes,
+        )
 
     prism_find_usages.__doc__ = i18n.t("mcp.tools.prism_find_usages.description")
     app.tool()(prism_find_usages)
 
+    async def prism_grep(
+        version: str,
+        pattern: str,
+        glob: str | None = None,
+        context: int = 0,
+        ignore_case: bool = False,
+        limit: int = 100,
+        build: str | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
+        format: str = "json",
+        max_bytes: int | None = None,
+    ) -> str:
+        limit = max(1, min(int(limit), 500)) if limit is not None else 100
+        return await _offload(
+            "prism_grep", _run_grep, version, pattern, glob=glob, context=context, ignore_case=ignore_case, limit=limit,
+            build=build, offset=offset, cursor=cursor, response_format=format, max_bytes=max_bytes,
+        )
+
+    prism_grep.__doc__ = i18n.t("mcp.tools.prism_grep.description")
+    app.tool()(prism_grep)
+
+    async def prism_diff(
+        package_prefix: str | None = None,
+        change: str | None = None,
+        kind: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        build: str | None = None,
+    ) -> str:
+        return await _offload("prism_diff", _run_diff, package_prefix=package_prefix, change=change, kind=kind, limit=limit, offset=offset, build=build)
+
+    prism_diff.__doc__ = i18n.t("mcp.tools.prism_diff.description")
+    app.tool()(prism_diff)
+
+    async def prism_metrics() -> str:
+        return _run_metrics()
+
+    prism_metrics.__doc__ = i18n.t("mcp.tools.prism_metrics.description")
+    app.tool()(prism_metrics)
+
+
+def _register_metrics_route(app: FastMCP) -> None:
+    """GET /metrics on the HTTP transport: tool metrics in Prometheus text format."""
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse
+
+    @app.custom_route("/metrics", methods=["GET"])
+    async def prometheus_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 
 # Default instance for stdio (host/port unused)
 mcp = FastMCP("orbis-prism")
 _register_tools(mcp)
 
 
+def warm_up() -> dict:
+    """
+    Pays the first-call costs before serving: loads every locale catalog, reads the pages of
+    each indexed DB into the OS cache, opens pooled connections and runs a few representative
+    tool queries (search, list, class lookup, stats, diff). Returns {"seconds", "dbs", "queries"}.
+    """
+    start = time.perf_counter()
+    i18n.get_available_locales()
+    i18n.t("mcp.tools.prism_search.description")
+    dbs = queries = 0
+    for version in VALID_SERVER_VERSIONS:
+        db_path = _config_provider.get_db_path(None, version)
+        if not db_pool.warm_index(db_path):
+            continue
+        dbs += 1
+        try:
+            found = json.loads(_run_search("get*", version=version, limit=5))
+            _run_search("get*", version=version, limit=5, unique_classes=True, response_format="compact")
+            queries += 2
+            first = (found.get("results") or [None])[0]
+            if first:
+                _run_get_class(version, package=first["package"], class_name=first["class_name"])
+                _run_list_classes(version, first["package"], limit=5)
+                queries += 2
+        except (ValueError, KeyError, TypeError):
+            pass
+    _run_context_list()
+    _run_index_stats(None)
+    _run_diff(limit=1)
+    queries += 3
+    return {"seconds": time.perf_counter() - start, "dbs": dbs, "queries": queries}
+
+
 def run(
     transport: str = "stdio",
     host: str = "0.0.0.0",
     port: int = 8000,
+    warmup: bool = True,
+    on_ready=None,
 ) -> None:
     """
     Start the MCP server. Uses stdio transport by default.
     If transport is "sse", listens on host:port (useful for Docker).
+    warmup runs warm_up() first and logs its duration to stderr; on_ready() is called once the
+    server is about to serve (after the warm-up), e.g. to print the readiness message.
     """
     if transport == "sse":
         app = FastMCP("orbis-prism", host=host, port=port)
         _register_tools(app)
+        _register_metrics_route(app)
         server_to_run = app
     else:
         server_to_run = mcp
 
+    if warmup:
+        stats = warm_up()
+        print(i18n.t(
+            "cli.mcp.warmup_done",
+            ms=f"{stats['seconds'] * 1000:.0f}",
+            dbs=stats["dbs"],
+            queries=stats["queries"],
+        ), file=sys.stderr)
+    # Index rebuilds are picked up without restarting (in-flight calls finish on the old generation)
+    watcher = db_pool.GenerationWatcher(_db_pool, _db_pool.watched_paths, INDEX_WATCH_INTERVAL)
+    watcher.start()
+    if on_ready is not None:
+        on_ready()
     try:
         if transport == "sse":
             server_to_run.run(transport="sse")
@@ -326,3 +700,6 @@ def run(
             server_to_run.run(transport="stdio")
     except KeyboardInterrupt:
         pass  # Clean exit on close (Ctrl+C or client disconnect)
+    finally:
+        watcher.stop()
+        _db_pool.close()
@@ -2,6 +2,7 @@
 
 import os
 import json
+import re
 from pathlib import Path
 
 from .infrastructure import config_impl
@@ -15,6 +16,12 @@ _LOCALES_DIR = Path(__file__).resolve().parent / "locales"
 _catalogs: dict[str, dict] = {}
 # Fallback when active locale has empty value
 _fallback_catalog: dict | None = None
+# Cache: (locale, key) -> compiled template (see _compile)
+_templates: dict[tuple[str, str], tuple[str, ...]] = {}
+# Memo of the current locale: ((config snapshot, PRISM_LANG, LANG), locale)
+_locale_memo: tuple[tuple, str] | None = None
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
 
 
 def _load_catalog(locale: str) -> dict:
@@ -37,16 +44,23 @@ def _load_catalog(locale: str) -> dict:
 def get_current_locale(root: Path | None = None) -> str:
     """
     Get current locale: config .prism.json -> PRISM_LANG -> LANG -> es.
-    Normalises to short code (es, en).
+    Normalises to short code (es, en). The result is memoized until the config snapshot
+    (see config_impl.get_config_snapshot) or the environment variables change.
     """
-    cfg = config_impl.load_config(root)
-    lang = cfg.get(config_impl.CONFIG_KEY_LANG)
+    global _locale_memo
+    snapshot = config_impl.get_config_snapshot(root)
+    key = (snapshot, os.environ.get("PRISM_LANG"), os.environ.get("LANG"))
+    memo = _locale_memo
+    if memo is not None and memo[0] == key:
+        return memo[1]
+    lang = snapshot.config.get(config_impl.CONFIG_KEY_LANG)
     if lang:
-        return _normalize_locale(lang)
-    env = os.environ.get("PRISM_LANG") or os.environ.get("LANG", "")
-    if env:
-        return _normalize_locale(env)
-    return DEFAULT_LOCALE
+        locale = _normalize_locale(lang)
+    else:
+        env = os.environ.get("PRISM_LANG") or os.environ.get("LANG", "")
+        locale = _normalize_locale(env) if env else DEFAULT_LOCALE
+    _locale_memo = (key, locale)
+    return locale
 
 
 def _normalize_locale(locale: str) -> str:
@@ -55,25 +69,41 @@ def _normalize_locale(locale: str) -> str:
     return part if part else DEFAULT_LOCALE
 
 
+def _compile(value: str) -> tuple[str, ...]:
+    """
+    Splits a catalog value into alternating literal text and placeholder names:
+    "a {x} b" -> ("a ", "x", " b"). Odd indices are placeholder names.
+    """
+    return tuple(_PLACEHOLDER_RE.split(value))
+
+
+def _template(locale: str, key: str) -> tuple[str, ...]:
+    """Compiled value of key in locale (falling back to es, then to the key itself), cached."""
+    cache_key = (locale, key)
+    template = _templates.get(cache_key)
+    if template is None:
+        value = _load_catalog(locale).get(key)
+        if not value and locale != DEFAULT_LOCALE:
+            value = _load_catalog(DEFAULT_LOCALE).get(key)
+        if value is None:
+            value = key
+        template = _templates[cache_key] = _compile(value)
+    return template
+
+
 def t(key: str, **kwargs: str) -> str:
     """
     Translate the key to the current locale. If the value is empty, use the one from es.
-    kwargs replaces {name} placeholders in the string.
+    kwargs replaces {name} placeholders in the string (placeholders without a kwarg are kept).
     """
-    root = config_impl.get_project_root()
-    locale = get_current_locale(root)
-    catalog = _load_catalog(locale)
-    fallback = _load_catalog(DEFAULT_LOCALE) if locale != DEFAULT_LOCALE else None
-
-    value = catalog.get(key)
-    if not value and fallback:
-        value = fallback.get(key)
-    if value is None:
-        value = key
-
-    for k, v in kwargs.items():
-        value = value.replace("{" + k + "}", str(v))
-    return value
+    template = _template(get_current_locale(), key)
+    if len(template) == 1:
+        return template[0]
+    parts = list(template)
+    for i in range(1, len(parts), 2):
+        name = parts[i]
+        parts[i] = str(kwargs[name]) if name in kwargs else "{" + name + "}"
+    return "".join(parts)
 
 
 def get_available_locales() -> list[tuple[str, str]]:
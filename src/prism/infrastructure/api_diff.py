@@ -0,0 +1,162 @@
+# Precomputed API diff between release and prerelease (member_signatures + api_diff tables).
+
+import hashlib
+import re
+import sqlite3
+from pathlib import Path
+
+from ..domain.constants import DIFF_BASE_VERSION, DIFF_TARGET_VERSION
+from . import config_impl
+from . import db
+
+RE_PARAM_ANNOTATION = re.compile(r"@[\w\.]+(?:\([^\)]*\))?\s*")
+
+
+def _split_params(params: str) -> list[str]:
+    """Splits a parameter list on top-level commas (commas inside generics are kept)."""
+    parts, depth, current = [], 0, []
+    for ch in params:
+        if ch == "<":
+            depth += 1
+        elif ch == ">":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+def param_types(params: str) -> str:
+    """'final Map<String, Foo> a, int b' -> 'Map<String,Foo>,int' (names, final and annotations dropped)."""
+    types = []
+    for p in _split_params(params or ""):
+        p = RE_PARAM_ANNOTATION.sub("", p).replace("final ", "").strip()
+        # Drop the trailing parameter name if there is one after the type
+        head, sep, tail = p.rpartition(" ")
+        if sep and re.fullmatch(r"\w+", tail) and not head.endswith((",", "<")):
+            p = head
+        types.append(re.sub(r"\s+", "", p))
+    return ",".join(types)
+
+
+def _sig_hash(signature: str) -> str:
+    return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+
+
+def build_member_signatures(conn: sqlite3.Connection) -> int:
+    """
+    Fills member_signatures from classes, methods and constants: one row per class, method
+    overload and constant, keyed by a stable member_key (fqcn, fqcn#name(types), fqcn.NAME)
+    with its readable signature. Method hashes cover annotation, modifiers, return type and
+    parameter types only: a renamed parameter (or arg0-style names in a JAR-built index) is not
+    a change. Returns the number of rows.
+    """
+    conn.execute("DELETE FROM member_signatures")
+    rows = []
+    for c in conn.execute("SELECT id, package, class_name, kind, parent, interfaces FROM classes"):
+        fqcn = f"{c['package']}.{c['class_name']}"
+        signature = f"{c['kind']} {c['class_name']}"
+        if c["parent"]:
+            signature += f" extends {c['parent']}"
+        if c["interfaces"]:
+            signature += f" implements {c['interfaces']}"
+        rows.append((fqcn, fqcn, "class", c["package"], c["class_name"], None, signature, _sig_hash(signature)))
+    for m in conn.execute(
+        """SELECT c.package, c.class_name, m.method, m.returns, m.params, m.is_static, m.annotation
+           FROM methods m JOIN classes c ON c.id = m.class_id"""
+    ):
+        fqcn = f"{m['package']}.{m['class_name']}"
+        member = f"{m['method']}({param_types(m['params'])})"
+        modifiers = f"{m['annotation'] + ' ' if m['annotation'] else ''}{'static ' if m['is_static'] else ''}"
+        signature = f"{modifiers}{m['returns']} {m['method']}({m['params']})"
+        returns = re.sub(r"\s+", "", m["returns"])
+        hashed = f"{modifiers}{returns} {member}"
+        rows.append((f"{fqcn}#{member}", fqcn, "method", m["package"], m["class_name"], member, signature, _sig_hash(hashed)))
+    for k in conn.execute(
+        """SELECT c.package, c.class_name, k.name, k.type, k.value
+           FROM constants k JOIN classes c ON c.id = k.class_id"""
+    ):
+        fqcn = f"{k['package']}.{k['class_name']}"
+        signature = f"{k['type']} {k['name']} = {k['value']}"
+        rows.append((f"{fqcn}.{k['name']}", fqcn, "constant", k["package"], k["class_name"], k["name"], signature, _sig_hash(signature)))
+    conn.executemany(
+        """INSERT OR IGNORE INTO member_signatures
+           (member_key, class_key, member_kind, package, class_name, member, signature, sig_hash)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+    return len(rows)
+
+
+def _compute_into(conn: sqlite3.Connection) -> int:
+    """
+    Rebuilds api_diff in conn (target DB) against the attached 'base' DB. Members of classes that
+    were added or removed as a whole are not listed separately (the class row covers them).
+    """
+    conn.execute("DELETE FROM api_diff")
+    conn.execute("""
+        INSERT INTO api_diff (change, member_kind, package, class_name, member, member_key, old_signature, new_signature)
+        SELECT 'added', t.member_kind, t.package, t.class_name, t.member, t.member_key, NULL, t.signature
+        FROM member_signatures t
+        WHERE NOT EXISTS (SELECT 1 FROM base.member_signatures b WHERE b.member_key = t.member_key)
+          AND (t.member_kind = 'class'
+               OR EXISTS (SELECT 1 FROM base.member_signatures b WHERE b.member_key = t.class_key))
+    """)
+    conn.execute("""
+        INSERT INTO api_diff (change, member_kind, package, class_name, member, member_key, old_signature, new_signature)
+        SELECT 'removed', b.member_kind, b.package, b.class_name, b.member, b.member_key, b.signature, NULL
+        FROM base.member_signatures b
+        WHERE NOT EXISTS (SELECT 1 FROM member_signatures t WHERE t.member_key = b.member_key)
+          AND (b.member_kind = 'class'
+               OR EXISTS (SELECT 1 FROM member_signatures t WHERE t.member_key = b.class_key))
+    """)
+    conn.execute("""
+        INSERT INTO api_diff (change, member_kind, package, class_name, member, member_key, old_signature, new_signature)
+        SELECT 'changed', t.member_kind, t.package, t.class_name, t.member, t.member_key, b.signature, t.signature
+        FROM member_signatures t JOIN base.member_signatures b ON b.member_key = t.member_key
+        WHERE b.sig_hash <> t.sig_hash
+    """)
+    return conn.execute("SELECT COUNT(*) FROM api_diff").fetchone()[0]
+
+
+def refresh_api_diff(root: Path | None = None, version: str | None = None, build_path: Path | None = None) -> int | None:
+    """
+    Recomputes the diff in the DIFF_TARGET_VERSION DB if both DBs exist and carry member signatures.
+    Called after indexing either version; build_path: unfinished build of version (see db.begin_build)
+    used in place of its DB. Returns the number of diff rows, or None if not possible.
+    """
+    root = root or config_impl.get_project_root()
+    base_path = config_impl.get_db_path(root, DIFF_BASE_VERSION)
+    target_path = config_impl.get_db_path(root, DIFF_TARGET_VERSION)
+    if base_path.resolve() == target_path.resolve():
+        return None
+    if build_path is not None:
+        base_path = build_path if version == DIFF_BASE_VERSION else base_path
+        target_path = build_path if version == DIFF_TARGET_VERSION else target_path
+    if not base_path.is_file() or not target_path.is_file():
+        return None
+    with db.connection(target_path) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != db.SCHEMA_VERSION:
+            return None
+        return compute_diff(conn, base_path)
+
+
+def compute_diff(conn: sqlite3.Connection, base_path: Path) -> int | None:
+    """
+    Rebuilds api_diff in conn against the index DB at base_path (attached as 'base' for the query).
+    Commits (the attached DB can only be detached outside a transaction). Returns the number
+    of diff rows, or None if base_path has an older schema.
+    """
+    conn.execute("ATTACH DATABASE ? AS base", (str(base_path),))
+    try:
+        if conn.execute("PRAGMA base.user_version").fetchone()[0] != db.SCHEMA_VERSION:
+            return None
+        count = _compute_into(conn)
+        conn.commit()
+        return count
+    finally:
+        conn.execute("DETACH DATABASE base")
@@ -0,0 +1,429 @@
+# Archive of named game builds (prism_builds.db): interned strings, one row per distinct
+# class/method/constant record and validity ranges of builds, so storage grows with the
+# changes between builds rather than with their number. Builds are materialized on demand
+# into regular index DBs (workspace/db/builds/<name>.db) that every prism_* tool can query.
+
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import api_diff
+from . import config_impl
+from . import content_store
+from . import db
+
+ARCHIVE_DB_NAME = "prism_builds.db"
+
+# Build names: JAR version or date (e.g. 2026.10.1, 2026-10-19-pre); not a version name
+BUILD_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+# (records table, ranges table, interned columns, plain columns) per member kind
+_RECORD_TABLES = {
+    "class": ("class_records", "class_ranges", ("package", "class_name", "kind", "file_path", "parent", "interfaces"), ()),
+    "method": ("method_records", "method_ranges", ("package", "class_name", "method", "returns", "params", "annotation"), ("is_static",)),
+    "constant": ("constant_records", "constant_ranges", ("package", "class_name", "name", "type", "value"), ()),
+}
+
+# Source rows of each kind in a version index DB, in _RECORD_TABLES column order
+_SOURCE_QUERIES = {
+    "class": "SELECT package, class_name, kind, file_path, parent, interfaces FROM classes",
+    "method": """SELECT c.package, c.class_name, m.method, m.returns, m.params, m.annotation, m.is_static
+                 FROM methods m JOIN classes c ON c.id = m.class_id""",
+    "constant": """SELECT c.package, c.class_name, k.name, k.type, k.value
+                   FROM constants k JOIN classes c ON c.id = k.class_id""",
+}
+
+_materialize_lock = threading.Lock()
+
+
+def get_archive_path(root: Path | None = None) -> Path:
+    return config_impl.get_db_dir(root) / ARCHIVE_DB_NAME
+
+
+def get_build_cache_dir(root: Path | None = None) -> Path:
+    """Materialized build DBs (regenerable cache)."""
+    return config_impl.get_db_dir(root) / "builds"
+
+
+def get_build_db_path(root: Path | None, name: str) -> Path:
+    return get_build_cache_dir(root) / f"{name}.db"
+
+
+def get_build_manifest_name(name: str) -> str:
+    """Name of the source manifest snapshot of a build (see content_store)."""
+    return f"build-{name}"
+
+
+def is_valid_build_name(name: str) -> bool:
+    from ..domain.constants import VALID_SERVER_VERSIONS
+
+    return bool(BUILD_NAME_RE.match(name or "")) and name not in VALID_SERVER_VERSIONS
+
+
+def _init_archive(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS builds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            version TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            classes INTEGER NOT NULL,
+            methods INTEGER NOT NULL,
+            constants INTEGER NOT NULL
+        )
+    """)
+    # id 0 stands for NULL so that UNIQUE constraints on records treat missing values as equal
+    conn.execute("CREATE TABLE IF NOT EXISTS strings (id INTEGER PRIMARY KEY, value TEXT NOT NULL UNIQUE)")
+    for records, ranges, interned, plain in _RECORD_TABLES.values():
+        cols = [f"{c}_id INTEGER NOT NULL" for c in interned] + [f"{c} INTEGER NOT NULL" for c in plain]
+        unique = ", ".join([f"{c}_id" for c in interned] + list(plain))
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {records} (
+                id INTEGER PRIMARY KEY,
+                {", ".join(cols)},
+                UNIQUE({unique})
+            )
+        """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {ranges} (
+                record_id INTEGER NOT NULL,
+                first_build INTEGER NOT NULL,
+                last_build INTEGER NOT NULL
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{ranges}_last ON {ranges}(last_build, record_id)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{ranges}_first ON {ranges}(first_build)")
+    conn.commit()
+
+
+class _Interner:
+    """String -> id dictionary backed by the strings table (loaded once per archive update)."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.ids = {r[1]: r[0] for r in conn.execute("SELECT id, value FROM strings")}
+
+    def __call__(self, value: str | None) -> int:
+        if value is None:
+            return 0
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.conn.execute("INSERT INTO strings (value) VALUES (?)", (value,)).lastrowid
+            self.ids[value] = sid
+        return sid
+
+
+def _store_records(conn: sqlite3.Connection, source: sqlite3.Connection, kind: str, intern: _Interner) -> tuple[set[int], int]:
+    """Interns every row of one kind from source; returns (record ids of the build, new records)."""
+    records, _ranges, interned, plain = _RECORD_TABLES[kind]
+    columns = [f"{c}_id" for c in interned] + list(plain)
+    known = {tuple(r[1:]): r[0] for r in conn.execute(f"SELECT id, {', '.join(columns)} FROM {records}")}
+    insert_sql = f"INSERT INTO {records} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    ids: set[int] = set()
+    created = 0
+    n_interned = len(interned)
+    for row in source.execute(_SOURCE_QUERIES[kind]):
+        key = tuple(intern(v) for v in row[:n_interned]) + tuple(int(v) for v in row[n_interned:])
+        rid = known.get(key)
+        if rid is None:
+            rid = conn.execute(insert_sql, key).lastrowid
+            known[key] = rid
+            created += 1
+        ids.add(rid)
+    return ids, created
+
+
+def _extend_ranges(conn: sqlite3.Connection, kind: str, ids: set[int], build_id: int, prev_id: int | None) -> None:
+    """Records present in the previous build extend their range; the rest open a new one."""
+    ranges = _RECORD_TABLES[kind][1]
+    conn.execute("DROP TABLE IF EXISTS temp.build_ids")
+    conn.execute("CREATE TEMP TABLE build_ids (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO temp.build_ids (id) VALUES (?)", ((i,) for i in ids))
+    if prev_id is not None:
+        conn.execute(
+            f"UPDATE {ranges} SET last_build = ? WHERE last_build = ? AND record_id IN (SELECT id FROM temp.build_ids)",
+            (build_id, prev_id),
+        )
+    conn.execute(
+        f"""INSERT INTO {ranges} (record_id, first_build, last_build)
+            SELECT id, ?, ? FROM temp.build_ids
+            WHERE id NOT IN (SELECT record_id FROM {ranges} WHERE last_build = ?)""",
+        (build_id, build_id, build_id),
+    )
+    conn.execute("DROP TABLE temp.build_ids")
+
+
+def add_build(root: Path | None, name: str, version: str) -> tuple[bool, str | dict]:
+    """
+    Archives the current index of <version> as build <name>. If the version has decompiled
+    sources they are copied into the object store (content_store.snapshot_version; the live tree
+    is left as is) under a manifest kept with the build, so read_source and usages also work for it.
+    Returns (True, {"build", "version", "classes", "methods", "constants", "new_records",
+    "archive_bytes", "sources"}) or (False, "invalid_name"|"exists"|"no_db").
+    """
+    root = root or config_impl.get_project_root()
+    if not is_valid_build_name(name):
+        return (False, "invalid_name")
+    source_path = config_impl.get_db_path(root, version)
+    source = db.get_readonly_connection(source_path)
+    if source is None:
+        return (False, "no_db")
+    archive_path = get_archive_path(root)
+    try:
+        with db.connection(archive_path) as conn:
+            _init_archive(conn)
+            if conn.execute("SELECT 1 FROM builds WHERE name = ?", (name,)).fetchone():
+                return (False, "exists")
+            classes, methods, constants = db.get_stats(source)
+            build_id = conn.execute(
+                "INSERT INTO builds (name, version, created_at, classes, methods, constants) VALUES (?, ?, ?, ?, ?, ?)",
+                (name, version, datetime.now(timezone.utc).isoformat(timespec="seconds"), classes, methods, constants),
+            ).lastrowid
+            prev = conn.execute("SELECT MAX(id) FROM builds WHERE id < ?", (build_id,)).fetchone()[0]
+            intern = _Interner(conn)
+            new_records = 0
+            for kind in _RECORD_TABLES:
+                ids, created = _store_records(conn, source, kind, intern)
+                _extend_ranges(conn, kind, ids, build_id, prev)
+                new_records += created
+            conn.commit()
+    finally:
+        source.close()
+
+    sources = content_store.snapshot_version(root, version, get_build_manifest_name(name)) is not None
+    get_build_db_path(root, name).unlink(missing_ok=True)
+    return (True, {
+        "build": name,
+        "version": version,
+        "classes": classes,
+        "methods": methods,
+        "constants": constants,
+        "new_records": new_records,
+        "archive_bytes": archive_path.stat().st_size,
+        "sources": sources,
+    })
+
+
+def list_builds(root: Path | None = None) -> list[dict]:
+    """Archived builds, oldest first: {"name", "version", "created_at", "classes", "methods", "constants"}."""
+    archive_path = get_archive_path(root)
+    conn = db.get_readonly_connection(archive_path)
+    if conn is None:
+        return []
+    try:
+        rows = conn.execute(
+            "SELECT name, version, created_at, classes, methods, constants FROM builds ORDER BY id"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+    return [dict(r) for r in rows]
+
+
+def get_build(root: Path | None, name: str) -> dict | None:
+    """{"id", "name", "version", ..., "previous"} for a build, or None if it is not archived."""
+    conn = db.get_readonly_connection(get_archive_path(root))
+    if conn is None:
+        return None
+    try:
+        row = conn.execute("SELECT * FROM builds WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        prev = conn.execute(
+            "SELECT name FROM builds WHERE id < ? ORDER BY id DESC LIMIT 1", (row["id"],)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return {**dict(row), "previous": prev["name"] if prev else None}
+
+
+def remove_build(root: Path | None, name: str) -> bool:
+    """Removes a build, the records only it used, its cached DB and its source manifest."""
+    root = root or config_impl.get_project_root()
+    archive_path = get_archive_path(root)
+    if not archive_path.is_file():
+        return False
+    with db.connection(archive_path) as conn:
+        _init_archive(conn)
+        row = conn.execute("SELECT id FROM builds WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return False
+        build_id = row["id"]
+        conn.execute("DELETE FROM builds WHERE id = ?", (build_id,))
+        # Ranges of other builds stay valid: queries test first_build <= id <= last_build
+        for records, ranges, _interned, _plain in _RECORD_TABLES.values():
+            conn.execute(f"DELETE FROM {ranges} WHERE first_build = ? AND last_build = ?", (build_id, build_id))
+            conn.execute(f"DELETE FROM {records} WHERE id NOT IN (SELECT record_id FROM {ranges})")
+        conn.commit()
+    # Cached DBs of this build and of the next one (its diff was against this build)
+    shutil.rmtree(get_build_cache_dir(root), ignore_errors=True)
+    content_store.get_manifest_path(root, get_build_manifest_name(name)).unlink(missing_ok=True)
+    content_store.gc_objects(root)
+    return True
+
+
+def _live_records(kind: str, build_id: int) -> str:
+    """FROM clause: records of one kind whose validity range covers build_id (archive attached as 'arc')."""
+    records, ranges, _interned, _plain = _RECORD_TABLES[kind]
+    return (f"arc.{records} r JOIN arc.{ranges} g ON g.record_id = r.id "
+            f"AND g.first_build <= {int(build_id)} AND g.last_build >= {int(build_id)}")
+
+
+def _string_joins(columns: tuple[str, ...]) -> tuple[str, str]:
+    """(select list, LEFT JOINs) resolving interned <column>_id values of r (id 0 resolves to NULL)."""
+    select = ", ".join(f"s_{c}.value" for c in columns)
+    joins = " ".join(f"LEFT JOIN arc.strings s_{c} ON s_{c}.id = r.{c}_id" for c in columns)
+    return select, joins
+
+
+def _fill_build_db(conn: sqlite3.Connection, build_id: int) -> None:
+    """Fills classes, methods, constants and api_fts of one build from the attached 'arc' archive."""
+    select, joins = _string_joins(_RECORD_TABLES["class"][2])
+    conn.execute(f"""
+        INSERT OR IGNORE INTO classes (package, class_name, kind, file_path, parent, interfaces)
+        SELECT {select} FROM {_live_records("class", build_id)} {joins}
+    """)
+    # Members reach their class row through the interned package and class name
+    owner = """JOIN arc.strings sp ON sp.id = r.package_id
+        JOIN arc.strings sc ON sc.id = r.class_name_id
+        JOIN classes c ON c.package = sp.value AND c.class_name = sc.value"""
+    select, joins = _string_joins(("method", "returns", "params", "annotation"))
+    conn.execute(f"""
+        INSERT INTO methods (class_id, method, returns, params, annotation, is_static)
+        SELECT c.id, {select}, r.is_static FROM {_live_records("method", build_id)} {owner} {joins}
+    """)
+    select, joins = _string_joins(("name", "type", "value"))
+    conn.execute(f"""
+        INSERT INTO constants (class_id, name, type, value)
+        SELECT c.id, {select} FROM {_live_records("constant", build_id)} {owner} {joins}
+    """)
+    conn.create_function("fts_subwords", 2, db.fts_subwords, deterministic=True)
+    conn.execute("""
+        INSERT INTO api_fts (rowid, package, class_name, kind, method_name, returns, params, subwords)
+        SELECT m.id, c.package, c.class_name, c.kind, m.method, m.returns, m.params,
+            fts_subwords(m.method, NULL)
+        FROM methods m JOIN classes c ON c.id = m.class_id
+    """)
+    conn.execute(f"""
+        INSERT INTO api_fts (rowid, package, class_name, kind, const_name, const_value, subwords)
+        SELECT k.id + {db.CONSTANT_ROWID_BASE}, c.package, c.class_name, c.kind, k.name, k.value,
+            fts_subwords(NULL, k.name)
+        FROM constants k JOIN classes c ON c.id = k.class_id
+    """)
+
+
+def _write_build_db(root: Path, build: dict, path: Path) -> None:
+    """Creates the index DB of a build at path (no API diff)."""
+    with db.connection(path) as conn:
+        db.init_schema(conn, config_impl.get_fts_profile_from_config(root))
+        conn.execute("ATTACH DATABASE ? AS arc", (str(get_archive_path(root)),))
+        try:
+            _fill_build_db(conn, build["id"])
+            conn.commit()
+        finally:
+            conn.execute("DETACH DATABASE arc")
+        api_diff.build_member_signatures(conn)
+        conn.commit()
+
+
+def _is_current(path: Path) -> bool:
+    """True if a cached build DB exists and was written with the current db.SCHEMA_VERSION."""
+    conn = db.get_readonly_connection(path) if path.is_file() else None
+    if conn is None:
+        return False
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0] == db.SCHEMA_VERSION
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+def _materialize(root: Path, build: dict) -> Path:
+    """
+    Cached index DB of a build with its API diff against the previous build. The previous build
+    is compared from its own cached DB when there is one, else from a diff-less temporary DB that
+    is deleted afterwards (never cached: the cache only holds complete DBs). Cached DBs of an older
+    schema are rebuilt.
+    """
+    path = get_build_db_path(root, build["name"])
+    if _is_current(path):
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    _write_build_db(root, build, tmp)
+    previous = get_build(root, build["previous"]) if build["previous"] else None
+    if previous is not None:
+        base = get_build_db_path(root, previous["name"])
+        base_tmp = None
+        if not _is_current(base):
+            base = base_tmp = path.with_name(path.name + ".base.tmp")
+            base.unlink(missing_ok=True)
+            _write_build_db(root, previous, base)
+        try:
+            with db.connection(tmp) as conn:
+                api_diff.compute_diff(conn, base)
+        finally:
+            if base_tmp is not None:
+                base_tmp.unlink(missing_ok=True)
+    os.replace(tmp, path)
+    return path
+
+
+def materialize_build(root: Path | None, name: str) -> Path | None:
+    """
+    Index DB of an archived build (classes, methods, constants, FTS, member signatures and the
+    API diff against the previous build), created on first use and cached. None if unknown.
+    """
+    root = root or config_impl.get_project_root()
+    build = get_build(root, name)
+    if build is None:
+        return None
+    with _materialize_lock:
+        return _materialize(root, build)
+
+
+class BuildConfigProvider:
+    """
+    ConfigProvider that serves one archived build for every version: index DB from
+    materialize_build, sources from the build's manifest in the object store.
+    """
+
+    def __init__(self, base, build: str, db_path: Path):
+        self.base = base
+        self.build = build
+        self.db_path = db_path
+
+    def get_project_root(self) -> Path:
+        return self.base.get_project_root()
+
+    def get_db_path(self, root: Path | None, version: str | None) -> Path:
+        return self.db_path
+
+    def get_decompiled_dir(self, root: Path | None, version: str) -> Path:
+        return self.base.get_decompiled_dir(root, version)
+
+    def get_source_store(self, root: Path | None, version: str):
+        return content_store.ManifestSourceStore(root, get_build_manifest_name(self.build))
+
+    def load_config(self, root: Path | None) -> dict:
+        return self.base.load_config(root)
+
+    def get_active_server(self, root: Path | None) -> str | None:
+        return self.base.get_active_server(root)
+
+
+def open_build_provider(base, root: Path | None, build: str) -> BuildConfigProvider | None:
+    """BuildConfigProvider for an archived build (materializing it if needed); None if unknown."""
+    db_path = materialize_build(root, build)
+    if db_path is None:
+        return None
+    return BuildConfigProvider(base, build, db_path)
@@ -0,0 +1,80 @@
+# Build metadata of an index DB (build_info table): counts, time per phase, JAR fingerprint, versions.
+
+import hashlib
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import db
+
+# Bytes read per step when hashing the server JAR
+FINGERPRINT_CHUNK = 1024 * 1024
+
+
+class PhaseTimer:
+    """Wall-clock seconds per indexing phase, in the order the phases ran."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(self.phases.get(name, 0.0) + time.perf_counter() - start, 3)
+
+
+def jar_fingerprint(jar_path: Path | None) -> dict | None:
+    """{"name", "size", "mtime", "sha256"} of the server JAR. None if not configured or unreadable."""
+    if jar_path is None:
+        return None
+    try:
+        st = jar_path.stat()
+        digest = hashlib.sha256()
+        with open(jar_path, "rb") as f:
+            while chunk := f.read(FINGERPRINT_CHUNK):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return {
+        "name": jar_path.name,
+        "size": st.st_size,
+        "mtime": datetime.fromtimestamp(st.st_mtime, timezone.utc).isoformat(timespec="seconds"),
+        "sha256": digest.hexdigest(),
+    }
+
+
+def record_build(
+    db_path: Path,
+    stats: tuple[int, int, int],
+    phases: dict[str, float],
+    extractor: str,
+    extractor_version: int,
+    fts_profile: str,
+    jar_path: Path | None = None,
+) -> dict:
+    """
+    Writes the build_info of a finished index (last step of every indexing path) and returns it.
+    stats: (classes, methods, constants); extractor: "sources" (regex over decompiled code) or "jar";
+    fts_profile: layout api_fts was created with (see db.FTS_PROFILES).
+    """
+    classes, methods, constants = stats
+    info = {
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "classes": classes,
+        "methods": methods,
+        "constants": constants,
+        "seconds": round(sum(phases.values()), 3),
+        "phases": phases,
+        "extractor": extractor,
+        "extractor_version": extractor_version,
+        "schema_version": db.SCHEMA_VERSION,
+        "fts_profile": fts_profile,
+        "jar": jar_fingerprint(jar_path),
+    }
+    with db.connection(db_path) as conn:
+        db.write_build_info(conn, info)
+    return info
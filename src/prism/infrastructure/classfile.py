@@ -0,0 +1,589 @@
+# Minimal JVM classfile reader: the public API of a .class (modifiers, generic signatures,
+# supertypes, annotations, parameter names, constant values) without decompiling it.
+
+import struct
+import zipfile
+from pathlib import Path
+from typing import Iterator
+
+CLASS_MAGIC = 0xCAFEBABE
+
+ACC_PUBLIC = 0x0001
+ACC_STATIC = 0x0008
+ACC_FINAL = 0x0010
+ACC_BRIDGE = 0x0040
+ACC_VARARGS = 0x0080
+ACC_INTERFACE = 0x0200
+ACC_SYNTHETIC = 0x1000
+ACC_ANNOTATION = 0x2000
+ACC_ENUM = 0x4000
+
+# Constant pool tags
+_CP_UTF8, _CP_INTEGER, _CP_FLOAT, _CP_LONG, _CP_DOUBLE = 1, 3, 4, 5, 6
+_CP_CLASS, _CP_STRING, _CP_METHOD_HANDLE = 7, 8, 15
+# Fixed payload size of the tags whose value we never need
+_CP_SKIP = {9: 4, 10: 4, 11: 4, 12: 4, 16: 2, 17: 4, 18: 4, 19: 2, 20: 2}
+
+_BASE_TYPES = {
+    "B": "byte", "C": "char", "D": "double", "F": "float", "I": "int",
+    "J": "long", "S": "short", "Z": "boolean", "V": "void",
+}
+
+# Supertypes that source code never spells out
+_IMPLICIT_SUPERS = {"java/lang/Object", "java/lang/Enum", "java/lang/Record"}
+
+
+def _decode_mutf8(raw: bytes) -> str:
+    """Decodes the JVM's modified UTF-8 (encoded NUL, surrogate pairs as two 3-byte sequences)."""
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        s = raw.replace(b"\xc0\x80", b"\x00").decode("utf-8", errors="surrogatepass")
+        return s.encode("utf-16", errors="surrogatepass").decode("utf-16", errors="replace")
+
+
+class _Reader:
+    """Big-endian cursor over the classfile bytes."""
+
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def u1(self) -> int:
+        v = self.data[self.pos]
+        self.pos += 1
+        return v
+
+    def u2(self) -> int:
+        v = (self.data[self.pos] << 8) | self.data[self.pos + 1]
+        self.pos += 2
+        return v
+
+    def u4(self) -> int:
+        (v,) = struct.unpack_from(">I", self.data, self.pos)
+        self.pos += 4
+        return v
+
+    def take(self, n: int) -> bytes:
+        v = self.data[self.pos : self.pos + n]
+        if len(v) != n:
+            raise ValueError("truncated classfile")
+        self.pos += n
+        return v
+
+
+def _read_constant_pool(r: _Reader) -> list:
+    """Constant pool as a list indexed like the JVM (slot 0 and the slot after long/double are None)."""
+    count = r.u2()
+    pool: list = [None] * count
+    i = 1
+    while i < count:
+        tag = r.u1()
+        if tag == _CP_UTF8:
+            pool[i] = _decode_mutf8(r.take(r.u2()))
+        elif tag == _CP_INTEGER:
+            pool[i] = struct.unpack(">i", r.take(4))[0]
+        elif tag == _CP_FLOAT:
+            pool[i] = ("F", r.take(4))
+        elif tag == _CP_LONG:
+            pool[i] = struct.unpack(">q", r.take(8))[0]
+            i += 1
+        elif tag == _CP_DOUBLE:
+            pool[i] = struct.unpack(">d", r.take(8))[0]
+            i += 1
+        elif tag in (_CP_CLASS, _CP_STRING):
+            pool[i] = (tag, r.u2())
+        elif tag == _CP_METHOD_HANDLE:
+            r.take(3)
+        elif tag in _CP_SKIP:
+            r.take(_CP_SKIP[tag])
+        else:
+            raise ValueError(f"unknown constant pool tag {tag}")
+        i += 1
+    return pool
+
+
+def _utf8(pool: list, index: int) -> str | None:
+    v = pool[index] if 0 < index < len(pool) else None
+    return v if isinstance(v, str) else None
+
+
+def _class_name(pool: list, index: int) -> str | None:
+    v = pool[index] if 0 < index < len(pool) else None
+    return _utf8(pool, v[1]) if isinstance(v, tuple) and v[0] == _CP_CLASS else None
+
+
+def _skip_element_value(r: _Reader) -> None:
+    tag = chr(r.u1())
+    if tag == "e":
+        r.take(4)
+    elif tag == "@":
+        _read_annotation(r)
+    elif tag == "[":
+        for _ in range(r.u2()):
+            _skip_element_value(r)
+    else:
+        r.take(2)
+
+
+def _read_annotation(r: _Reader) -> int:
+    """Skips one annotation structure; returns its type descriptor index."""
+    type_index = r.u2()
+    for _ in range(r.u2()):
+        r.take(2)
+        _skip_element_value(r)
+    return type_index
+
+
+def _read_attributes(r: _Reader, pool: list, wanted: set[str]) -> dict[str, bytes]:
+    """{name: payload} of the wanted attributes; the rest are skipped."""
+    attrs = {}
+    for _ in range(r.u2()):
+        name = _utf8(pool, r.u2())
+        payload = r.take(r.u4())
+        if name in wanted:
+            attrs[name] = payload
+    return attrs
+
+
+def _annotation_types(pool: list, attrs: dict[str, bytes]) -> list[str]:
+    """Descriptors of the annotations (runtime visible first, then invisible/class-retention)."""
+    out = []
+    for key in ("RuntimeVisibleAnnotations", "RuntimeInvisibleAnnotations"):
+        payload = attrs.get(key)
+        if payload is None:
+            continue
+        r = _Reader(payload)
+        for _ in range(r.u2()):
+            desc = _utf8(pool, _read_annotation(r))
+            if desc:
+                out.append(desc)
+    return out
+
+
+def _u2_attr(pool: list, attrs: dict[str, bytes], key: str) -> int | None:
+    payload = attrs.get(key)
+    return _Reader(payload).u2() if payload is not None and len(payload) >= 2 else None
+
+
+_MEMBER_ATTRS = {"Signature", "ConstantValue", "RuntimeVisibleAnnotations", "RuntimeInvisibleAnnotations"}
+_METHOD_ATTRS = _MEMBER_ATTRS | {"MethodParameters", "Code"}
+_CLASS_ATTRS = _MEMBER_ATTRS | {"InnerClasses", "SourceFile", "Record"}
+
+
+def _parameter_names(pool: list, access: int, descriptor: str, attrs: dict[str, bytes]) -> list[str | None]:
+    """Parameter names from MethodParameters, else the LocalVariableTable of Code (javac -g)."""
+    n_params = len(_parse_method_descriptor(descriptor)[0])
+    payload = attrs.get("MethodParameters")
+    if payload is not None:
+        r = _Reader(payload)
+        names = []
+        for _ in range(r.u1()):
+            names.append(_utf8(pool, r.u2()))
+            r.u2()
+        if len(names) == n_params:
+            return names
+    code = attrs.get("Code")
+    if code is None:
+        return [None] * n_params
+    r = _Reader(code)
+    r.take(4)  # max_stack, max_locals
+    r.take(r.u4())
+    for _ in range(r.u2()):
+        r.take(8)
+    lvt = _read_attributes(r, pool, {"LocalVariableTable"}).get("LocalVariableTable")
+    if lvt is None:
+        return [None] * n_params
+    by_slot = {}
+    r = _Reader(lvt)
+    for _ in range(r.u2()):
+        start_pc = r.u2()
+        r.take(2)  # length
+        name_index = r.u2()
+        r.take(2)  # descriptor_index
+        slot = r.u2()
+        if start_pc == 0:
+            by_slot[slot] = _utf8(pool, name_index)
+    names = []
+    slot = 0 if access & ACC_STATIC else 1
+    for p in _parse_method_descriptor(descriptor)[0]:
+        names.append(by_slot.get(slot))
+        slot += 2 if p in ("J", "D") else 1
+    return names
+
+
+def parse_class(data: bytes) -> dict:
+    """
+    Parses one .class file. Returns {"name", "access", "super", "interfaces", "signature",
+    "source_file", "annotations", "inner" (access/name of this class if nested), "is_record",
+    "fields": [...], "methods": [...]} with internal (slash) names and raw descriptors.
+    Raises ValueError if data is not a valid classfile.
+    """
+    r = _Reader(data)
+    if len(data) < 10 or r.u4() != CLASS_MAGIC:
+        raise ValueError("not a classfile")
+    r.take(4)  # minor, major version
+    pool = _read_constant_pool(r)
+    access = r.u2()
+    name = _class_name(pool, r.u2())
+    super_index = r.u2()
+    super_name = _class_name(pool, super_index) if super_index else None
+    interfaces = [_class_name(pool, r.u2()) for _ in range(r.u2())]
+
+    def members(wanted: set[str]) -> list[dict]:
+        out = []
+        for _ in range(r.u2()):
+            m_access, m_name, m_desc = r.u2(), _utf8(pool, r.u2()), _utf8(pool, r.u2())
+            attrs = _read_attributes(r, pool, wanted)
+            out.append({"access": m_access, "name": m_name, "descriptor": m_desc, "attrs": attrs})
+        return out
+
+    fields = members(_MEMBER_ATTRS)
+    methods = members(_METHOD_ATTRS)
+    attrs = _read_attributes(r, pool, _CLASS_ATTRS)
+
+    inner = None
+    payload = attrs.get("InnerClasses")
+    if payload is not None:
+        ir = _Reader(payload)
+        for _ in range(ir.u2()):
+            inner_index, outer_index, inner_name_index, inner_access = ir.u2(), ir.u2(), ir.u2(), ir.u2()
+            if _class_name(pool, inner_index) == name:
+                inner = {
+                    "access": inner_access,
+                    "name": _utf8(pool, inner_name_index) if inner_name_index else None,
+                    "outer": _class_name(pool, outer_index) if outer_index else None,
+                }
+                break
+
+    for f in fields:
+        fa = f.pop("attrs")
+        f["signature"] = _utf8(pool, _u2_attr(pool, fa, "Signature") or 0)
+        f["annotations"] = _annotation_types(pool, fa)
+        cv = _u2_attr(pool, fa, "ConstantValue")
+        value = pool[cv] if cv and cv < len(pool) else None
+        if isinstance(value, tuple) and value[0] == _CP_STRING:
+            value = _utf8(pool, value[1])
+        f["constant"] = value
+    for m in methods:
+        ma = m.pop("attrs")
+        m["signature"] = _utf8(pool, _u2_attr(pool, ma, "Signature") or 0)
+        m["annotations"] = _annotation_types(pool, ma)
+        m["param_names"] = _parameter_names(pool, m["access"], m["descriptor"], ma)
+
+    return {
+        "name": name,
+        "access": access,
+        "super": super_name,
+        "interfaces": interfaces,
+        "signature": _utf8(pool, _u2_attr(pool, attrs, "Signature") or 0),
+        "source_file": _utf8(pool, _u2_attr(pool, attrs, "SourceFile") or 0),
+        "annotations": _annotation_types(pool, attrs),
+        "inner": inner,
+        "is_record": "Record" in attrs or super_name == "java/lang/Record",
+        "fields": fields,
+        "methods": methods,
+    }
+
+
+# --- Descriptors and generic signatures -> Java source notation (simple names, like decompiled code) ---
+
+
+def _simple_name(internal_name: str) -> str:
+    """java/util/Map$Entry -> Map.Entry"""
+    return internal_name.rsplit("/", 1)[-1].replace("$", ".")
+
+
+class _SigParser:
+    """Recursive-descent parser for JVMS 4.7.9.1 signatures (also accepts plain descriptors)."""
+
+    def __init__(self, s: str):
+        self.s = s
+        self.i = 0
+
+    def peek(self) -> str:
+        return self.s[self.i] if self.i < len(self.s) else ""
+
+    def expect(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise ValueError(f"bad signature {self.s!r} at {self.i}")
+        self.i += 1
+
+    def identifier(self, stops: str) -> str:
+        start = self.i
+        while self.i < len(self.s) and self.s[self.i] not in stops:
+            self.i += 1
+        return self.s[start : self.i]
+
+    def type_params(self) -> list[str]:
+        """<T:Ljava/lang/Object;U::Ljava/lang/Comparable<TU;>;> -> ["T", "U extends Comparable<U>"]"""
+        out = []
+        if self.peek() != "<":
+            return out
+        self.expect("<")
+        while self.peek() != ">":
+            name = self.identifier(":")
+            bounds = []
+            while self.peek() == ":":
+                self.i += 1
+                if self.peek() in ("L", "T", "["):
+                    bound = self.ref_type()
+                    if bound != "Object":
+                        bounds.append(bound)
+            out.append(f"{name} extends {' & '.join(bounds)}" if bounds else name)
+        self.expect(">")
+        return out
+
+    def type_args(self) -> str:
+        args = []
+        self.expect("<")
+        while self.peek() != ">":
+            ch = self.peek()
+            if ch == "*":
+                self.i += 1
+                args.append("?")
+            elif ch == "+":
+                self.i += 1
+                args.append(f"? extends {self.ref_type()}")
+            elif ch == "-":
+                self.i += 1
+                args.append(f"? super {self.ref_type()}")
+            else:
+                args.append(self.ref_type())
+        self.expect(">")
+        return f"<{', '.join(args)}>"
+
+    def ref_type(self) -> str:
+        ch = self.peek()
+        if ch == "L":
+            self.i += 1
+            text = _simple_name(self.identifier("<.;"))
+            if self.peek() == "<":
+                text += self.type_args()
+            while self.peek() == ".":
+                self.i += 1
+                text += "." + self.identifier("<.;")
+                if self.peek() == "<":
+                    text += self.type_args()
+            self.expect(";")
+            return text
+        if ch == "T":
+            self.i += 1
+            name = self.identifier(";")
+            self.expect(";")
+            return name
+        if ch == "[":
+            self.i += 1
+            return self.any_type() + "[]"
+        raise ValueError(f"bad signature {self.s!r} at {self.i}")
+
+    def any_type(self) -> str:
+        ch = self.peek()
+        if ch in _BASE_TYPES:
+            self.i += 1
+            return _BASE_TYPES[ch]
+        return self.ref_type()
+
+
+def _parse_method_descriptor(descriptor: str) -> tuple[list[str], str]:
+    """(['I', 'Ljava/lang/String;', ...], return) raw parameter descriptors of a method descriptor."""
+    params = []
+    i = descriptor.index("(") + 1
+    while descriptor[i] != ")":
+        start = i
+        while descriptor[i] == "[":
+            i += 1
+        if descriptor[i] == "L":
+            i = descriptor.index(";", i)
+        i += 1
+        params.append(descriptor[start:i])
+    return params, descriptor[i + 1 :]
+
+
+def java_type(signature_or_descriptor: str) -> str:
+    """Field type in Java notation: Ljava/util/List<Ljava/lang/String;>; -> List<String>"""
+    return _SigParser(signature_or_descriptor).any_type()
+
+
+def method_types(descriptor: str, signature: str | None) -> tuple[list[str], list[str], str]:
+    """
+    (type_params, param_types, return_type) in Java notation. The generic signature is preferred,
+    unless it omits parameters the descriptor has (synthetic outer/enum parameters).
+    """
+    raw_params, raw_return = _parse_method_descriptor(descriptor)
+    if signature:
+        try:
+            p = _SigParser(signature)
+            type_params = p.type_params()
+            p.expect("(")
+            params = []
+            while p.peek() != ")":
+                params.append(p.any_type())
+            p.expect(")")
+            returns = p.any_type()
+            if len(params) == len(raw_params):
+                return type_params, params, returns
+        except ValueError:
+            pass
+    return [], [java_type(d) for d in raw_params], java_type(raw_return)
+
+
+def class_supertypes(info: dict) -> tuple[list[str], str | None, list[str]]:
+    """(type_params, superclass, interfaces) in Java notation, with generics from the Signature."""
+    if info["signature"]:
+        try:
+            p = _SigParser(info["signature"])
+            type_params = p.type_params()
+            superclass = p.ref_type()
+            interfaces = []
+            while p.peek():
+                interfaces.append(p.ref_type())
+            raw_super = info["super"]
+            return type_params, (None if raw_super in _IMPLICIT_SUPERS or raw_super is None else superclass), interfaces
+        except ValueError:
+            pass
+    superclass = None if info["super"] in _IMPLICIT_SUPERS or info["super"] is None else _simple_name(info["super"])
+    return [], superclass, [_simple_name(i) for i in info["interfaces"] if i]
+
+
+def _float32_text(raw: bytes) -> str:
+    """Shortest decimal that round-trips to the same float32 (1.5f, 0.1f)."""
+    (v,) = struct.unpack(">f", raw)
+    if v != v or v in (float("inf"), float("-inf")):
+        return repr(v)
+    for digits in range(1, 10):
+        text = f"{v:.{digits}g}"
+        if struct.pack(">f", float(text)) == raw:
+            return text
+    return repr(v)
+
+
+def constant_text(descriptor: str, value) -> str:
+    """ConstantValue rendered as in source (strings unquoted, as the regex extractor stores them)."""
+    if descriptor == "Z":
+        return "true" if value else "false"
+    if descriptor == "C":
+        return f"'{chr(value)}'"
+    if descriptor == "J":
+        return f"{value}L"
+    if descriptor == "F" and isinstance(value, tuple):
+        return f"{_float32_text(value[1])}f"
+    return str(value)
+
+
+def _annotation_text(descriptors: list[str]) -> str | None:
+    """First annotation as source text (@Deprecated), matching the single annotation the regex keeps."""
+    for desc in descriptors:
+        try:
+            return "@" + java_type(desc)
+        except ValueError:
+            continue
+    return None
+
+
+def _is_public_api_class(info: dict) -> bool:
+    """Public top-level classes and public named member classes (no anonymous/local/synthetic ones)."""
+    inner = info["inner"]
+    if inner is None:
+        return bool(info["access"] & ACC_PUBLIC) and not info["access"] & ACC_SYNTHETIC
+    return bool(inner["access"] & ACC_PUBLIC) and inner["name"] is not None and inner["outer"] is not None
+
+
+def to_api_entry(info: dict) -> tuple[str, tuple] | None:
+    """
+    (file_path, (package, class_name, kind, methods, parent, interfaces, constants)) for a parsed
+    class, in the format of the regex extractor; None if it is not public API. file_path is the
+    .java the decompiler writes the class to (nested classes share their outer class's file).
+    """
+    if not _is_public_api_class(info):
+        return None
+    internal = info["name"]
+    pkg_path, _, binary_simple = internal.rpartition("/")
+    package = pkg_path.replace("/", ".")
+    class_name = info["inner"]["name"] if info["inner"] else binary_simple
+    access = info["access"]
+    if access & ACC_INTERFACE:
+        kind = "interface"
+    elif access & ACC_ENUM:
+        kind = "enum"
+    elif info["is_record"]:
+        kind = "record"
+    else:
+        kind = "class"
+
+    _type_params, superclass, interfaces = class_supertypes(info)
+    # Generics are stripped from parent/interfaces, as in the regex extractor
+    strip = lambda t: t.split("<", 1)[0]
+    if kind == "interface":
+        # "interface A extends B, C": the regex stores the extends clause as parent
+        parent = ", ".join(strip(t) for t in interfaces) or None
+        interfaces_text = None
+    else:
+        parent = strip(superclass) if superclass else None
+        interfaces_text = ", ".join(strip(t) for t in interfaces) or None
+
+    methods = []
+    for m in info["methods"]:
+        m_access = m["access"]
+        if not m_access & ACC_PUBLIC or m_access & (ACC_SYNTHETIC | ACC_BRIDGE):
+            continue
+        name = m["name"]
+        if name in ("<init>", "<clinit>"):
+            continue
+        # Implicit enum methods are not in the source
+        if kind == "enum" and (
+            (name == "values" and m["descriptor"].startswith("()"))
+            or (name == "valueOf" and m["descriptor"].startswith("(Ljava/lang/String;)"))
+        ):
+            continue
+        type_params, param_types, returns = method_types(m["descriptor"], m["signature"])
+        if m_access & ACC_VARARGS and param_types and param_types[-1].endswith("[]"):
+            param_types[-1] = param_types[-1][:-2] + "..."
+        names = m["param_names"]
+        params = ", ".join(
+            f"{t} {names[i] if i < len(names) and names[i] else f'arg{i}'}" for i, t in enumerate(param_types)
+        )
+        methods.append({
+            "method": name,
+            "returns": f"<{', '.join(type_params)}> {returns}" if type_params else returns,
+            "params": params,
+            "is_static": bool(m_access & ACC_STATIC),
+            "annotation": _annotation_text(m["annotations"]),
+        })
+
+    constants = []
+    for f in info["fields"]:
+        f_access = f["access"]
+        if (f_access & (ACC_PUBLIC | ACC_STATIC | ACC_FINAL)) != (ACC_PUBLIC | ACC_STATIC | ACC_FINAL):
+            continue
+        if f["constant"] is None or f_access & ACC_SYNTHETIC:
+            continue
+        constants.append({
+            "name": f["name"],
+            "type": java_type(f["signature"] or f["descriptor"]),
+            "value": constant_text(f["descriptor"], f["constant"]),
+        })
+
+    outer_simple = binary_simple.split("$", 1)[0]
+    source_file = info["source_file"] or f"{outer_simple}.java"
+    file_path = f"{pkg_path}/{source_file}" if pkg_path else source_file
+    return file_path, (package, class_name, kind, methods, parent, interfaces_text, constants)
+
+
+def iter_jar_classes(jar_path: Path, prefixes: list[str]) -> Iterator[tuple[str, bytes]]:
+    """Streams (entry_name, bytes) of the .class entries under the given path prefixes of a JAR."""
+    prefixes_t = tuple(p.rstrip("/") + "/" for p in prefixes)
+    with zipfile.ZipFile(jar_path) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            if name.endswith(".class") and name.startswith(prefixes_t):
+                yield name, zf.read(info)
+
+
+def count_jar_classes(jar_path: Path, prefixes: list[str]) -> int:
+    """Number of .class entries under the prefixes (central directory only; nothing is inflated)."""
+    prefixes_t = tuple(p.rstrip("/") + "/" for p in prefixes)
+    with zipfile.ZipFile(jar_path) as zf:
+        return sum(1 for n in zf.namelist() if n.endswith(".class") and n.startswith(prefixes_t))
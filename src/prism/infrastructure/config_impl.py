@@ -3,6 +3,7 @@
 import json
 import os
 from pathlib import Path
+from typing import Callable
 
 from ..domain.constants import VALID_SERVER_VERSIONS
 
@@ -34,10 +35,44 @@ CONFIG_KEY_OUTPUT_DIR = "output_dir"
 CONFIG_KEY_JADX_PATH = "jadx_path"
 CONFIG_KEY_LANG = "lang"
 CONFIG_KEY_ACTIVE_SERVER = "active_server"
-
-
-def get_project_root() -> Path:
-    """Project root: folder containing main.py / .prism.json."""
+CONFIG_KEY_PRUNE_STRATEGY = "prune_strategy"
+CONFIG_KEY_PRUNE_JOBS = "prune_jobs"
+CONFIG_KEY_SOURCE_STORE = "source_store"
+CONFIG_KEY_FTS_PROFILE = "fts_profile"
+
+# Environment variables that change derived paths (a change invalidates the config snapshot)
+_PATH_ENV_KEYS = (ENV_OUTPUT_DIR, ENV_DB_DIR, ENV_DB_PATH_RELEASE, ENV_DB_PATH_PRERELEASE)
+
+# Memo of the project root: (PRISM_WORKSPACE, root)
+_root_memo: tuple[str | None, Path] | None = None
+# Cache: root -> current ConfigSnapshot
+_snapshots: dict[Path, "ConfigSnapshot"] = {}
+
+
+class ConfigSnapshot:
+    """
+    .prism.json of a root parsed once, plus the paths derived from it (computed on first use).
+    get_config_snapshot replaces it when the file (mtime/size) or a path env variable changes,
+    so readers pay one stat instead of reading and parsing the file again.
+    """
+
+    def __init__(self, root: Path, signature: tuple[int, int] | None, env: tuple, config: dict):
+        self.root = root
+        self.signature = signature
+        self.env = env
+        self.config = config
+        self._derived: dict[tuple, object] = {}
+
+    def memo(self, key: tuple, compute: Callable[[], object]):
+        """Value of compute() for key, computed once per snapshot."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = compute()
+            return value
+
+
+def _find_project_root() -> Path:
     env_root = os.environ.get(ENV_WORKSPACE)
     if env_root:
         p = Path(env_root).resolve()
@@ -51,9 +86,49 @@ def get_project_root() -> Path:
     return Path.cwd()
 
 
+def get_project_root() -> Path:
+    """Project root: folder containing main.py / .prism.json. Resolved again only when PRISM_WORKSPACE changes."""
+    global _root_memo
+    env_root = os.environ.get(ENV_WORKSPACE)
+    memo = _root_memo
+    if memo is None or memo[0] != env_root:
+        memo = _root_memo = (env_root, _find_project_root())
+    return memo[1]
+
+
+def _read_config(path: Path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            cfg = json.load(f)
+        return cfg if isinstance(cfg, dict) else {}
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def get_config_snapshot(root: Path | None = None) -> ConfigSnapshot:
+    """Current ConfigSnapshot of root: one stat of .prism.json, re-read only if it changed."""
+    root = root or get_project_root()
+    path = root / CONFIG_FILENAME
+    try:
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        signature = None
+    env = tuple(os.environ.get(k) for k in _PATH_ENV_KEYS)
+    snapshot = _snapshots.get(root)
+    if snapshot is None or snapshot.signature != signature or snapshot.env != env:
+        config = _read_config(path) if signature is not None else {}
+        snapshot = _snapshots[root] = ConfigSnapshot(root, signature, env, config)
+    return snapshot
+
+
 def get_workspace_dir(root: Path | None = None) -> Path:
     """Workspace directory (decompiled, db, server)."""
-    root = root or get_project_root()
+    snapshot = get_config_snapshot(root)
+    return snapshot.memo(("workspace_dir",), lambda: _resolve_workspace_dir(snapshot.root))
+
+
+def _resolve_workspace_dir(root: Path) -> Path:
     env_dir = os.environ.get(ENV_OUTPUT_DIR)
     if env_dir and Path(env_dir).is_dir():
         return Path(env_dir)
@@ -67,27 +142,27 @@ def get_config_path(root: Path | None = None) -> Path:
 
 
 def load_config(root: Path | None = None) -> dict:
-    """Load config from .prism.json. Returns empty dict if not found."""
-    path = get_config_path(root)
-    if not path.exists():
-        return {}
-    try:
-        with open(path, encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
-        return {}
+    """Load config from .prism.json (a copy of the current snapshot). Returns empty dict if not found."""
+    return dict(get_config_snapshot(root).config)
 
 
 def save_config(config: dict, root: Path | None = None) -> None:
     """Save config to .prism.json."""
+    root = root or get_project_root()
     path = get_config_path(root)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(config, f, indent=2, ensure_ascii=False)
+    # The rewrite may keep mtime and size (coarse clocks), so drop the snapshot explicitly
+    _snapshots.pop(root, None)
 
 
 def get_jar_path_from_config(root: Path | None = None) -> Path | None:
     """Gets JAR path from config. None if not defined."""
-    cfg = load_config(root)
+    snapshot = get_config_snapshot(root)
+    return snapshot.memo(("jar_path",), lambda: _resolve_jar_path(snapshot.config))
+
+
+def _resolve_jar_path(cfg: dict) -> Path | None:
     raw = cfg.get(CONFIG_KEY_JAR_PATH)
     if not raw:
         return None
@@ -97,8 +172,12 @@ def get_jar_path_from_config(root: Path | None = None) -> Path | None:
 
 def get_jar_path_release_from_config(root: Path | None = None) -> Path | None:
     """Release version JAR. Infers from jar_path or sibling if needed."""
-    root = root or get_project_root()
-    cfg = load_config(root)
+    snapshot = get_config_snapshot(root)
+    return snapshot.memo(("jar_path", "release"), lambda: _resolve_jar_path_release(snapshot))
+
+
+def _resolve_jar_path_release(snapshot: ConfigSnapshot) -> Path | None:
+    root, cfg = snapshot.root, snapshot.config
     raw = cfg.get(CONFIG_KEY_JAR_PATH_RELEASE)
     if raw:
         p = Path(raw)
@@ -118,8 +197,12 @@ def get_jar_path_release_from_config(root: Path | None = None) -> Path | None:
 
 def get_jar_path_prerelease_from_config(root: Path | None = None) -> Path | None:
     """Prerelease version JAR. Infers from jar_path or sibling if needed."""
-    root = root or get_project_root()
-    cfg = load_config(root)
+    snapshot = get_config_snapshot(root)
+    return snapshot.memo(("jar_path", "prerelease"), lambda: _resolve_jar_path_prerelease(snapshot))
+
+
+def _resolve_jar_path_prerelease(snapshot: ConfigSnapshot) -> Path | None:
+    root, cfg = snapshot.root, snapshot.config
     raw = cfg.get(CONFIG_KEY_JAR_PATH_PRERELEASE)
     if raw:
         p = Path(raw)
@@ -139,7 +222,11 @@ def get_jar_path_prerelease_from_config(root: Path | None = None) -> Path | None
 
 def get_jadx_path_from_config(root: Path | None = None) -> Path | None:
     """JADX path from config. None if missing or not executable."""
-    cfg = load_config(root)
+    snapshot = get_config_snapshot(root)
+    return snapshot.memo(("jadx_path",), lambda: _resolve_jadx_path(snapshot.config))
+
+
+def _resolve_jadx_path(cfg: dict) -> Path | None:
     raw = cfg.get(CONFIG_KEY_JADX_PATH)
     if not raw:
         return None
@@ -147,11 +234,45 @@ def get_jadx_path_from_config(root: Path | None = None) -> Path | None:
     return p if p.is_file() else None
 
 
+def get_prune_strategy_from_config(root: Path | None = None) -> str:
+    """Prune strategy from config (see prune.PRUNE_STRATEGIES). Falls back to the default if missing or unknown."""
+    from . import prune
+    raw = str(get_config_snapshot(root).config.get(CONFIG_KEY_PRUNE_STRATEGY) or "").strip().lower()
+    return raw if raw in prune.PRUNE_STRATEGIES else prune.DEFAULT_PRUNE_STRATEGY
+
+
+def get_prune_jobs_from_config(root: Path | None = None) -> int:
+    """Prune copy threads from config (1 = serial). Invalid values fall back to 1."""
+    try:
+        return max(1, int(get_config_snapshot(root).config.get(CONFIG_KEY_PRUNE_JOBS) or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
 def get_decompiled_dir(root: Path | None = None, version: str = "release") -> Path:
     """Decompiled code directory for a version."""
     return get_workspace_dir(root) / "decompiled" / version
 
 
+def get_source_archive_path(root: Path | None = None, version: str = "release") -> Path:
+    """Packed source archive for a version (alternative to the decompiled/<version> tree)."""
+    return get_workspace_dir(root) / "decompiled" / f"{version}.zip"
+
+
+def get_source_store_mode_from_config(root: Path | None = None) -> str:
+    """Source store mode from config (see source_store.SOURCE_STORE_MODES). Default "auto"."""
+    from . import source_store
+    raw = str(get_config_snapshot(root).config.get(CONFIG_KEY_SOURCE_STORE) or "").strip().lower()
+    return raw if raw in source_store.SOURCE_STORE_MODES else source_store.DEFAULT_SOURCE_STORE_MODE
+
+
+def get_fts_profile_from_config(root: Path | None = None) -> str:
+    """FTS index profile from config (see db.FTS_PROFILES). Falls back to the default if missing or unknown."""
+    from . import db
+    raw = str(get_config_snapshot(root).config.get(CONFIG_KEY_FTS_PROFILE) or "").strip().lower()
+    return raw if raw in db.FTS_PROFILES else db.DEFAULT_FTS_PROFILE
+
+
 def get_decompiled_raw_dir(root: Path | None = None, version: str = "release") -> Path:
     """Raw JADX directory for a version (before pruning)."""
     return get_workspace_dir(root) / "decompiled_raw" / version
@@ -165,12 +286,22 @@ def get_db_dir(root: Path | None = None) -> Path:
     return get_workspace_dir(root) / "db"
 
 
+def get_active_server(root: Path | None = None) -> str | None:
+    """active_server from config if it is a valid version, else None."""
+    active = get_config_snapshot(root).config.get(CONFIG_KEY_ACTIVE_SERVER)
+    return active if active in VALID_SERVER_VERSIONS else None
+
+
 def get_db_path(root: Path | None = None, version: str | None = None) -> Path:
     """Path to the DB. If version is None, uses active_server from config (default 'release')."""
-    root = root or get_project_root()
+    snapshot = get_config_snapshot(root)
+    return snapshot.memo(("db_path", version), lambda: _resolve_db_path(snapshot, version))
+
+
+def _resolve_db_path(snapshot: ConfigSnapshot, version: str | None) -> Path:
+    root = snapshot.root
     if version is None:
-        cfg = load_config(root)
-        active = cfg.get(CONFIG_KEY_ACTIVE_SERVER)
+        active = snapshot.config.get(CONFIG_KEY_ACTIVE_SERVER)
         if active in VALID_SERVER_VERSIONS:
             version = active
         else:
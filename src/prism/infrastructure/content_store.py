@@ -0,0 +1,206 @@
+# Content-addressed storage for decompiled sources shared between versions (release/prerelease).
+#
+# workspace/objects/<hh>/<sha256>  one file per distinct content (hardlinked from decompiled trees)
+# workspace/manifests/<name>.json  {"version": ..., "files": {rel_path: sha256}} per version
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+from . import config_impl
+from .source_store import DirectorySourceStore, normalize_rel_path
+
+
+def content_hash(data: bytes) -> str:
+    """Content key used by the object store, manifests and the indexer (sha256 hex)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_objects_dir(root: Path | None = None) -> Path:
+    """Directory holding one file per distinct source content."""
+    return config_impl.get_workspace_dir(root) / "objects"
+
+
+def get_manifests_dir(root: Path | None = None) -> Path:
+    """Directory holding the per-version manifests."""
+    return config_impl.get_workspace_dir(root) / "manifests"
+
+
+def get_manifest_path(root: Path | None, name: str) -> Path:
+    """Manifest file for a version (or any named snapshot of one)."""
+    return get_manifests_dir(root) / f"{name}.json"
+
+
+def get_object_path(root: Path | None, digest: str) -> Path:
+    """Path of the object for a content hash (two-level fan-out keeps directories small)."""
+    return get_objects_dir(root) / digest[:2] / digest
+
+
+def load_manifest(root: Path | None, name: str) -> dict[str, str]:
+    """{rel_path: sha256} for a manifest; empty dict if missing or unreadable."""
+    path = get_manifest_path(root, name)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return dict(json.load(f).get("files") or {})
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return {}
+
+
+def save_manifest(root: Path | None, name: str, version: str, files: dict[str, str]) -> Path:
+    """Writes a manifest atomically. Returns its path."""
+    path = get_manifest_path(root, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "files": dict(sorted(files.items()))}, f, indent=1)
+    os.replace(tmp, path)
+    return path
+
+
+class ManifestSourceStore:
+    """Sources of a manifest (e.g. an archived build) read from the object store."""
+
+    def __init__(self, root: Path | None, name: str):
+        self.root = root or config_impl.get_project_root()
+        self.files = load_manifest(self.root, name)
+
+    def exists(self) -> bool:
+        return bool(self.files)
+
+    def iter_files(self, suffix: str = ".java") -> Iterator[str]:
+        for rel_path in self.files:
+            if rel_path.endswith(suffix):
+                yield rel_path
+
+    def is_file(self, rel_path: str) -> bool:
+        p = normalize_rel_path(rel_path)
+        return p is not None and p in self.files
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        p = normalize_rel_path(rel_path)
+        digest = self.files.get(p) if p else None
+        if digest is None:
+            raise FileNotFoundError(rel_path)
+        return get_object_path(self.root, digest).read_bytes()
+
+    def read_text(self, rel_path: str) -> str:
+        return self.read_bytes(rel_path).decode("utf-8", errors="replace")
+
+
+def _write_object(obj: Path, data: bytes) -> None:
+    """Stores data as a new object file of its own (temp file + atomic rename)."""
+    tmp = obj.with_name(obj.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, obj)
+
+
+def _link_to_object(path: Path, obj: Path) -> bool:
+    """Replaces path with a hardlink to obj (atomic rename of a temp link). False if links are unsupported."""
+    tmp = path.with_name(path.name + ".dedup-tmp")
+    try:
+        tmp.unlink(missing_ok=True)
+        os.link(obj, tmp)
+    except OSError:
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def dedup_version(root: Path | None, version: str) -> dict | None:
+    """
+    Moves every file of decompiled/<version> into the object store: new contents become objects
+    (hardlinked, or copied and relinked when the file's inode is already shared, e.g. with
+    decompiled_raw after a hardlink prune), contents already stored (e.g. by the other version)
+    replace the file with a hardlink to the existing object. Writes manifests/<version>.json.
+    Returns {"files", "new_objects", "shared", "saved_bytes"} or None if there is no decompiled tree.
+    """
+    root = root or config_impl.get_project_root()
+    decompiled_dir = config_impl.get_decompiled_dir(root, version)
+    if not decompiled_dir.is_dir():
+        return None
+    files: dict[str, str] = {}
+    new_objects = shared = saved_bytes = 0
+    for rel_path in DirectorySourceStore(decompiled_dir).iter_files(""):
+        path = decompiled_dir / rel_path
+        data = path.read_bytes()
+        digest = content_hash(data)
+        files[rel_path] = digest
+        obj = get_object_path(root, digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            if path.stat().st_nlink > 1:
+                # Shared inode (e.g. a prune hardlink to decompiled_raw): JADX may rewrite it in
+                # place, so the object gets its own copy and the tree file is relinked to it
+                _write_object(obj, data)
+                _link_to_object(path, obj)
+            else:
+                try:
+                    os.link(path, obj)
+                except OSError:
+                    # No hardlinks (e.g. FAT, some volumes): keep a copy so manifests stay resolvable
+                    _write_object(obj, data)
+            new_objects += 1
+            continue
+        if os.path.samefile(path, obj):
+            continue
+        if _link_to_object(path, obj):
+            shared += 1
+            saved_bytes += len(data)
+    save_manifest(root, version, version, files)
+    return {"files": len(files), "new_objects": new_objects, "shared": shared, "saved_bytes": saved_bytes}
+
+
+def snapshot_version(root: Path | None, version: str, name: str) -> dict[str, str] | None:
+    """
+    Copies the contents of decompiled/<version> that the store lacks into new objects and writes
+    their manifest as manifests/<name>.json. Unlike dedup_version the tree itself is not touched
+    (no links in either direction), so later changes to it can't reach the objects.
+    Returns {rel_path: sha256}, or None if there is no decompiled tree or it is empty.
+    """
+    root = root or config_impl.get_project_root()
+    decompiled_dir = config_impl.get_decompiled_dir(root, version)
+    if not decompiled_dir.is_dir():
+        return None
+    files: dict[str, str] = {}
+    for rel_path in DirectorySourceStore(decompiled_dir).iter_files(""):
+        data = (decompiled_dir / rel_path).read_bytes()
+        digest = content_hash(data)
+        files[rel_path] = digest
+        obj = get_object_path(root, digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            _write_object(obj, data)
+    if not files:
+        return None
+    save_manifest(root, name, version, files)
+    return files
+
+
+def gc_objects(root: Path | None = None) -> tuple[int, int]:
+    """
+    Removes objects no manifest references. Returns (objects_kept, objects_removed).
+    """
+    root = root or config_impl.get_project_root()
+    referenced: set[str] = set()
+    manifests_dir = get_manifests_dir(root)
+    if manifests_dir.is_dir():
+        for manifest in manifests_dir.glob("*.json"):
+            referenced.update(load_manifest(root, manifest.stem).values())
+    kept = removed = 0
+    objects_dir = get_objects_dir(root)
+    if not objects_dir.is_dir():
+        return (0, 0)
+    for fan_out in objects_dir.iterdir():
+        if not fan_out.is_dir():
+            continue
+        for obj in fan_out.iterdir():
+            if obj.name in referenced:
+                kept += 1
+            else:
+                obj.unlink()
+                removed += 1
+        if not any(fan_out.iterdir()):
+            fan_out.rmdir()
+    return (kept, removed)
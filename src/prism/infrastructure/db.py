@@ -1,9 +1,70 @@
 # SQLite schema and FTS5 index for the Hytale API (classes and methods).
 
+import json
+import os
+import re
 import sqlite3
+from collections import Counter
 from contextlib import contextmanager
 from pathlib import Path
 
+# Stored in PRAGMA user_version; bump when the schema or the extractor output changes so stale
+# indexes are never used to reuse extraction results (see extractor.run_index)
+SCHEMA_VERSION = 6
+# api_fts rowid of a constant: its id plus this base, so method ids and constant ids never collide
+# and methods come first in rowid order
+CONSTANT_ROWID_BASE = 1 << 40
+
+# FTS5 layouts of api_fts, chosen when indexing (ctx db/init --fts-profile, fts_profile in .prism.json):
+#   minimal  - detail=column and no column sizes; constant values are not indexed and quoted
+#              phrases match their words in any order (see search_fts)
+#   standard - full detail: phrase and NEAR queries
+#   full     - standard plus prefix indexes for 2-4 characters, so term* queries skip range scans
+FTS_PROFILES = {
+    "minimal": {"index_values": False, "options": "detail=column, columnsize=0"},
+    "standard": {"index_values": True, "options": ""},
+    "full": {"index_values": True, "options": "prefix='2 3 4'"},
+}
+DEFAULT_FTS_PROFILE = "standard"
+
+
+# One row per optimize run (see db_optimize): file size and representative query latency before/after
+INDEX_OPTIMIZE_DDL = """
+    CREATE TABLE IF NOT EXISTS index_optimize (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        optimized_at TEXT NOT NULL,
+        seconds REAL NOT NULL,
+        page_size INTEGER NOT NULL,
+        size_before INTEGER NOT NULL,
+        size_after INTEGER NOT NULL,
+        query_ms_before REAL NOT NULL,
+        query_ms_after REAL NOT NULL
+    )
+"""
+
+# Build metadata (see build_info): one JSON value per key. Written as the last step of indexing,
+# so a DB without rows was built by an older version or did not finish
+BUILD_INFO_DDL = """
+    CREATE TABLE IF NOT EXISTS build_info (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+"""
+
+# Trigram index of the indexed sources for prism_grep: contentless, rowid = source_files.id.
+# detail=none keeps it small; it only narrows candidate files (an AND of trigrams), the regex
+# decides the matches
+SOURCE_GREP_DDL = """
+    CREATE VIRTUAL TABLE source_grep USING fts5(
+        text,
+        content='',
+        detail=none,
+        tokenize='trigram'
+    )
+"""
+# Most trigrams put in one candidate query; a longer literal adds little selectivity
+GREP_MAX_TRIGRAMS = 48
+
 
 def get_connection(db_path: Path) -> sqlite3.Connection:
     """Internal use: opens connection to the database; creates file and directory if they don't exist.
@@ -14,6 +75,45 @@ def get_connection(db_path: Path) -> sqlite3.Connection:
     return conn
 
 
+def get_build_file_path(db_path: Path) -> Path:
+    """Unfinished build of an index DB (<name>.building, same directory so the swap is atomic)."""
+    return db_path.with_name(db_path.name + ".building")
+
+
+def begin_build(db_path: Path) -> Path:
+    """
+    Fresh build file for db_path (see get_build_file_path) that an indexing run fills in full
+    before commit_build swaps it in, so readers of db_path never see a half-built index.
+    """
+    build_path = get_build_file_path(db_path)
+    for path in (build_path, build_path.with_name(build_path.name + "-journal")):
+        path.unlink(missing_ok=True)
+    build_path.parent.mkdir(parents=True, exist_ok=True)
+    return build_path
+
+
+def commit_build(build_path: Path, db_path: Path) -> None:
+    """Atomically replaces db_path with the finished build (new inode: one reload for pooled readers)."""
+    os.replace(build_path, db_path)
+
+
+def abort_build(build_path: Path) -> None:
+    """Deletes an unfinished build file (db_path is left as it was)."""
+    build_path.unlink(missing_ok=True)
+
+
+def get_readonly_connection(db_path: Path) -> sqlite3.Connection | None:
+    """Opens an existing database read-only (never creates it). None if missing or unreadable."""
+    if not db_path.is_file():
+        return None
+    try:
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    except sqlite3.Error:
+        return None
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
 @contextmanager
 def connection(db_path: Path):
     """
@@ -27,12 +127,19 @@ def connection(db_path: Path):
         conn.close()
 
 
-def init_schema(conn: sqlite3.Connection) -> None:
+def init_schema(conn: sqlite3.Connection, fts_profile: str = DEFAULT_FTS_PROFILE) -> None:
     """
-    Creates normal tables (classes, methods) and the FTS5 virtual table for searching.
-    Drops and recreates tables to ensure schema synchronization.
+    Creates normal tables (classes, methods) and the FTS5 virtual table for searching,
+    laid out as fts_profile (see FTS_PROFILES). Drops and recreates tables to ensure schema synchronization.
     """
+    profile = FTS_PROFILES[fts_profile]
     conn.execute("DROP TABLE IF EXISTS api_fts")
+    conn.execute("DROP TABLE IF EXISTS source_grep")
+    conn.execute("DROP TABLE IF EXISTS source_files")
+    conn.execute("DROP TABLE IF EXISTS member_signatures")
+    conn.execute("DROP TABLE IF EXISTS api_diff")
+    conn.execute("DROP TABLE IF EXISTS index_optimize")
+    conn.execute("DROP TABLE IF EXISTS build_info")
     conn.execute("DROP TABLE IF EXISTS methods")
     conn.execute("DROP TABLE IF EXISTS constants")
     conn.execute("DROP TABLE IF EXISTS classes")
@@ -74,8 +181,53 @@ def init_schema(conn: sqlite3.Connection) -> None:
     conn.execute("CREATE INDEX idx_methods_class_id ON methods(class_id)")
     conn.execute("CREATE INDEX idx_constants_class_id ON constants(class_id)")
     conn.execute("CREATE INDEX idx_classes_package ON classes(package)")
-
+    conn.execute("CREATE INDEX idx_classes_file_path ON classes(file_path)")
+    # One row per indexed source: content hash plus the number of classes/members extracted from it
     conn.execute("""
+        CREATE TABLE source_files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_path TEXT NOT NULL UNIQUE,
+            content_hash TEXT NOT NULL,
+            class_count INTEGER NOT NULL,
+            member_count INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX idx_source_files_hash ON source_files(content_hash)")
+    conn.execute(SOURCE_GREP_DDL)
+    # Per-member signature hashes (see api_diff.build_member_signatures) and the precomputed diff
+    conn.execute("""
+        CREATE TABLE member_signatures (
+            member_key TEXT PRIMARY KEY,
+            class_key TEXT NOT NULL,
+            member_kind TEXT NOT NULL,
+            package TEXT NOT NULL,
+            class_name TEXT NOT NULL,
+            member TEXT,
+            signature TEXT NOT NULL,
+            sig_hash TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE api_diff (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            change TEXT NOT NULL,
+            member_kind TEXT NOT NULL,
+            package TEXT NOT NULL,
+            class_name TEXT NOT NULL,
+            member TEXT,
+            member_key TEXT NOT NULL,
+            old_signature TEXT,
+            new_signature TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX idx_api_diff_package ON api_diff(package, class_name)")
+    conn.execute(INDEX_OPTIMIZE_DDL)
+    conn.execute(BUILD_INFO_DDL)
+
+    # Contentless: only the inverted index is stored, the text lives in classes/methods/constants
+    value_column = "const_value" if profile["index_values"] else "const_value UNINDEXED"
+    options = f"{profile['options']}, " if profile["options"] else ""
+    conn.execute(f"""
         CREATE VIRTUAL TABLE api_fts USING fts5(
             package,
             class_name,
@@ -84,16 +236,23 @@ def init_schema(conn: sqlite3.Connection) -> None:
             returns,
             params,
             const_name,
-            const_value,
-            tokenize='unicode61'
+            {value_column},
+            subwords,
+            content='',
+            {options}tokenize='unicode61'
         )
     """)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
 
 
 def clear_tables(conn: sqlite3.Connection) -> None:
-    """Empties data tables (classes, methods, constants, api_fts) to reindex from scratch."""
-    conn.execute("DELETE FROM api_fts")
+    """Empties data tables (classes, methods, constants, api_fts, source_files, signatures, diff) to reindex from scratch."""
+    conn.execute("INSERT INTO api_fts(api_fts) VALUES ('delete-all')")
+    conn.execute("INSERT INTO source_grep(source_grep) VALUES ('delete-all')")
+    conn.execute("DELETE FROM source_files")
+    conn.execute("DELETE FROM member_signatures")
+    conn.execute("DELETE FROM api_diff")
     conn.execute("DELETE FROM methods")
     conn.execute("DELETE FROM constants")
     conn.execute("DELETE FROM classes")
@@ -129,12 +288,12 @@ def insert_constant(
     name: str,
     type_name: str,
     value: str,
-) -> None:
-    """Inserts a constant."""
-    conn.execute(
+) -> int:
+    """Inserts a constant and returns its id."""
+    return conn.execute(
         "INSERT INTO constants (class_id, name, type, value) VALUES (?, ?, ?, ?)",
         (class_id, name, type_name, value),
-    )
+    ).lastrowid
 
 
 def insert_method(
@@ -145,16 +304,43 @@ def insert_method(
     params: str,
     is_static: bool,
     annotation: str | None,
-) -> None:
-    """Inserts a method."""
-    conn.execute(
+) -> int:
+    """Inserts a method and returns its id."""
+    return conn.execute(
         "INSERT INTO methods (class_id, method, returns, params, is_static, annotation) VALUES (?, ?, ?, ?, ?, ?)",
         (class_id, method, returns, params, 1 if is_static else 0, annotation),
-    )
+    ).lastrowid
+
+
+def fts_rowid(method_id: int | None = None, constant_id: int | None = None) -> int:
+    """api_fts rowid of a method (its id) or a constant (CONSTANT_ROWID_BASE + its id)."""
+    if method_id is not None:
+        return method_id
+    return CONSTANT_ROWID_BASE + constant_id
+
+
+# Parts of an identifier: acronyms, capitalized or lowercase words and digit runs (getHTTPServer2 -> get HTTP Server 2)
+_RE_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def split_identifier(name: str | None) -> list[str]:
+    """Lowercase camelCase / snake_case parts of an identifier: getPlayerInventory -> [get, player, inventory]."""
+    return [part.lower() for part in _RE_SUBWORD.findall(name or "")]
+
+
+def fts_subwords(method_name: str | None = None, const_name: str | None = None) -> str:
+    """
+    Value of the api_fts subwords column: the parts of the member name of the row if it is compound,
+    so "inventory" matches getPlayerInventory. Single-word names are already whole tokens. The class
+    name is left out: every member row repeats it, so its parts would match all members of the class.
+    """
+    parts = split_identifier(method_name or const_name)
+    return " ".join(parts) if len(parts) > 1 else ""
 
 
 def insert_fts_row(
     conn: sqlite3.Connection,
+    rowid: int,
     package: str,
     class_name: str,
     kind: str,
@@ -164,15 +350,208 @@ def insert_fts_row(
     const_name: str | None = None,
     const_value: str | None = None,
 ) -> None:
-    """Inserts a row into the FTS5 table to make it searchable."""
+    """Indexes a method or constant (rowid from fts_rowid) in the FTS5 table to make it searchable."""
     conn.execute(
-        "INSERT INTO api_fts (package, class_name, kind, method_name, returns, params, const_name, const_value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-        (package, class_name, kind, method_name, returns, params, const_name, const_value),
+        "INSERT INTO api_fts (rowid, package, class_name, kind, method_name, returns, params, const_name, const_value, subwords)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            rowid, package, class_name, kind, method_name, returns, params, const_name, const_value,
+            fts_subwords(method_name, const_name),
+        ),
     )
 
 
+def insert_source_file(
+    conn: sqlite3.Connection,
+    file_path: str,
+    content_hash: str,
+    class_count: int,
+    member_count: int,
+) -> int:
+    """
+    Records the content hash of an indexed source and how much was extracted from it. Returns its id.
+    To index a file again, remove its rows first (delete_source_file): replacing the row would
+    leave its source_grep entry behind under the old id.
+    """
+    return conn.execute(
+        "INSERT INTO source_files (file_path, content_hash, class_count, member_count) VALUES (?, ?, ?, ?)",
+        (file_path, content_hash, class_count, member_count),
+    ).lastrowid
+
+
+def insert_source_grep(conn: sqlite3.Connection, source_file_id: int, text: str) -> None:
+    """Adds the text of an indexed source (id from insert_source_file) to the trigram index."""
+    conn.execute("INSERT INTO source_grep (rowid, text) VALUES (?, ?)", (source_file_id, text))
+
+
+def delete_source_file(conn: sqlite3.Connection, file_path: str) -> bool:
+    """
+    Removes what indexing one source added (classes defined in it, their methods and constants,
+    their api_fts rows and its source_files row) so it can be indexed again. The contentless
+    source_grep row can't be deleted without the old text: rebuild it (rebuild_source_grep) once
+    every source is in. Does not commit. Returns False if the file was not indexed.
+    """
+    class_ids = [r["id"] for r in conn.execute("SELECT id FROM classes WHERE file_path = ?", (file_path,))]
+    for class_id in class_ids:
+        c = conn.execute("SELECT package, class_name, kind FROM classes WHERE id = ?", (class_id,)).fetchone()
+        # Contentless FTS5: a delete must repeat the values the row was inserted with
+        for m in conn.execute("SELECT id, method, returns, params FROM methods WHERE class_id = ?", (class_id,)).fetchall():
+            conn.execute(
+                "INSERT INTO api_fts (api_fts, rowid, package, class_name, kind, method_name, returns, params, subwords)"
+                " VALUES ('delete', ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    fts_rowid(method_id=m["id"]), c["package"], c["class_name"], c["kind"],
+                    m["method"], m["returns"], m["params"], fts_subwords(m["method"]),
+                ),
+            )
+        for k in conn.execute("SELECT id, name, value FROM constants WHERE class_id = ?", (class_id,)).fetchall():
+            conn.execute(
+                "INSERT INTO api_fts (api_fts, rowid, package, class_name, kind, const_name, const_value, subwords)"
+                " VALUES ('delete', ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    fts_rowid(constant_id=k["id"]), c["package"], c["class_name"], c["kind"],
+                    k["name"], k["value"], fts_subwords(None, k["name"]),
+                ),
+            )
+        conn.execute("DELETE FROM methods WHERE class_id = ?", (class_id,))
+        conn.execute("DELETE FROM constants WHERE class_id = ?", (class_id,))
+        conn.execute("DELETE FROM classes WHERE id = ?", (class_id,))
+    return conn.execute("DELETE FROM source_files WHERE file_path = ?", (file_path,)).rowcount > 0
+
+
+def rebuild_source_grep(conn: sqlite3.Connection, read_text) -> None:
+    """Refills the trigram index from scratch with read_text(file_path) for every row of source_files."""
+    conn.execute("INSERT INTO source_grep(source_grep) VALUES ('delete-all')")
+    for r in conn.execute("SELECT id, file_path FROM source_files").fetchall():
+        try:
+            text = read_text(r["file_path"])
+        except OSError:
+            continue
+        insert_source_grep(conn, r["id"], text)
+
+
+def grep_candidates(conn: sqlite3.Connection, literals: list[str]) -> list[str] | None:
+    """
+    Paths (sorted) of the indexed sources that contain every trigram of literals, case-insensitive:
+    a superset of the files with a match. None if it cannot narrow: no literal of 3+ characters,
+    or an index without trigrams (older schema, or built from the JAR).
+    """
+    trigrams = list(dict.fromkeys(
+        lit.lower()[i : i + 3] for lit in literals for i in range(len(lit) - 2)
+    ))[:GREP_MAX_TRIGRAMS]
+    if not trigrams:
+        return None
+    has_index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'source_grep'"
+    ).fetchone() and conn.execute("SELECT 1 FROM source_files LIMIT 1").fetchone()
+    if not has_index:
+        return None
+    query = " AND ".join('"' + t.replace('"', '""') + '"' for t in trigrams)
+    rows = conn.execute(
+        "SELECT sf.file_path FROM source_grep JOIN source_files sf ON sf.id = source_grep.rowid"
+        " WHERE source_grep MATCH ? ORDER BY sf.file_path",
+        (query,),
+    ).fetchall()
+    return [r["file_path"] for r in rows]
+
+
+def get_source_file_hashes(conn: sqlite3.Connection) -> dict[str, str]:
+    """
+    {content_hash: file_path} of an index built with the current SCHEMA_VERSION.
+    Empty if the index is older (no source_files table or different user_version).
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        return {}
+    try:
+        rows = conn.execute("SELECT content_hash, file_path FROM source_files").fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {r["content_hash"]: r["file_path"] for r in rows}
+
+
+def get_file_extraction(conn: sqlite3.Connection, file_path: str) -> list[tuple] | None:
+    """
+    Extraction results of one indexed source, in extractor._extract_from_java format:
+    [(package, class_name, kind, methods, parent, interfaces, constants), ...].
+    None if the stored rows don't add up to what was extracted from the file (e.g. a class
+    also defined in another file took over its row), so the caller must extract again.
+    """
+    sf = conn.execute(
+        "SELECT class_count, member_count FROM source_files WHERE file_path = ?",
+        (file_path,),
+    ).fetchone()
+    if sf is None:
+        return None
+    class_rows = conn.execute(
+        "SELECT id, package, class_name, kind, parent, interfaces FROM classes WHERE file_path = ? ORDER BY id",
+        (file_path,),
+    ).fetchall()
+    results = []
+    members = 0
+    for c in class_rows:
+        methods = [
+            {
+                "method": m["method"],
+                "returns": m["returns"],
+                "params": m["params"],
+                "is_static": bool(m["is_static"]),
+                "annotation": m["annotation"],
+            }
+            for m in conn.execute(
+                "SELECT method, returns, params, is_static, annotation FROM methods WHERE class_id = ? ORDER BY id",
+                (c["id"],),
+            )
+        ]
+        constants = [
+            {"name": k["name"], "type": k["type"], "value": k["value"]}
+            for k in conn.execute(
+                "SELECT name, type, value FROM constants WHERE class_id = ? ORDER BY id",
+                (c["id"],),
+            )
+        ]
+        members += len(methods) + len(constants)
+        results.append((c["package"], c["class_name"], c["kind"], methods, c["parent"], c["interfaces"], constants))
+    if len(results) != sf["class_count"] or members != sf["member_count"]:
+        return None
+    return results
+
+
+def write_build_info(conn: sqlite3.Connection, info: dict) -> None:
+    """Replaces the build_info rows with info ({key: JSON-serializable value}) and commits."""
+    conn.execute(BUILD_INFO_DDL)
+    conn.execute("DELETE FROM build_info")
+    conn.executemany(
+        "INSERT INTO build_info (key, value) VALUES (?, ?)",
+        [(key, json.dumps(value, ensure_ascii=False)) for key, value in info.items()],
+    )
+    conn.commit()
+
+
+def read_build_info(conn: sqlite3.Connection) -> dict | None:
+    """{key: value} from build_info. None if the index has no build metadata (older or unfinished build)."""
+    try:
+        rows = conn.execute("SELECT key, value FROM build_info").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    if not rows:
+        return None
+    return {row["key"]: json.loads(row["value"]) for row in rows}
+
+
 def get_stats(conn: sqlite3.Connection) -> tuple[int, int, int]:
-    """Returns (number of classes, number of methods, number of constants)."""
+    """
+    Returns (number of classes, number of methods, number of constants).
+    Read from build_info when present (one indexed lookup); otherwise counted with COUNT(*).
+    """
+    try:
+        rows = conn.execute(
+            "SELECT key, value FROM build_info WHERE key IN ('classes', 'methods', 'constants')"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    if len(rows) == 3:
+        counts = {row["key"]: int(row["value"]) for row in rows}
+        return counts["classes"], counts["methods"], counts["constants"]
     classes = conn.execute("SELECT COUNT(*) AS n FROM classes").fetchone()["n"]
     methods = conn.execute("SELECT COUNT(*) AS n FROM methods").fetchone()["n"]
     constants = conn.execute("SELECT COUNT(*) AS n FROM constants").fetchone()["n"]
@@ -298,6 +677,148 @@ def list_classes(
     ]
 
 
+def query_api_diff(
+    conn: sqlite3.Connection,
+    package_prefix: str | None = None,
+    change: str | None = None,
+    member_kind: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> tuple[list[dict], int, dict[str, dict[str, int]]] | None:
+    """
+    Rows of the precomputed API diff, ordered by package, class and member.
+    Returns (rows, total matching the filters, summary {change: {member_kind: n}} of the whole diff),
+    or None if this DB has no diff table.
+    """
+    try:
+        summary_rows = conn.execute(
+            "SELECT change, member_kind, COUNT(*) AS n FROM api_diff GROUP BY change, member_kind"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    summary: dict[str, dict[str, int]] = {}
+    for r in summary_rows:
+        summary.setdefault(r["change"], {})[r["member_kind"]] = r["n"]
+    where, params = [], []
+    if package_prefix and package_prefix.strip():
+        p = package_prefix.strip()
+        pattern = p if p.endswith(".") else f"{p}."
+        where.append("(package = ? OR package LIKE ?)")
+        params.extend([p, f"{pattern}%"])
+    if change:
+        where.append("change = ?")
+        params.append(change)
+    if member_kind:
+        where.append("member_kind = ?")
+        params.append(member_kind)
+    where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+    total = conn.execute(f"SELECT COUNT(*) AS n FROM api_diff{where_sql}", params).fetchone()["n"]
+    limit = max(1, min(int(limit), 500))
+    offset = max(0, int(offset))
+    cur = conn.execute(
+        f"""SELECT change, member_kind, package, class_name, member, old_signature, new_signature
+            FROM api_diff{where_sql}
+            ORDER BY package, class_name, member_kind <> 'class', member, change
+            LIMIT ? OFFSET ?""",
+        (*params, limit, offset),
+    )
+    rows = [
+        {
+            "change": r["change"],
+            "member_kind": r["member_kind"],
+            "package": r["package"],
+            "class_name": r["class_name"],
+            "member": r["member"],
+            "old_signature": r["old_signature"],
+            "new_signature": r["new_signature"],
+        }
+        for r in cur.fetchall()
+    ]
+    return rows, total, summary
+
+
+# Contentless api_fts: rowids resolve to a method or a constant and its class by integer primary keys
+_SEARCH_SQL = f"""SELECT c.package, c.class_name, c.kind, m.method AS method_name, m.returns, m.params,
+    k.name AS const_name, k.value AS const_value, c.file_path
+    FROM api_fts
+    LEFT JOIN methods m ON m.id = api_fts.rowid
+    LEFT JOIN constants k ON k.id = api_fts.rowid - {CONSTANT_ROWID_BASE}
+    JOIN classes c ON c.id = COALESCE(m.class_id, k.class_id)
+    WHERE api_fts MATCH ?"""
+# Indexes built before schema 3: api_fts holds the text, joined to classes by name
+_LEGACY_SEARCH_SQL = """SELECT api_fts.package, api_fts.class_name, api_fts.kind, api_fts.method_name,
+    api_fts.returns, api_fts.params, api_fts.const_name, api_fts.const_value, c.file_path
+    FROM api_fts JOIN classes c ON c.package = api_fts.package AND c.class_name = api_fts.class_name
+    WHERE api_fts MATCH ?"""
+
+# NEAR group: NEAR(phrase phrase ..., distance)
+_RE_NEAR = re.compile(r"\bNEAR\s*\(([^)]*)\)")
+# Quoted phrase of two or more words
+_RE_PHRASE = re.compile(r'"([^"]*\s[^"]*)"')
+# Query pieces for subword expansion: quoted strings, NEAR groups (left as written) and barewords
+_RE_QUERY_PIECE = re.compile(r'"[^"]*"|\bNEAR\s*\([^)]*\)|(:\s*)?(\w+)(\*?)(?=(\s*:)?)')
+
+
+def get_fts_features(conn: sqlite3.Connection) -> dict:
+    """
+    {"profile", "contentless", "phrases", "values", "prefix_index", "subwords"} of the api_fts of this DB,
+    read from its CREATE statement, so it also holds for archived build DBs and older indexes.
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'api_fts'").fetchone()
+    ddl = " ".join((row[0] if row else "").lower().split())
+    phrases = "detail=column" not in ddl and "detail=none" not in ddl
+    prefix_index = "prefix=" in ddl
+    return {
+        "profile": "minimal" if not phrases else ("full" if prefix_index else "standard"),
+        "contentless": "content=''" in ddl,
+        "phrases": phrases,
+        "values": "const_value unindexed" not in ddl,
+        "prefix_index": prefix_index,
+        "subwords": "subwords," in ddl,
+    }
+
+
+def _near_as_and(term: str) -> str:
+    """Rewrites each NEAR(...) group as its phrases joined with AND, dropping the distance (for detail=column indexes)."""
+
+    def rewrite(m: re.Match) -> str:
+        inner = re.sub(r",\s*\d+\s*$", "", m.group(1))
+        phrases = re.findall(r'"[^"]*"|[^\s"]+', inner)
+        return "(" + " AND ".join(phrases) + ")" if phrases else ""
+
+    return _RE_NEAR.sub(rewrite, term)
+
+
+def _phrases_as_and(term: str) -> str:
+    """Rewrites each multi-word quoted phrase as its words joined with AND (for detail=column indexes)."""
+    return _RE_PHRASE.sub(lambda m: "(" + " AND ".join(f'"{w}"' for w in m.group(1).split()) + ")", term)
+
+
+def expand_subwords(term: str, phrases: bool = True) -> str:
+    """
+    Lets a camelCase word of the query also match as consecutive parts of longer member names:
+    PlayerInventory -> (PlayerInventory OR subwords : "player inventory"), which hits getPlayerInventory
+    and only looks at the member-name parts (see fts_subwords). phrases=False (detail=column indexes)
+    joins the parts with AND instead.
+    Quoted strings, NEAR groups, operators, column filters and snake_case words are left as they are.
+    """
+
+    def expand(m: re.Match) -> str:
+        filtered, word, star, column = m.group(1), m.group(2), m.group(3), m.group(4)
+        if word is None or filtered or column or "_" in word or word in ("AND", "OR", "NOT"):
+            return m.group(0)
+        parts = split_identifier(word)
+        if len(parts) < 2 or "".join(parts) != word.lower():
+            return m.group(0)
+        if phrases:
+            split = f'"{" ".join(parts)}"' + (" *" if star else "")
+        else:
+            split = "(" + " AND ".join(parts) + star + ")"
+        return f"({word}{star} OR subwords : {split})"
+
+    return _RE_QUERY_PIECE.sub(expand, term)
+
+
 def search_fts(
     conn: sqlite3.Connection,
     query_term: str,
@@ -305,16 +826,25 @@ def search_fts(
     package_prefix: str | None = None,
     kind: str | None = None,
     unique_classes: bool = False,
+    offset: int = 0,
+    subwords: bool = True,
 ) -> list[sqlite3.Row] | list[dict]:
-    """Searches in the FTS5 table api_fts. unique_classes: one entry per class with method_count."""
+    """
+    Searches in the FTS5 table api_fts. unique_classes: one entry per class with method_count.
+    offset skips that many results (rows, or classes with unique_classes) for pagination.
+    The query adapts to the FTS profile of the index (see get_fts_features); subwords=True also
+    matches camelCase words inside longer identifiers (see expand_subwords).
+    """
     if not query_term or not query_term.strip():
         return []
     term = query_term.strip()
-    fetch_limit = limit * 20 if unique_classes else limit
-    sql = """SELECT api_fts.package, api_fts.class_name, api_fts.kind, api_fts.method_name,
-             api_fts.returns, api_fts.params, api_fts.const_name, api_fts.const_value, c.file_path
-             FROM api_fts JOIN classes c ON c.package = api_fts.package AND c.class_name = api_fts.class_name
-             WHERE api_fts MATCH ?"""
+    fetch_limit = (limit + offset) * 20 if unique_classes else limit
+    features = get_fts_features(conn)
+    if not features["phrases"]:
+        term = _phrases_as_and(_near_as_and(term))
+    if subwords and features["subwords"]:
+        term = expand_subwords(term, features["phrases"])
+    sql = _SEARCH_SQL if features["contentless"] else _LEGACY_SEARCH_SQL
     params: list = [term]
     if package_prefix and package_prefix.strip():
         p = package_prefix.strip()
@@ -322,14 +852,15 @@ def search_fts(
         sql += " AND (c.package = ? OR c.package LIKE ?)"
         params.extend([p, f"{pattern}%"])
     if kind and kind.strip():
-        sql += " AND api_fts.kind = ?"
+        sql += " AND c.kind = ?"
         params.append(kind.strip().lower())
-    sql += " LIMIT ?"
-    params.append(fetch_limit)
+    sql += " LIMIT ? OFFSET ?"
+    params.extend([fetch_limit, 0 if unique_classes else offset])
     cur = conn.execute(sql, params)
     rows = cur.fetchall()
     if not unique_classes:
         return rows
+    counts = Counter((r["package"], r["class_name"]) for r in rows)
     seen: set[tuple[str, str]] = set()
     out: list[dict] = []
     for r in rows:
@@ -337,12 +868,14 @@ def search_fts(
         if key in seen:
             continue
         seen.add(key)
+        if len(seen) <= offset:
+            continue
         out.append({
             "package": r["package"],
             "class_name": r["class_name"],
             "kind": r["kind"],
             "file_path": r["file_path"],
-            "method_count": sum(1 for x in rows if (x["package"], x["class_name"]) == key),
+            "method_count": counts[key],
         })
         if len(out) >= limit:
             break
@@ -0,0 +1,119 @@
+# Post-build maintenance of an index DB: FTS segment merge, planner statistics and compaction.
+
+import sqlite3
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import config_impl
+from . import db
+
+# Query timed before and after optimizing (prefix search, the typical prism_search call)
+BENCH_QUERY = "get*"
+BENCH_LIMIT = 50
+BENCH_RUNS = 7
+
+
+def _query_ms(db_path: Path) -> float:
+    """Median latency (ms) of BENCH_QUERY on a fresh read-only connection, after one warm-up run."""
+    conn = db.get_readonly_connection(db_path)
+    if conn is None:
+        return 0.0
+    try:
+        db.search_fts(conn, BENCH_QUERY, limit=BENCH_LIMIT)
+        samples = []
+        for _ in range(BENCH_RUNS):
+            start = time.perf_counter()
+            db.search_fts(conn, BENCH_QUERY, limit=BENCH_LIMIT)
+            samples.append((time.perf_counter() - start) * 1000)
+        return round(statistics.median(samples), 3)
+    finally:
+        conn.close()
+
+
+def optimize_index(db_path: Path) -> dict | None:
+    """
+    Merges the FTS5 segments of api_fts and source_grep into one b-tree each, runs ANALYZE so
+    the planner has statistics, and VACUUMs the file (keeping its page size: larger pages made
+    the index bigger, not smaller). The run (size and query latency before/after) is recorded
+    in index_optimize. Returns that record, or None if the DB
+    does not exist. Readers keep working; pooled connections reopen on the new file generation.
+    """
+    if not db_path.is_file():
+        return None
+    start = time.perf_counter()
+    size_before = db_path.stat().st_size
+    query_ms_before = _query_ms(db_path)
+    with db.connection(db_path) as conn:
+        conn.execute("INSERT INTO api_fts(api_fts) VALUES ('optimize')")
+        # Older indexes have no trigram table
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'source_grep'").fetchone():
+            conn.execute("INSERT INTO source_grep(source_grep) VALUES ('optimize')")
+        conn.execute("ANALYZE")
+        conn.commit()
+        conn.execute("VACUUM")
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    size_after = db_path.stat().st_size
+    query_ms_after = _query_ms(db_path)
+    record = {
+        "optimized_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - start, 3),
+        "page_size": page_size,
+        "size_before": size_before,
+        "size_after": size_after,
+        "query_ms_before": query_ms_before,
+        "query_ms_after": query_ms_after,
+    }
+    with db.connection(db_path) as conn:
+        conn.execute(db.INDEX_OPTIMIZE_DDL)
+        conn.execute(
+            "INSERT INTO index_optimize (optimized_at, seconds, page_size, size_before, size_after, query_ms_before, query_ms_after)"
+            " VALUES (:optimized_at, :seconds, :page_size, :size_before, :size_after, :query_ms_before, :query_ms_after)",
+            record,
+        )
+        conn.commit()
+    return record
+
+
+def run_optimize(root: Path | None = None, version: str = "release") -> tuple[bool, str | dict]:
+    """
+    Optimizes prism_api_<version>.db. Returns (True, record) (see optimize_index);
+    (False, "no_db") if the version is not indexed; (False, "db_error") if SQLite fails.
+    """
+    root = root or config_impl.get_project_root()
+    try:
+        record = optimize_index(config_impl.get_db_path(root, version))
+    except sqlite3.Error:
+        import traceback
+        traceback.print_exc()
+        return (False, "db_error")
+    if record is None:
+        return (False, "no_db")
+    return (True, record)
+
+
+def summary_params(record: dict) -> dict:
+    """i18n parameters of cli.optimize.done for a record of optimize_index."""
+    return {
+        "size_before": record["size_before"] // 1024,
+        "size_after": record["size_after"] // 1024,
+        "ms_before": record["query_ms_before"],
+        "ms_after": record["query_ms_after"],
+        "seconds": record["seconds"],
+    }
+
+
+def optimize_after_index(db_path: Path, version: str) -> None:
+    """Last stage of every indexing path (ctx db, ctx init, --stream): optimize and report on stderr."""
+    import sys
+
+    from .. import i18n
+
+    try:
+        record = optimize_index(db_path)
+    except sqlite3.Error as e:
+        print(i18n.t("cli.optimize.failed", version=version, msg=str(e)), file=sys.stderr)
+        return
+    if record is not None:
+        print(i18n.t("cli.optimize.done", version=version, **summary_params(record)), file=sys.stderr)
@@ -0,0 +1,165 @@
+# Pooled read-only connections to the index DBs, reopened when a DB's generation changes.
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+from . import db
+
+# Idle connections kept per DB (extra ones are closed when returned)
+MAX_IDLE_CONNECTIONS = 4
+
+
+def file_generation(db_path: Path) -> tuple[int, int, int] | None:
+    """(inode, mtime_ns, size) of a DB file; changes whenever it is rebuilt or rewritten. None if missing."""
+    try:
+        st = db_path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class _Generation:
+    def __init__(self, signature: tuple[int, int, int] | None):
+        self.signature = signature
+        self.idle: list[sqlite3.Connection] = []
+
+
+class ReadConnectionPool:
+    """
+    Read-only connections per DB path, reused across calls. Every checkout compares the file's
+    generation (see file_generation) with the pooled one: on a change the idle connections are
+    closed, connections still in use finish their query on the old generation and are closed
+    when returned, and the listeners are called with the DB path (drop caches, warm the new index).
+    """
+
+    def __init__(self, max_idle: int = MAX_IDLE_CONNECTIONS):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._generations: dict[Path, _Generation] = {}
+        self._listeners: list[Callable[[Path], None]] = []
+
+    def add_listener(self, listener: Callable[[Path], None]) -> None:
+        """Calls listener(db_path) after a new generation of a pooled DB is detected."""
+        self._listeners.append(listener)
+
+    def _current(self, db_path: Path) -> _Generation:
+        """Pooled generation of db_path, switching to a new one if the file changed."""
+        signature = file_generation(db_path)
+        changed = False
+        with self._lock:
+            gen = self._generations.get(db_path)
+            if gen is None or gen.signature != signature:
+                stale = gen.idle if gen is not None else []
+                changed = gen is not None
+                gen = self._generations[db_path] = _Generation(signature)
+            else:
+                stale = []
+        for conn in stale:
+            conn.close()
+        if changed:
+            for listener in self._listeners:
+                listener(db_path)
+        return gen
+
+    def refresh(self, db_path: Path) -> bool:
+        """Checks db_path for a new generation now (e.g. from a watcher thread). True if it changed."""
+        with self._lock:
+            gen = self._generations.get(db_path)
+        if gen is None:
+            return False
+        return self._current(db_path) is not gen
+
+    def watched_paths(self) -> list[Path]:
+        with self._lock:
+            return list(self._generations)
+
+    @contextmanager
+    def connection(self, db_path: Path):
+        """Context manager yielding a read-only connection to db_path (returned to the pool on exit)."""
+        gen = self._current(db_path)
+        with self._lock:
+            conn = gen.idle.pop() if gen.idle else None
+        if conn is None:
+            conn = db.get_readonly_connection(db_path)
+            if conn is None:
+                raise sqlite3.OperationalError(f"unable to open database file: {db_path}")
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                keep = self._generations.get(db_path) is gen and len(gen.idle) < self.max_idle
+                if keep:
+                    gen.idle.append(conn)
+            if not keep:
+                conn.close()
+
+    def close(self) -> None:
+        """Closes every idle connection and forgets all generations."""
+        with self._lock:
+            generations, self._generations = self._generations, {}
+        for gen in generations.values():
+            for conn in gen.idle:
+                conn.close()
+
+
+class GenerationWatcher(threading.Thread):
+    """
+    Daemon thread that polls the pooled DBs every interval seconds, so a new index generation is
+    picked up (and warmed by the pool listeners) before the next request needs it.
+    """
+
+    def __init__(self, pool: ReadConnectionPool, paths: Callable[[], list[Path]], interval: float = 2.0):
+        super().__init__(name="prism-index-watcher", daemon=True)
+        self.pool = pool
+        self.paths = paths
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            for db_path in self.paths():
+                try:
+                    self.pool.refresh(db_path)
+                except Exception:
+                    continue  # A DB being rewritten is retried on the next tick
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def warm_index(db_path: Path) -> bool:
+    """
+    Reads the tables and FTS index of an index DB once so its pages are in the OS cache before
+    queries need them. Returns False if the DB cannot be read (e.g. while it is being rebuilt).
+    """
+    conn = db.get_readonly_connection(db_path)
+    if conn is None:
+        return False
+    try:
+        for table in ("classes", "methods", "constants", "api_fts_data", "member_signatures"):
+            conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+        return True
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+def reload_listener(db_path: Path) -> None:
+    """
+    Pool listener shared by the MCP server and the query daemon: the DB was rebuilt. Drops the
+    source caches, reports it on stderr and warms the new index in the background.
+    """
+    import sys
+
+    from .. import i18n
+    from . import source_store
+
+    source_store.clear_cache()
+    print(i18n.t("cli.mcp.index_reloaded", path=db_path), file=sys.stderr)
+    threading.Thread(target=warm_index, args=(db_path,), name="prism-index-warm", daemon=True).start()
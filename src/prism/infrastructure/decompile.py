@@ -95,36 +95,53 @@ def run_jadx(
         return (False, False)
 
 
-def run_decompile_only_for_version(root: Path | None, version: str) -> tuple[bool, str]:
+def resolve_jar(root: Path, version: str) -> Path | None:
+    """Server JAR configured for a version (release or prerelease), or None."""
+    if version == "release":
+        return config_impl.get_jar_path_release_from_config(root)
+    return config_impl.get_jar_path_prerelease_from_config(root)
+
+
+def resolve_jar_and_jadx(root: Path, version: str) -> tuple[tuple[Path, Path] | None, str]:
     """
-    Executes JADX only for a version (release or prerelease). Does not execute prune.
-    Writes to decompiled_raw/<version>. Returns (True, "") or (False, "no_jar"|"no_jadx"|"jadx_failed").
+    Resolve the server JAR for a version and the JADX executable.
+    Returns ((jar_path, jadx_bin), "") or (None, "no_jar"|"no_jadx").
     """
-    root = root or config_impl.get_project_root()
-    if version == "release":
-        jar_path = config_impl.get_jar_path_release_from_config(root)
-    else:
-        jar_path = config_impl.get_jar_path_prerelease_from_config(root)
+    jar_path = resolve_jar(root, version)
     if jar_path is None:
-        return (False, "no_jar")
-
+        return (None, "no_jar")
     jadx_path = config_impl.get_jadx_path_from_config(root)
     if jadx_path is None:
         jadx_path = detection.resolve_jadx_path(root)
     if jadx_path is None:
-        return (False, "no_jadx")
-    jadx_bin = Path(jadx_path)
+        return (None, "no_jadx")
+    return ((jar_path, Path(jadx_path)), "")
 
-    raw_dir = config_impl.get_decompiled_raw_dir(root, version)
-    raw_dir.mkdir(parents=True, exist_ok=True)
 
+def get_decompile_log_path(root: Path, version: str) -> Path:
+    """New timestamped log file path under logs/ for a JADX run (creates logs/)."""
     logs_dir = config_impl.get_logs_dir(root)
     logs_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_path = logs_dir / f"decompile_{version}_{timestamp}.log"
+    return logs_dir / f"decompile_{version}_{timestamp}.log"
+
+
+def run_decompile_only_for_version(root: Path | None, version: str) -> tuple[bool, str]:
+    """
+    Executes JADX only for a version (release or prerelease). Does not execute prune.
+    Writes to decompiled_raw/<version>. Returns (True, "") or (False, "no_jar"|"no_jadx"|"jadx_failed").
+    """
+    root = root or config_impl.get_project_root()
+    resolved, err = resolve_jar_and_jadx(root, version)
+    if resolved is None:
+        return (False, err)
+    jar_path, jadx_bin = resolved
+
+    raw_dir = config_impl.get_decompiled_raw_dir(root, version)
+    raw_dir.mkdir(parents=True, exist_ok=True)
 
     from .. import i18n
-    ok, had_errors = run_jadx(jar_path, raw_dir, jadx_bin, log_path)
+    ok, had_errors = run_jadx(jar_path, raw_dir, jadx_bin, get_decompile_log_path(root, version))
     if not ok:
         return (False, "jadx_failed")
     if had_errors:
@@ -166,32 +183,18 @@ def run_decompile_and_prune_for_version(root: Path | None, version: str) -> tupl
     Returns (True, "") or (False, "no_jar"|"no_jadx"|"jadx_failed").
     """
     root = root or config_impl.get_project_root()
-    if version == "release":
-        jar_path = config_impl.get_jar_path_release_from_config(root)
-    else:
-        jar_path = config_impl.get_jar_path_prerelease_from_config(root)
-    if jar_path is None:
-        return (False, "no_jar")
-
-    jadx_path = config_impl.get_jadx_path_from_config(root)
-    if jadx_path is None:
-        jadx_path = detection.resolve_jadx_path(root)
-    if jadx_path is None:
-        return (False, "no_jadx")
-    jadx_bin = Path(jadx_path)
+    resolved, err = resolve_jar_and_jadx(root, version)
+    if resolved is None:
+        return (False, err)
+    jar_path, jadx_bin = resolved
 
     raw_dir = config_impl.get_decompiled_raw_dir(root, version)
     decompiled_dir = config_impl.get_decompiled_dir(root, version)
     raw_dir.mkdir(parents=True, exist_ok=True)
     decompiled_dir.mkdir(parents=True, exist_ok=True)
 
-    logs_dir = config_impl.get_logs_dir(root)
-    logs_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_path = logs_dir / f"decompile_{version}_{timestamp}.log"
-
     from . import i18n
-    ok, had_errors = run_jadx(jar_path, raw_dir, jadx_bin, log_path)
+    ok, had_errors = run_jadx(jar_path, raw_dir, jadx_bin, get_decompile_log_path(root, version))
     if not ok:
         return (False, "jadx_failed")
     if had_errors:
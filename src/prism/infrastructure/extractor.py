@@ -1,16 +1,28 @@
 # API extractor from decompiled Java code (regex). Feeds SQLite + FTS5.
 
 import re
+import sqlite3
+import struct
 import sys
+import zipfile
 from pathlib import Path
 
 from tqdm import tqdm
 
+from ..domain.constants import VALID_SERVER_VERSIONS
+from . import api_diff
+from . import build_info
+from . import classfile
 from . import config_impl
+from . import content_store
 from . import db
+from . import db_optimize
+from . import source_store
 
 # Files processed between each commit to reduce transaction size and memory
 BATCH_COMMIT_FILES = 1000
+# Recorded in build_info; bump when the regex or classfile extraction output changes
+EXTRACTOR_VERSION = 1
 
 # Same regex as Server/Scripts/generate_api_context.py (but improved)
 RE_PACKAGE = re.compile(r"package\s+([\w\.]+);")
@@ -106,89 +118,277 @@ def _extract_from_java(content: str, file_path: str) -> list[tuple[str, str, str
     return final_results
 
 
-def run_index(root: Path | None = None, version: str = "release") -> tuple[bool, str | tuple[int, int, int]]:
+class ExtractionReuse:
     """
-    Walk workspace/decompiled/<version>, extract classes, methods and constants with regex,
-    and fill prism_api_<version>.db. Returns (True, (num_classes, num_methods, num_constants));
+    Extraction results already stored in another version's index, looked up by content hash.
+    Release and prerelease share most sources, so identical files skip the regex pass.
+    """
+
+    def __init__(self, db_path: Path):
+        self.hashes: dict[str, str] = {}
+        self.reused = 0
+        self._conn = db.get_readonly_connection(db_path)
+        if self._conn is not None:
+            try:
+                self.hashes = db.get_source_file_hashes(self._conn)
+            except sqlite3.Error:
+                self.close()
+
+    def lookup(self, digest: str) -> list[tuple] | None:
+        file_path = self.hashes.get(digest)
+        if file_path is None or self._conn is None:
+            return None
+        try:
+            results = db.get_file_extraction(self._conn, file_path)
+        except sqlite3.Error:
+            return None
+        if results is not None:
+            self.reused += 1
+        return results
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self.hashes = {}
+
+
+def open_extraction_reuse(root: Path | None, version: str) -> tuple[str, ExtractionReuse] | None:
+    """(other_version, ExtractionReuse) over the first other version with a current index, or None."""
+    own_db = config_impl.get_db_path(root, version).resolve()
+    for other in VALID_SERVER_VERSIONS:
+        if other == version:
+            continue
+        other_db = config_impl.get_db_path(root, other)
+        if other_db.resolve() == own_db:
+            continue
+        reuse = ExtractionReuse(other_db)
+        if reuse.hashes:
+            return (other, reuse)
+        reuse.close()
+    return None
+
+
+def index_java_file(conn, jpath: Path, decompiled_dir: Path, reuse: ExtractionReuse | None = None) -> bool:
+    """
+    Read one decompiled .java file, extract its API and insert classes, methods, constants
+    and FTS rows. file_path is stored relative to decompiled_dir. Returns False if unreadable.
+    Does not commit; callers batch commits (see BATCH_COMMIT_FILES).
+    """
+    try:
+        data = jpath.read_bytes()
+    except OSError:
+        return False
+    # Relative path to decompiled directory for storage
+    try:
+        rel_path = jpath.relative_to(decompiled_dir)
+    except ValueError:
+        rel_path = jpath
+    index_java_source(conn, data, str(rel_path).replace("\\", "/"), reuse)
+    return True
+
+
+def index_java_source(conn, data: bytes, file_path_str: str, reuse: ExtractionReuse | None = None) -> None:
+    """
+    Extract the API of one Java source (raw bytes, already read) and insert it; file_path_str is the
+    stored path. If reuse knows the content hash, its stored results are inserted instead of extracting.
+    The text is also added to the trigram index used by prism_grep.
+    """
+    digest = content_store.content_hash(data)
+    text = data.decode("utf-8", errors="replace")
+    results = reuse.lookup(digest) if reuse is not None else None
+    if results is None:
+        results = _extract_from_java(text, file_path_str)
+    source_file_id = db.insert_source_file(
+        conn,
+        file_path_str,
+        digest,
+        len(results),
+        sum(len(r[3]) + len(r[6]) for r in results),
+    )
+    db.insert_source_grep(conn, source_file_id, text)
+    insert_extraction(conn, results, file_path_str)
+
+
+def insert_extraction(conn, results: list[tuple], file_path_str: str) -> None:
+    """Insert extraction results (see _extract_from_java) into classes, methods, constants and api_fts."""
+    for pkg, class_name, kind, methods, parent, interfaces, constants in results:
+        class_id = db.insert_class(conn, pkg, class_name, kind, file_path_str, parent, interfaces)
+
+        # Insert methods
+        for m in methods:
+            method_id = db.insert_method(
+                conn,
+                class_id,
+                m["method"],
+                m["returns"],
+                m["params"],
+                m["is_static"],
+                m["annotation"],
+            )
+            db.insert_fts_row(
+                conn,
+                db.fts_rowid(method_id=method_id),
+                pkg,
+                class_name,
+                kind,
+                method_name=m["method"],
+                returns=m["returns"],
+                params=m["params"],
+            )
+
+        # Insert constants
+        for c in constants:
+            constant_id = db.insert_constant(
+                conn,
+                class_id,
+                c["name"],
+                c["type"],
+                c["value"],
+            )
+            db.insert_fts_row(
+                conn,
+                db.fts_rowid(constant_id=constant_id),
+                pkg,
+                class_name,
+                kind,
+                const_name=c["name"],
+                const_value=c["value"],
+            )
+
+
+def run_index(
+    root: Path | None = None, version: str = "release", fts_profile: str | None = None
+) -> tuple[bool, str | tuple[int, int, int]]:
+    """
+    Walk the sources of <version> (decompiled/<version> or its packed archive, see source_store),
+    extract classes, methods and constants with regex, and fill prism_api_<version>.db.
+    Files whose content hash is already in the other version's index reuse its extraction results.
+    Member signatures are stored and the release/prerelease API diff is refreshed (see api_diff).
+    fts_profile: FTS layout (see db.FTS_PROFILES); None uses fts_profile from .prism.json.
+    Ends by recording build_info (counts, time per phase, fingerprint of the configured JAR).
+    Returns (True, (num_classes, num_methods, num_constants));
     (False, "no_decompiled") if no code; (False, "db_error") if DB fails.
     """
     root = root or config_impl.get_project_root()
-    decompiled_dir = config_impl.get_decompiled_dir(root, version)
-    if not decompiled_dir.is_dir():
+    store = source_store.open_version_store(root, version)
+    if not store.exists():
         return (False, "no_decompiled")
-    java_files = list(decompiled_dir.rglob("*.java"))
+    java_files = list(store.iter_files(".java"))
     if not java_files:
         return (False, "no_decompiled")
 
     db_path = config_impl.get_db_path(root, version)
+    fts_profile = fts_profile or config_impl.get_fts_profile_from_config(root)
+    opened = open_extraction_reuse(root, version)
+    other_version, reuse = opened if opened else (None, None)
+    timer = build_info.PhaseTimer()
+    build_path = db.begin_build(db_path)
     try:
-        with db.connection(db_path) as conn:
-            db.init_schema(conn)
+        with db.connection(build_path) as conn:
+            db.init_schema(conn, fts_profile)
             db.clear_tables(conn)
             files_processed = 0
-            for jpath in tqdm(java_files, unit=" files", desc="Indexing", file=sys.stderr, colour="green"):
-                try:
-                    content = jpath.read_text(encoding="utf-8", errors="replace")
-                except OSError:
-                    continue
-                # Relative path to decompiled directory for storage
-                try:
-                    rel_path = jpath.relative_to(decompiled_dir)
-                except ValueError:
-                    rel_path = jpath
-                file_path_str = str(rel_path).replace("\\", "/")
-                
-                # Extract and insert
-                results = _extract_from_java(content, file_path_str)
-                for pkg, class_name, kind, methods, parent, interfaces, constants in results:
-                    class_id = db.insert_class(conn, pkg, class_name, kind, file_path_str, parent, interfaces)
-                    
-                    # Insert methods
-                    for m in methods:
-                        db.insert_method(
-                            conn,
-                            class_id,
-                            m["method"],
-                            m["returns"],
-                            m["params"],
-                            m["is_static"],
-                            m["annotation"],
-                        )
-                        db.insert_fts_row(
-                            conn,
-                            pkg,
-                            class_name,
-                            kind,
-                            method_name=m["method"],
-                            returns=m["returns"],
-                            params=m["params"],
-                        )
-                    
-                    # Insert constants
-                    for c in constants:
-                        db.insert_constant(
-                            conn,
-                            class_id,
-                            c["name"],
-                            c["type"],
-                            c["value"],
-                        )
-                        db.insert_fts_row(
-                            conn,
-                            pkg,
-                            class_name,
-                            kind,
-                            const_name=c["name"],
-                            const_value=c["value"],
-                        )
-                
-                files_processed += 1
-                if files_processed % BATCH_COMMIT_FILES == 0:
-                    conn.commit()
-            conn.commit()
+            with timer.phase("extract"):
+                for rel_path in tqdm(java_files, unit=" files", desc="Indexing", file=sys.stderr, colour="green"):
+                    try:
+                        data = store.read_bytes(rel_path)
+                    except OSError:
+                        continue
+                    index_java_source(conn, data, rel_path, reuse)
+                    files_processed += 1
+                    if files_processed % BATCH_COMMIT_FILES == 0:
+                        conn.commit()
+            with timer.phase("signatures"):
+                api_diff.build_member_signatures(conn)
+                conn.commit()
             stats = db.get_stats(conn)
+        with timer.phase("diff"):
+            api_diff.refresh_api_diff(root, version, build_path)
+        if reuse is not None and reuse.reused:
+            from .. import i18n
+            print(i18n.t("cli.index.reused", reused=reuse.reused, total=files_processed, other=other_version), file=sys.stderr)
+        with timer.phase("optimize"):
+            db_optimize.optimize_after_index(build_path, version)
+        from . import decompile
+
+        build_info.record_build(
+            build_path, stats, timer.phases, "sources", EXTRACTOR_VERSION, fts_profile, decompile.resolve_jar(root, version)
+        )
+        db.commit_build(build_path, db_path)
         return (True, stats)
     except Exception as e:
         import traceback
         traceback.print_exc() # Log to stderr for the agent/user to see
+        db.abort_build(build_path)
+        return (False, "db_error")
+    finally:
+        if reuse is not None:
+            reuse.close()
+
+
+def run_index_from_jar(
+    root: Path | None = None, version: str = "release", fts_profile: str | None = None
+) -> tuple[bool, str | tuple[int, int, int]]:
+    """
+    Fill prism_api_<version>.db straight from the .class files of the server JAR (core packages
+    only), without JADX: signatures, modifiers, supertypes, annotations and constant values come
+    from the bytecode (see classfile). file_path points to where the decompiler writes each class,
+    so read_source works once ctx decompile/prune has run. No per-file content hashes are stored,
+    so a JAR-built index is not used for cross-version extraction reuse. fts_profile: as in run_index.
+    Returns (True, (num_classes, num_methods, num_constants));
+    (False, "no_jar") if the JAR is not configured; (False, "no_classes") if it has no core classes;
+    (False, "db_error") if DB fails.
+    """
+    from . import decompile
+
+    root = root or config_impl.get_project_root()
+    jar_path = decompile.resolve_jar(root, version)
+    if jar_path is None:
+        return (False, "no_jar")
+    try:
+        total = classfile.count_jar_classes(jar_path, config_impl.CORE_PACKAGE_PATHS)
+    except (OSError, zipfile.BadZipFile):
+        return (False, "no_jar")
+    if total == 0:
+        return (False, "no_classes")
+
+    db_path = config_impl.get_db_path(root, version)
+    fts_profile = fts_profile or config_impl.get_fts_profile_from_config(root)
+    timer = build_info.PhaseTimer()
+    build_path = db.begin_build(db_path)
+    try:
+        with db.connection(build_path) as conn:
+            db.init_schema(conn, fts_profile)
+            db.clear_tables(conn)
+            classes_processed = 0
+            entries = classfile.iter_jar_classes(jar_path, config_impl.CORE_PACKAGE_PATHS)
+            with timer.phase("extract"):
+                for _name, data in tqdm(entries, total=total, unit=" classes", desc="Indexing", file=sys.stderr, colour="green"):
+                    try:
+                        entry = classfile.to_api_entry(classfile.parse_class(data))
+                    except (ValueError, IndexError, struct.error):
+                        continue  # Malformed or unsupported classfile: skip it like an unreadable source
+                    if entry is None:
+                        continue
+                    file_path_str, result = entry
+                    insert_extraction(conn, [result], file_path_str)
+                    classes_processed += 1
+                    if classes_processed % BATCH_COMMIT_FILES == 0:
+                        conn.commit()
+            with timer.phase("signatures"):
+                api_diff.build_member_signatures(conn)
+                conn.commit()
+            stats = db.get_stats(conn)
+        with timer.phase("diff"):
+            api_diff.refresh_api_diff(root, version, build_path)
+        with timer.phase("optimize"):
+            db_optimize.optimize_after_index(build_path, version)
+        build_info.record_build(build_path, stats, timer.phases, "jar", EXTRACTOR_VERSION, fts_profile, jar_path)
+        db.commit_build(build_path, db_path)
+        return (True, stats)
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        db.abort_build(build_path)
         return (False, "db_error")
@@ -3,10 +3,14 @@
 from pathlib import Path
 
 from . import config_impl
+from . import source_store
 
 
 class FileConfigProvider:
-    """Implements ConfigProvider using the existing config module."""
+    """
+    Implements ConfigProvider using the existing config module. Paths come from the cached
+    config snapshot (config_impl.get_config_snapshot), so each call costs one stat of .prism.json.
+    """
 
     def get_project_root(self) -> Path:
         return config_impl.get_project_root()
@@ -17,5 +21,11 @@ class FileConfigProvider:
     def get_decompiled_dir(self, root: Path | None, version: str) -> Path:
         return config_impl.get_decompiled_dir(root, version)
 
+    def get_source_store(self, root: Path | None, version: str):
+        return source_store.open_version_store(root, version)
+
     def load_config(self, root: Path | None) -> dict:
         return config_impl.load_config(root)
+
+    def get_active_server(self, root: Path | None) -> str | None:
+        return config_impl.get_active_server(root)
@@ -0,0 +1,166 @@
+# In-process metrics of MCP tool calls: counts, errors, latency, response bytes and rows.
+
+import math
+import threading
+import time
+from collections import deque
+
+# Upper bounds (seconds) of the Prometheus latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Most recent latencies kept per tool for p50/p95/p99
+LATENCY_SAMPLES = 2048
+
+_rows = threading.local()
+
+
+def count_rows(n: int) -> None:
+    """Adds n to the rows produced by the tool call running in this thread (see MetricsRegistry.timed)."""
+    _rows.value = getattr(_rows, "value", 0) + n
+
+
+def _take_rows() -> int:
+    n = getattr(_rows, "value", 0)
+    _rows.value = 0
+    return n
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an ascending list; 0.0 if empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(q / 100.0 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class _ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.bytes_total = 0
+        self.rows_total = 0
+        self.coalesced = 0
+
+
+class MetricsRegistry:
+    """Thread-safe per-tool counters; snapshot() for JSON, render_prometheus() for scraping."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolStats] = {}
+        self.started = time.time()
+
+    def record(self, tool: str, seconds: float, ok: bool, response_bytes: int = 0, rows: int = 0) -> None:
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = _ToolStats()
+            stats.calls += 1
+            if not ok:
+                stats.errors += 1
+            stats.seconds_total += seconds
+            stats.seconds_max = max(stats.seconds_max, seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.buckets[i] += 1
+                    break
+            stats.samples.append(seconds)
+            stats.bytes_total += response_bytes
+            stats.rows_total += rows
+
+    def record_coalesced(self, tool: str) -> None:
+        """Counts a call answered by an identical call already in flight (not timed separately)."""
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = _ToolStats()
+            stats.coalesced += 1
+
+    def timed(self, tool: str, fn, *args, **kwargs) -> str:
+        """
+        Calls fn (a _run_* function returning JSON) and records it. A response whose top-level
+        key is "error" or an exception counts as an error; rows come from count_rows calls made by fn.
+        """
+        _take_rows()
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record(tool, time.perf_counter() - start, False, 0, _take_rows())
+            raise
+        ok = not result.startswith('{"error"')
+        self.record(tool, time.perf_counter() - start, ok, len(result.encode("utf-8")), _take_rows())
+        return result
+
+    def snapshot(self) -> dict:
+        """{"uptime_seconds", "tools": {tool: {"calls", "errors", "latency_ms": {...}, "bytes_total", ...}}}."""
+        with self._lock:
+            tools = {}
+            for name, s in sorted(self._tools.items()):
+                samples = sorted(s.samples)
+                tools[name] = {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "latency_ms": {
+                        "p50": round(percentile(samples, 50) * 1000, 3),
+                        "p95": round(percentile(samples, 95) * 1000, 3),
+                        "p99": round(percentile(samples, 99) * 1000, 3),
+                        "mean": round(s.seconds_total / s.calls * 1000, 3) if s.calls else 0.0,
+                        "max": round(s.seconds_max * 1000, 3),
+                    },
+                    "bytes_total": s.bytes_total,
+                    "bytes_avg": s.bytes_total // s.calls if s.calls else 0,
+                    "rows_total": s.rows_total,
+                    "coalesced": s.coalesced,
+                }
+        return {"uptime_seconds": round(time.time() - self.started, 1), "tools": tools}
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            "# HELP prism_tool_calls_total MCP tool calls.",
+            "# TYPE prism_tool_calls_total counter",
+        ]
+        with self._lock:
+            items = sorted(self._tools.items())
+            for name, s in items:
+                lines.append(f'prism_tool_calls_total{{tool="{name}"}} {s.calls}')
+            lines += ["# HELP prism_tool_errors_total MCP tool calls that returned an error.",
+                      "# TYPE prism_tool_errors_total counter"]
+            for name, s in items:
+                lines.append(f'prism_tool_errors_total{{tool="{name}"}} {s.errors}')
+            lines += ["# HELP prism_tool_latency_seconds MCP tool call latency.",
+                      "# TYPE prism_tool_latency_seconds histogram"]
+            for name, s in items:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, s.buckets):
+                    cumulative += count
+                    lines.append(f'prism_tool_latency_seconds_bucket{{tool="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'prism_tool_latency_seconds_bucket{{tool="{name}",le="+Inf"}} {s.calls}')
+                lines.append(f'prism_tool_latency_seconds_sum{{tool="{name}"}} {s.seconds_total:.6f}')
+                lines.append(f'prism_tool_latency_seconds_count{{tool="{name}"}} {s.calls}')
+            lines += ["# HELP prism_tool_latency_quantile_seconds Latency quantiles over recent calls.",
+                      "# TYPE prism_tool_latency_quantile_seconds gauge"]
+            for name, s in items:
+                samples = sorted(s.samples)
+                for q in (50, 95, 99):
+                    lines.append(f'prism_tool_latency_quantile_seconds{{tool="{name}",quantile="0.{q}"}} {percentile(samples, q):.6f}')
+            lines += ["# HELP prism_tool_response_bytes_total Bytes of JSON returned by MCP tools.",
+                      "# TYPE prism_tool_response_bytes_total counter"]
+            for name, s in items:
+                lines.append(f'prism_tool_response_bytes_total{{tool="{name}"}} {s.bytes_total}')
+            lines += ["# HELP prism_tool_rows_total Result rows produced by MCP tools.",
+                      "# TYPE prism_tool_rows_total counter"]
+            for name, s in items:
+                lines.append(f'prism_tool_rows_total{{tool="{name}"}} {s.rows_total}')
+            lines += ["# HELP prism_tool_coalesced_total Calls that shared the result of an identical in-flight call.",
+                      "# TYPE prism_tool_coalesced_total counter"]
+            for name, s in items:
+                lines.append(f'prism_tool_coalesced_total{{tool="{name}"}} {s.coalesced}')
+        lines += ["# HELP prism_uptime_seconds Seconds since the MCP server started.",
+                  "# TYPE prism_uptime_seconds gauge",
+                  f"prism_uptime_seconds {time.time() - self.started:.1f}"]
+        return "\n".join(lines) + "\n"
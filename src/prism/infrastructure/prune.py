@@ -1,7 +1,12 @@
 # Prune: copy only com.hypixel.hytale from decompiled_raw to decompiled.
 
+import errno
+import json
+import os
 import sys
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from tqdm import tqdm
@@ -14,20 +19,258 @@ PRUNE_SOURCE_CANDIDATES = (
     "",        # Or directly in the -d root
 )
 
+# How each core file reaches decompiled/<version>. "auto" tries reflink, then hardlink, then copy
+# (never move, so decompiled_raw stays usable); "move" consumes the raw output.
+PRUNE_STRATEGIES = ("auto", "reflink", "hardlink", "move", "copy")
+DEFAULT_PRUNE_STRATEGY = "auto"
 
-def prune_to_core(raw_dir: Path, dest_dir: Path) -> tuple[bool, dict | None]:
+# Sync manifest next to decompiled/<version>: {"files": {rel_path: "synced"|"moved"}} of what prune placed
+SYNC_MANIFEST_SUFFIX = ".prune.json"
+
+# Upper bound for --jobs: more threads than this only adds seek contention on one disk
+MAX_PRUNE_JOBS = 32
+
+# Linux ioctl FICLONE: share the source extents (btrfs, XFS with reflink=1, overlay on those)
+_FICLONE = 0x40049409
+
+# errno values meaning "this filesystem/pair of paths can't do that": fall back, don't fail
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+    errno.EMLINK,
+}
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    """Clone src into dst sharing extents (copy-on-write). Raises OSError if unsupported."""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        raise OSError(errno.EOPNOTSUPP, "reflink not supported on this platform")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink(missing_ok=True)
+            raise
+    shutil.copystat(src, dst)
+
+
+class FileTransfer:
+    """
+    Places one file at its pruned location using a strategy from PRUNE_STRATEGIES.
+    Remembers when reflink/hardlink are unsupported so "auto" stops retrying them per file.
+    Calling it returns the method actually used: "reflink" | "hardlink" | "move" | "copy".
+    """
+
+    def __init__(self, strategy: str = DEFAULT_PRUNE_STRATEGY):
+        if strategy not in PRUNE_STRATEGIES:
+            raise ValueError(f"unknown prune strategy: {strategy}")
+        self.strategy = strategy
+        self._reflink_ok = strategy in ("auto", "reflink")
+        self._hardlink_ok = strategy in ("auto", "hardlink")
+
+    def __call__(self, src: Path, dst: Path) -> str:
+        # Never write through an existing dst: it may be a hardlink to a raw file
+        try:
+            dst.unlink()
+        except FileNotFoundError:
+            pass
+        if self.strategy == "move":
+            try:
+                os.replace(src, dst)
+                return "move"
+            except OSError:
+                shutil.move(str(src), str(dst))
+                return "copy"
+        if self._reflink_ok:
+            try:
+                _reflink(src, dst)
+                return "reflink"
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self._reflink_ok = False
+        if self._hardlink_ok:
+            try:
+                os.link(src, dst)
+                return "hardlink"
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                self._hardlink_ok = False
+        shutil.copy2(src, dst)
+        return "copy"
+
+
+def transfer_file(src: Path, dst: Path, strategy: str = DEFAULT_PRUNE_STRATEGY) -> str:
+    """One-off FileTransfer: places src at dst (creating parents). Returns the method used."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    return FileTransfer(strategy)(src, dst)
+
+
+def _is_unchanged(src_stat: os.stat_result, dst: Path) -> bool:
+    """True if dst exists with the same size and mtime as the source (or is the same inode)."""
+    try:
+        dst_stat = dst.stat()
+    except OSError:
+        return False
+    if (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+        return True
+    return dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+
+def sync_manifest_path(dest_dir: Path) -> Path:
+    """Sync manifest of a pruned tree (decompiled/<version>.prune.json, next to the tree)."""
+    return dest_dir.with_name(dest_dir.name + SYNC_MANIFEST_SUFFIX)
+
+
+def load_sync_manifest(dest_dir: Path) -> dict[str, str]:
+    """{rel_path: "synced"|"moved"} of the files prune placed in dest_dir. Empty if none or unreadable."""
+    try:
+        with open(sync_manifest_path(dest_dir), encoding="utf-8") as f:
+            files = json.load(f).get("files")
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return files if isinstance(files, dict) else {}
+
+
+def save_sync_manifest(dest_dir: Path, files: dict[str, str]) -> None:
+    """Writes the sync manifest atomically (temp file + rename)."""
+    path = sync_manifest_path(dest_dir)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"files": files}, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def moved_only_copies(raw_dir: Path, dest_dir: Path) -> list[str]:
+    """
+    Files of dest_dir a move prune took out of raw_dir that raw does not have again: dest_dir holds
+    their only copy, so rebuilding it from raw (incremental=False) would lose them.
+    """
+    out = []
+    for rel, state in load_sync_manifest(dest_dir).items():
+        if state != "moved" or not (dest_dir / rel).is_file():
+            continue
+        if not any(((raw_dir / sub / rel) if sub else (raw_dir / rel)).is_file() for sub in PRUNE_SOURCE_CANDIDATES):
+            out.append(rel)
+    return sorted(out)
+
+
+def _remove_stale(
+    dest_dir: Path,
+    core_rel: str,
+    previous: dict[str, str],
+    current: dict[str, str],
+    raw_has_files: bool,
+) -> int:
+    """
+    Deletes files of core_rel that the previous sync manifest lists as synced but raw no longer has,
+    then their empty directories. Moved entries are carried over into current instead (raw lost them
+    because prune took them), as is everything when raw holds no files for core_rel. Files prune never
+    placed are not touched. Returns files removed.
+    """
+    removed = 0
+    target = dest_dir / core_rel
+    prefix = core_rel + "/"
+    for rel_path, how in previous.items():
+        if not rel_path.startswith(prefix) or rel_path in current:
+            continue
+        if how == "moved" or not raw_has_files:
+            current[rel_path] = how
+            continue
+        path = dest_dir / rel_path
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+        parent = path.parent
+        while parent != target and parent.is_relative_to(target) and not any(parent.iterdir()):
+            parent.rmdir()
+            parent = parent.parent
+    return removed
+
+
+def _transfer_batch(transfer: FileTransfer, files: list[tuple[Path, Path]]) -> dict[str, int]:
+    """Transfers one directory's files in order (worker unit for parallel prune). Returns {method: n}."""
+    counts: dict[str, int] = {}
+    for src, tgt in files:
+        method = transfer(src, tgt)
+        counts[method] = counts.get(method, 0) + 1
+    return counts
+
+
+def _run_parallel(
+    transfer: FileTransfer,
+    batches: list[tuple[Path, list[tuple[Path, Path]]]],
+    jobs: int,
+    pbar,
+) -> dict[str, int]:
+    """
+    Creates every target directory up front, then transfers with a bounded thread pool.
+    Each task is a whole directory (sorted by path) so reads and writes stay local.
+    """
+    batches.sort(key=lambda b: b[0])
+    for tgt_dir, _files in batches:
+        tgt_dir.mkdir(parents=True, exist_ok=True)
+    transferred: dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="prism-prune") as pool:
+        futures = {pool.submit(_transfer_batch, transfer, files): len(files) for _d, files in batches}
+        for fut in as_completed(futures):
+            for method, n in fut.result().items():
+                transferred[method] = transferred.get(method, 0) + n
+            pbar.update(futures[fut])
+    return transferred
+
+
+def prune_to_core(
+    raw_dir: Path,
+    dest_dir: Path,
+    strategy: str = DEFAULT_PRUNE_STRATEGY,
+    incremental: bool = True,
+    jobs: int = 1,
+) -> tuple[bool, dict | None]:
     """
     Copy only the core packages from raw_dir to dest_dir.
     Packages are defined in config_impl.CORE_PACKAGE_PATHS.
-    Returns (True, {"files": N, "source_subdir": "sources"|"."}) or (False, None) if not found.
+    strategy: one of PRUNE_STRATEGIES. incremental: keep dest_dir and only touch files whose
+    size or mtime changed, removing files a previous sync placed that raw no longer has (see
+    _remove_stale and the sync manifest); False rebuilds dest_dir from scratch (callers check
+    moved_only_copies first: it deletes files that exist nowhere else).
+    jobs > 1: collect the files to transfer during the walk, then transfer them with a bounded
+    thread pool (useful when a real copy is unavoidable, e.g. across filesystems or Docker volumes).
+    Each core tree is walked once; copying and stats happen in that same walk.
+    Returns (True, {"files": N, "source_subdir": "sources"|".", "strategy", "transferred": {method: n},
+    "unchanged", "removed", "bytes", "seconds", "jobs"}) or (False, None) if not found.
     """
-    if dest_dir.exists():
-        shutil.rmtree(dest_dir)
+    started = time.perf_counter()
+    jobs = max(1, min(int(jobs), MAX_PRUNE_JOBS))
+    if not incremental:
+        if dest_dir.exists():
+            shutil.rmtree(dest_dir)
+        sync_manifest_path(dest_dir).unlink(missing_ok=True)
     dest_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_sync_manifest(dest_dir) if incremental else {}
+    synced: dict[str, str] = {}
+    placed = "moved" if strategy == "move" else "synced"
 
+    transfer = FileTransfer(strategy)
     found_any = False
     total_files = 0
     detected_subdir = "."
+    transferred: dict[str, int] = {}
+    unchanged = 0
+    removed = 0
+    transferred_bytes = 0
+    # Parallel mode: (target_dir, [(src, tgt), ...]) per source directory
+    batches: list[tuple[Path, list[tuple[Path, Path]]]] = []
 
     for core_rel in config_impl.CORE_PACKAGE_PATHS:
         source_core = None
@@ -38,50 +281,139 @@ def prune_to_core(raw_dir: Path, dest_dir: Path) -> tuple[bool, dict | None]:
                 source_core = candidate
                 source_subdir = sub or "."
                 break
-        
+
+        target = dest_dir / core_rel
+        raw_files = 0
         if source_core:
             found_any = True
             detected_subdir = source_subdir
-            target = dest_dir / core_rel
-            all_files = [p for p in source_core.rglob("*") if p.is_file()]
-            for src in tqdm(all_files, unit=" files", desc=f"Pruning {core_rel}", file=sys.stderr, colour="blue"):
-                rel = src.relative_to(source_core)
-                tgt = target / rel
-                tgt.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, tgt)
-            
-            total_files += sum(1 for _ in source_core.rglob("*.java"))
+            with tqdm(unit=" files", desc=f"Pruning {core_rel}", file=sys.stderr, colour="blue") as pbar:
+                for dirpath, _dirnames, filenames in os.walk(source_core):
+                    src_dir = Path(dirpath)
+                    rel_dir = src_dir.relative_to(source_core)
+                    tgt_dir = target / rel_dir
+                    rel_prefix = core_rel if rel_dir == Path(".") else f"{core_rel}/{rel_dir.as_posix()}"
+                    made_dir = False
+                    pending: list[tuple[Path, Path]] = []
+                    for name in filenames:
+                        src = src_dir / name
+                        tgt = tgt_dir / name
+                        raw_files += 1
+                        if name.endswith(".java"):
+                            total_files += 1
+                        src_stat = src.stat()
+                        if incremental and _is_unchanged(src_stat, tgt):
+                            synced[f"{rel_prefix}/{name}"] = "synced"
+                            unchanged += 1
+                            pbar.update(1)
+                            continue
+                        synced[f"{rel_prefix}/{name}"] = placed
+                        transferred_bytes += src_stat.st_size
+                        if jobs > 1:
+                            pending.append((src, tgt))
+                            continue
+                        if not made_dir:
+                            tgt_dir.mkdir(parents=True, exist_ok=True)
+                            made_dir = True
+                        method = transfer(src, tgt)
+                        transferred[method] = transferred.get(method, 0) + 1
+                        pbar.update(1)
+                    if pending:
+                        batches.append((tgt_dir, pending))
+                if batches:
+                    for method, n in _run_parallel(transfer, batches, jobs, pbar).items():
+                        transferred[method] = transferred.get(method, 0) + n
+                    batches = []
+        if incremental:
+            removed += _remove_stale(dest_dir, core_rel, previous, synced, raw_files > 0)
 
     if not found_any:
         return (False, None)
+    save_sync_manifest(dest_dir, synced)
 
-    return (True, {"files": total_files, "source_subdir": detected_subdir})
+    return (True, {
+        "files": total_files,
+        "source_subdir": detected_subdir,
+        "strategy": strategy,
+        "transferred": transferred,
+        "unchanged": unchanged,
+        "removed": removed,
+        "bytes": transferred_bytes,
+        "seconds": time.perf_counter() - started,
+        "jobs": jobs,
+    })
 
 
-def run_prune_only_for_version(root: Path | None, version: str) -> tuple[bool, str]:
+def format_transfer_stats(stats: dict) -> str:
+    """'hardlink=120, copy=3' style summary of stats["transferred"] (or '-' if nothing moved)."""
+    transferred = stats.get("transferred") or {}
+    return ", ".join(f"{k}={v}" for k, v in sorted(transferred.items())) or "-"
+
+
+def format_throughput(stats: dict) -> tuple[str, str]:
+    """(files/s, MB/s) strings for the files transferred in a prune_to_core run."""
+    seconds = max(stats.get("seconds") or 0.0, 1e-6)
+    files = sum((stats.get("transferred") or {}).values())
+    return (f"{files / seconds:.0f}", f"{stats.get('bytes', 0) / seconds / (1024 * 1024):.1f}")
+
+
+def run_prune_only_for_version(
+    root: Path | None,
+    version: str,
+    strategy: str | None = None,
+    incremental: bool = True,
+    jobs: int | None = None,
+) -> tuple[bool, str]:
     """
     Run only the prune: copy com/hypixel/hytale from decompiled_raw/<version> to decompiled/<version>.
-    Returns (True, "") or (False, "no_raw"|"prune_failed").
+    strategy=None uses prune_strategy from .prism.json (default "auto"); jobs=None uses prune_jobs (default 1).
+    incremental=False is refused while decompiled/<version> holds moved files raw lacks (see moved_only_copies).
+    Returns (True, "") or (False, "no_raw"|"prune_failed"|"full_after_move").
     """
     from .. import i18n
 
     root = root or config_impl.get_project_root()
+    strategy = strategy or config_impl.get_prune_strategy_from_config(root)
+    jobs = jobs if jobs is not None else config_impl.get_prune_jobs_from_config(root)
     raw_dir = config_impl.get_decompiled_raw_dir(root, version)
     decompiled_dir = config_impl.get_decompiled_dir(root, version)
     if not raw_dir.is_dir():
         return (False, "no_raw")
+    if not incremental:
+        moved = moved_only_copies(raw_dir, decompiled_dir)
+        if moved:
+            print(i18n.t("cli.prune.moved_only_copies", count=len(moved), dest=decompiled_dir, example=moved[0]), file=sys.stderr)
+            return (False, "full_after_move")
     print(i18n.t("cli.prune.running", version=version, raw_dir=raw_dir))
-    ok, stats = prune_to_core(raw_dir, decompiled_dir)
+    ok, stats = prune_to_core(raw_dir, decompiled_dir, strategy=strategy, incremental=incremental, jobs=jobs)
     if not ok:
         print(i18n.t("cli.prune.no_core", raw_dir=raw_dir), file=sys.stderr)
         return (False, "prune_failed")
     print(i18n.t("cli.prune.done", files=stats["files"], dest=decompiled_dir, subdir=stats["source_subdir"]))
+    print(i18n.t(
+        "cli.prune.sync_stats",
+        strategy=stats["strategy"],
+        transferred=format_transfer_stats(stats),
+        unchanged=stats["unchanged"],
+        removed=stats["removed"],
+    ))
+    files_per_s, mb_per_s = format_throughput(stats)
+    print(i18n.t(
+        "cli.prune.throughput",
+        seconds=f"{stats['seconds']:.2f}",
+        files_per_s=files_per_s,
+        mb_per_s=mb_per_s,
+        jobs=stats["jobs"],
+    ))
     return (True, "")
 
 
 def run_prune_only(
     root: Path | None = None,
     versions: list[str] | None = None,
+    strategy: str | None = None,
+    incremental: bool = True,
+    jobs: int | None = None,
 ) -> tuple[bool, str]:
     """
     Run only the prune for one or more versions.
@@ -96,7 +428,7 @@ def run_prune_only(
         if not versions:
             return (False, "no_raw")
     for version in versions:
-        ok, err = run_prune_only_for_version(root, version)
+        ok, err = run_prune_only_for_version(root, version, strategy=strategy, incremental=incremental, jobs=jobs)
         if not ok:
             return (False, err)
     return (True, "")
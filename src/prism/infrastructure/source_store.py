@@ -0,0 +1,217 @@
+# SourceStore implementations: the decompiled directory tree or one packed archive per version.
+
+import mmap
+import os
+import posixpath
+import struct
+import threading
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+from . import config_impl
+
+# Values for the "source_store" config key
+SOURCE_STORE_MODES = ("auto", "directory", "packed")
+DEFAULT_SOURCE_STORE_MODE = "auto"
+
+# Local file header: signature, ..., name length (offset 26), extra length (offset 28)
+_LOCAL_HEADER = struct.Struct("<4s22xHH")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+def normalize_rel_path(rel_path: str) -> str | None:
+    """POSIX relative path without '..' escapes; None if it would leave the source root."""
+    p = (rel_path or "").strip().replace("\\", "/").lstrip("/")
+    if not p:
+        return None
+    p = posixpath.normpath(p)
+    if p == ".." or p.startswith("../") or p == ".":
+        return None
+    return p
+
+
+class DirectorySourceStore:
+    """Sources as files under decompiled/<version>."""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = base_dir
+
+    def exists(self) -> bool:
+        return self.base_dir.is_dir()
+
+    def iter_files(self, suffix: str = ".java") -> Iterator[str]:
+        # Stable order (sorted per directory) so offset/cursor pages of find_usages line up
+        base = str(self.base_dir)
+        for dirpath, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            rel_dir = os.path.relpath(dirpath, base).replace(os.sep, "/")
+            for name in sorted(filenames):
+                if name.endswith(suffix):
+                    yield name if rel_dir == "." else f"{rel_dir}/{name}"
+
+    def _path(self, rel_path: str) -> Path | None:
+        p = normalize_rel_path(rel_path)
+        if not p:
+            return None
+        base = self.base_dir.resolve()
+        full = (base / p).resolve()
+        return full if full.is_relative_to(base) else None
+
+    def is_file(self, rel_path: str) -> bool:
+        path = self._path(rel_path)
+        return path is not None and path.is_file()
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        path = self._path(rel_path)
+        if path is None:
+            raise FileNotFoundError(rel_path)
+        return path.read_bytes()
+
+    def read_text(self, rel_path: str) -> str:
+        return self.read_bytes(rel_path).decode("utf-8", errors="replace")
+
+
+class PackedSourceStore:
+    """
+    Sources packed in one zip archive (see pack_sources). The central directory is read once into
+    an offset table; entries are then sliced straight out of an mmap of the archive and inflated,
+    so reads need no per-file open/seek and are safe to run from several threads.
+    """
+
+    def __init__(self, archive_path: Path):
+        self.archive_path = archive_path
+        self._file = None
+        self._mm: mmap.mmap | None = None
+        # name -> (header_offset, compress_type, compress_size)
+        self._entries: dict[str, tuple[int, int, int]] = {}
+        if archive_path.is_file():
+            self._open()
+
+    def _open(self) -> None:
+        with zipfile.ZipFile(self.archive_path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    self._entries[info.filename] = (info.header_offset, info.compress_type, info.compress_size)
+        self._file = open(self.archive_path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def exists(self) -> bool:
+        return self._mm is not None
+
+    def iter_files(self, suffix: str = ".java") -> Iterator[str]:
+        for name in self._entries:
+            if name.endswith(suffix):
+                yield name
+
+    def is_file(self, rel_path: str) -> bool:
+        p = normalize_rel_path(rel_path)
+        return p is not None and p in self._entries
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        p = normalize_rel_path(rel_path)
+        entry = self._entries.get(p) if p else None
+        if entry is None or self._mm is None:
+            raise FileNotFoundError(rel_path)
+        header_offset, compress_type, compress_size = entry
+        sig, name_len, extra_len = _LOCAL_HEADER.unpack_from(self._mm, header_offset)
+        if sig != _LOCAL_HEADER_SIGNATURE:
+            raise OSError(f"corrupt source archive entry: {rel_path}")
+        start = header_offset + _LOCAL_HEADER.size + name_len + extra_len
+        data = self._mm[start : start + compress_size]
+        if compress_type == zipfile.ZIP_STORED:
+            return data
+        if compress_type == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+        raise OSError(f"unsupported compression in source archive: {compress_type}")
+
+    def read_text(self, rel_path: str) -> str:
+        return self.read_bytes(rel_path).decode("utf-8", errors="replace")
+
+
+# Open packed stores, keyed by archive path; reused while (size, mtime) is unchanged
+_packed_cache: dict[Path, tuple[tuple[int, int], PackedSourceStore]] = {}
+_packed_lock = threading.Lock()
+
+
+def _get_packed_store(archive_path: Path) -> PackedSourceStore | None:
+    try:
+        st = archive_path.stat()
+    except OSError:
+        return None
+    sig = (st.st_size, st.st_mtime_ns)
+    with _packed_lock:
+        cached = _packed_cache.get(archive_path)
+        if cached and cached[0] == sig:
+            return cached[1]
+        store = PackedSourceStore(archive_path)
+        # The previous store may still serve an in-flight read; it is closed when garbage collected
+        _packed_cache[archive_path] = (sig, store)
+        return store
+
+
+def clear_cache() -> None:
+    """Forgets every open packed store (e.g. after repacking or when the index generation changes)."""
+    with _packed_lock:
+        _packed_cache.clear()
+
+
+def _is_empty_dir(path: Path) -> bool:
+    """True if path is missing or has no entries (ctx detect creates empty version dirs)."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is None
+    except OSError:
+        return True
+
+
+def open_source_store(decompiled_dir: Path, archive_path: Path, mode: str = DEFAULT_SOURCE_STORE_MODE):
+    """
+    SourceStore for one version. mode "directory" / "packed" forces one backend; "auto" uses the
+    directory tree when it has content and falls back to the packed archive (e.g. in a slim Docker image).
+    """
+    if mode == "packed" or (mode == "auto" and _is_empty_dir(decompiled_dir)):
+        packed = _get_packed_store(archive_path)
+        if packed is not None:
+            return packed
+    return DirectorySourceStore(decompiled_dir)
+
+
+def open_version_store(root: Path | None, version: str):
+    """SourceStore for a version as configured (source_store key in .prism.json)."""
+    return open_source_store(
+        config_impl.get_decompiled_dir(root, version),
+        config_impl.get_source_archive_path(root, version),
+        config_impl.get_source_store_mode_from_config(root),
+    )
+
+
+def pack_sources(decompiled_dir: Path, archive_path: Path) -> dict:
+    """
+    Packs every file under decompiled_dir into archive_path (zip, deflate, entries sorted by path
+    so packages stay contiguous). Written to a temp file and renamed, so readers never see a
+    partial archive. Returns {"files", "bytes", "packed_bytes"}.
+    """
+    store = DirectorySourceStore(decompiled_dir)
+    names = sorted(store.iter_files(""))
+    tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    total = 0
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for name in names:
+            src = decompiled_dir / name
+            total += src.stat().st_size
+            zf.write(src, name)
+    os.replace(tmp_path, archive_path)
+    clear_cache()
+    return {"files": len(names), "bytes": total, "packed_bytes": archive_path.stat().st_size}
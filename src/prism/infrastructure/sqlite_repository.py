@@ -7,7 +7,18 @@ from . import db as _db
 
 
 class SqliteIndexRepository:
-    """Implements IndexRepository using the existing db module."""
+    """
+    Implements IndexRepository using the existing db module. With a pool (see db_pool), reads
+    reuse pooled read-only connections that follow index rebuilds; otherwise each call opens one.
+    """
+
+    def __init__(self, pool=None):
+        self.pool = pool
+
+    def _connection(self, db_path: Path):
+        if self.pool is not None:
+            return self.pool.connection(db_path)
+        return _db.connection(db_path)
 
     def search(
         self,
@@ -17,10 +28,11 @@ class SqliteIndexRepository:
         package_prefix: str | None = None,
         kind: str | None = None,
         unique_classes: bool = False,
+        offset: int = 0,
     ) -> list:
         if not query_term or not query_term.strip():
             return []
-        with _db.connection(db_path) as conn:
+        with self._connection(db_path) as conn:
             rows = _db.search_fts(
                 conn,
                 query_term.strip(),
@@ -28,6 +40,7 @@ class SqliteIndexRepository:
                 package_prefix=package_prefix,
                 kind=kind,
                 unique_classes=unique_classes,
+                offset=offset,
             )
         if unique_classes:
             return list(rows)
@@ -47,13 +60,13 @@ class SqliteIndexRepository:
         ]
 
     def get_class_and_methods(self, db_path: Path, package: str, class_name: str) -> dict | None:
-        with _db.connection(db_path) as conn:
+        with self._connection(db_path) as conn:
             return _db.get_class_and_methods(conn, package.strip(), class_name.strip())
 
     def get_method(
         self, db_path: Path, package: str, class_name: str, method_name: str
     ) -> dict | None:
-        with _db.connection(db_path) as conn:
+        with self._connection(db_path) as conn:
             return _db.get_method(conn, package.strip(), class_name.strip(), method_name.strip())
 
     def list_classes(
@@ -64,11 +77,35 @@ class SqliteIndexRepository:
         limit: int = 100,
         offset: int = 0,
     ) -> list[dict]:
-        with _db.connection(db_path) as conn:
+        with self._connection(db_path) as conn:
             return _db.list_classes(
                 conn, package_prefix, prefix_match=prefix_match, limit=limit, offset=offset
             )
 
     def get_stats(self, db_path: Path) -> tuple[int, int, int]:
-        with _db.connection(db_path) as conn:
+        with self._connection(db_path) as conn:
             return _db.get_stats(conn)
+
+    def get_build_info(self, db_path: Path) -> dict | None:
+        with self._connection(db_path) as conn:
+            return _db.read_build_info(conn)
+
+    def get_grep_candidates(self, db_path: Path, literals: list[str]) -> list[str] | None:
+        if not db_path.is_file():
+            return None
+        with self._connection(db_path) as conn:
+            return _db.grep_candidates(conn, literals)
+
+    def get_api_diff(
+        self,
+        db_path: Path,
+        package_prefix: str | None = None,
+        change: str | None = None,
+        member_kind: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[list[dict], int, dict] | None:
+        with self._connection(db_path) as conn:
+            return _db.query_api_diff(
+                conn, package_prefix, change=change, member_kind=member_kind, limit=limit, offset=offset
+            )
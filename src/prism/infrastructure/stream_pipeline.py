@@ -0,0 +1,282 @@
+# Streaming init: prune and index core files while JADX is still writing them.
+
+import os
+import queue
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+from . import api_diff
+from . import build_info
+from . import config_impl
+from . import db
+from . import db_optimize
+from . import decompile
+from . import extractor
+from . import prune
+
+# Seconds between scans of the JADX output directory
+STREAM_POLL_SECONDS = 0.5
+
+
+class _CoreFileWatcher(threading.Thread):
+    """
+    Polls the raw JADX output for core files. A file counts as finished once its size and
+    mtime are unchanged between two scans; finished files are placed in dest_dir with the prune
+    strategy (see prune.FileTransfer) and their new path is put on out_queue. A file that still
+    changes after being placed (JADX was not done with it) is placed and queued again, also once
+    JADX has exited if the placed copy differs from what was queued. Transfers that fail in the
+    last scan are listed in failed. The placed files are added to the sync manifest of dest_dir,
+    so a later ctx prune syncs them like its own (see prune._remove_stale).
+    """
+
+    def __init__(self, raw_dir: Path, dest_dir: Path, out_queue: queue.Queue, strategy: str = "move"):
+        super().__init__(name="prism-stream-watcher", daemon=True)
+        self.raw_dir = raw_dir
+        self.dest_dir = dest_dir
+        self.out_queue = out_queue
+        self.transfer = prune.FileTransfer(strategy)
+        self.jadx_done = threading.Event()
+        self.files_moved = 0
+        self.failed: list[str] = []
+        self.source_subdir: str | None = None
+        self._seen: dict[Path, tuple[int, int]] = {}
+        # Sources already placed, by (size, mtime): strategies other than move leave them in raw
+        self._done: dict[Path, tuple[int, int]] = {}
+        self._placed: dict[str, str] = {}
+        # Queued targets with their (size, mtime) at that moment
+        self._queued: dict[Path, tuple[int, int]] = {}
+
+    def _core_roots(self) -> list[tuple[str, Path]]:
+        """(core_rel, source_core) pairs that exist in raw_dir, honouring PRUNE_SOURCE_CANDIDATES."""
+        roots = []
+        for core_rel in config_impl.CORE_PACKAGE_PATHS:
+            for sub in prune.PRUNE_SOURCE_CANDIDATES:
+                candidate = (self.raw_dir / sub / core_rel) if sub else (self.raw_dir / core_rel)
+                if candidate.is_dir():
+                    if self.source_subdir is None:
+                        self.source_subdir = sub or "."
+                    roots.append((core_rel, candidate))
+                    break
+        return roots
+
+    def _scan(self, final: bool) -> None:
+        """One pass over the core directories; final=True places every file regardless of age."""
+        for core_rel, source_core in self._core_roots():
+            for dirpath, _dirnames, filenames in os.walk(source_core):
+                for name in filenames:
+                    src = Path(dirpath) / name
+                    try:
+                        st = src.stat()
+                    except OSError:
+                        continue  # Moved or still being created
+                    sig = (st.st_size, st.st_mtime_ns)
+                    if self._done.get(src) == sig:
+                        continue
+                    if not final and self._seen.get(src) != sig:
+                        self._seen[src] = sig
+                        continue
+                    tgt = self.dest_dir / core_rel / src.relative_to(source_core)
+                    rel = tgt.relative_to(self.dest_dir).as_posix()
+                    try:
+                        tgt.parent.mkdir(parents=True, exist_ok=True)
+                        self.transfer(src, tgt)
+                    except OSError:
+                        if final:
+                            self.failed.append(rel)
+                        continue  # Otherwise retried on the next scan
+                    self._seen.pop(src, None)
+                    placed = "moved" if self.transfer.strategy == "move" else "synced"
+                    if placed == "synced":
+                        self._done[src] = sig
+                    if rel not in self._placed:
+                        self.files_moved += 1
+                    self._placed[rel] = placed
+                    self._queue(tgt)
+
+    def _queue(self, tgt: Path) -> None:
+        """Puts a placed .java on out_queue and remembers its (size, mtime) for _requeue_changed."""
+        if tgt.suffix != ".java":
+            return
+        try:
+            st = tgt.stat()
+        except OSError:
+            return
+        self._queued[tgt] = (st.st_size, st.st_mtime_ns)
+        self.out_queue.put(tgt)
+
+    def _requeue_changed(self) -> None:
+        """Queues again the targets that changed after being queued (e.g. a moved file JADX kept writing)."""
+        for tgt, sig in list(self._queued.items()):
+            try:
+                st = tgt.stat()
+            except OSError:
+                continue
+            if (st.st_size, st.st_mtime_ns) != sig:
+                self._queue(tgt)
+
+    def run(self) -> None:
+        try:
+            while not self.jadx_done.wait(STREAM_POLL_SECONDS):
+                self._scan(final=False)
+            self._scan(final=True)
+            self._requeue_changed()
+        finally:
+            if self._placed:
+                prune.save_sync_manifest(self.dest_dir, {**prune.load_sync_manifest(self.dest_dir), **self._placed})
+            self.out_queue.put(None)
+
+
+class _IndexWorker(threading.Thread):
+    """
+    Consumes .java paths from in_queue and indexes them into db_path until a None sentinel.
+    A path that comes again replaces the rows of its previous version (see db.delete_source_file).
+    db_path is the unfinished build file (see db.begin_build); the caller swaps it in.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        decompiled_dir: Path,
+        in_queue: queue.Queue,
+        reuse: extractor.ExtractionReuse | None = None,
+        fts_profile: str = db.DEFAULT_FTS_PROFILE,
+    ):
+        super().__init__(name="prism-stream-indexer", daemon=True)
+        self.db_path = db_path
+        self.decompiled_dir = decompiled_dir
+        self.in_queue = in_queue
+        self.reuse = reuse
+        self.fts_profile = fts_profile
+        self.stats: tuple[int, int, int] | None = None
+        self.files_indexed = 0
+        self.files_reindexed = 0
+        self.error: BaseException | None = None
+        # "extract" spans the whole JADX run: files are indexed as they are written
+        self.timer = build_info.PhaseTimer()
+
+    def run(self) -> None:
+        try:
+            with db.connection(self.db_path) as conn:
+                db.init_schema(conn, self.fts_profile)
+                db.clear_tables(conn)
+                indexed: set[str] = set()
+                with self.timer.phase("extract"):
+                    while True:
+                        jpath = self.in_queue.get()
+                        if jpath is None:
+                            break
+                        file_path = jpath.relative_to(self.decompiled_dir).as_posix()
+                        if file_path in indexed:
+                            db.delete_source_file(conn, file_path)
+                            self.files_reindexed += 1
+                        if not extractor.index_java_file(conn, jpath, self.decompiled_dir, self.reuse):
+                            continue
+                        if file_path in indexed:
+                            continue
+                        indexed.add(file_path)
+                        self.files_indexed += 1
+                        if self.files_indexed % extractor.BATCH_COMMIT_FILES == 0:
+                            conn.commit()
+                    if self.files_reindexed:
+                        # Drops the trigram rows of the replaced versions
+                        db.rebuild_source_grep(
+                            conn, lambda fp: (self.decompiled_dir / fp).read_text(encoding="utf-8", errors="replace")
+                        )
+                with self.timer.phase("signatures"):
+                    api_diff.build_member_signatures(conn)
+                    conn.commit()
+                self.stats = db.get_stats(conn)
+        except BaseException as e:  # Reported by the caller; keep draining so the watcher never blocks
+            self.error = e
+            while self.in_queue.get() is not None:
+                pass
+
+
+def run_streaming_init_for_version(
+    root: Path | None, version: str, fts_profile: str | None = None, strategy: str | None = None
+) -> tuple[bool, str | dict]:
+    """
+    Decompile, prune and index one version in a single streaming pass: JADX writes to
+    decompiled_raw/<version>, each finished core file is placed in decompiled/<version> and
+    queued for indexing while JADX keeps running. strategy: how files are placed (see
+    prune.PRUNE_STRATEGIES; None uses prune_strategy from .prism.json, "move" consumes the raw
+    output). fts_profile: as in extractor.run_index.
+    Returns (True, {"files", "source_subdir", "failed": [rel paths not placed], "stats": (classes,
+    methods, constants)}) or
+    (False, "no_jar"|"no_jadx"|"jadx_failed"|"prune_failed"|"no_decompiled"|"db_error").
+    """
+    from .. import i18n
+
+    root = root or config_impl.get_project_root()
+    resolved, err = decompile.resolve_jar_and_jadx(root, version)
+    if resolved is None:
+        return (False, err)
+    jar_path, jadx_bin = resolved
+
+    raw_dir = config_impl.get_decompiled_raw_dir(root, version)
+    decompiled_dir = config_impl.get_decompiled_dir(root, version)
+    # Stale files from a previous run would look "finished" immediately
+    for d in (raw_dir, decompiled_dir):
+        if d.exists():
+            shutil.rmtree(d)
+        d.mkdir(parents=True, exist_ok=True)
+    prune.sync_manifest_path(decompiled_dir).unlink(missing_ok=True)
+
+    files_queue: queue.Queue = queue.Queue()
+    opened = extractor.open_extraction_reuse(root, version)
+    watcher = _CoreFileWatcher(
+        raw_dir, decompiled_dir, files_queue, strategy or config_impl.get_prune_strategy_from_config(root)
+    )
+    db_path = config_impl.get_db_path(root, version)
+    indexer = _IndexWorker(
+        db.begin_build(db_path),
+        decompiled_dir,
+        files_queue,
+        opened[1] if opened else None,
+        fts_profile or config_impl.get_fts_profile_from_config(root),
+    )
+    try:
+        indexer.start()
+        watcher.start()
+        try:
+            ok, had_errors = decompile.run_jadx(
+                jar_path, raw_dir, jadx_bin, decompile.get_decompile_log_path(root, version)
+            )
+        finally:
+            watcher.jadx_done.set()
+            watcher.join()
+            indexer.join()
+            if opened:
+                opened[1].close()
+        if not ok:
+            return (False, "jadx_failed")
+        if had_errors:
+            print(i18n.t("cli.decompile.jadx_finished_with_errors"), file=sys.stderr)
+        if watcher.source_subdir is None:
+            print(i18n.t("cli.prune.no_core", raw_dir=raw_dir), file=sys.stderr)
+            return (False, "prune_failed")
+        if indexer.error is not None:
+            import traceback
+            traceback.print_exception(indexer.error)
+            return (False, "db_error")
+        if indexer.files_indexed == 0:
+            return (False, "no_decompiled")
+        timer = indexer.timer
+        with timer.phase("diff"):
+            api_diff.refresh_api_diff(root, version, indexer.db_path)
+        with timer.phase("optimize"):
+            db_optimize.optimize_after_index(indexer.db_path, version)
+        build_info.record_build(
+            indexer.db_path, indexer.stats, timer.phases, "sources", extractor.EXTRACTOR_VERSION, indexer.fts_profile, jar_path
+        )
+        db.commit_build(indexer.db_path, db_path)
+        return (True, {
+            "files": indexer.files_indexed,
+            "source_subdir": watcher.source_subdir,
+            "failed": watcher.failed,
+            "stats": indexer.stats,
+        })
+    finally:
+        db.abort_build(indexer.db_path)  # No-op once committed (the build file was renamed)
@@ -5,13 +5,17 @@ from pathlib import Path
 
 from ..domain.constants import VALID_SERVER_VERSIONS
 from . import config_impl
+from . import db
 
 
 def clean_db(root: Path | None = None) -> None:
     """
-    Deletes the SQLite databases from the workspace (prism_api_release.db and prism_api_prerelease.db).
-    Does not delete other files from the db directory.
+    Deletes the SQLite databases from the workspace (prism_api_release.db and prism_api_prerelease.db)
+    and the materialized build indexes (db/builds, regenerated on demand). The build archive
+    (prism_builds.db) and other files of the db directory are kept.
     """
+    from . import build_archive
+
     root = root or config_impl.get_project_root()
     db_dir = config_impl.get_db_dir(root)
     if not db_dir.is_dir():
@@ -20,13 +24,18 @@ def clean_db(root: Path | None = None) -> None:
         db_path = config_impl.get_db_path(root, version)
         if db_path.is_file():
             db_path.unlink()
+        db.abort_build(db.get_build_file_path(db_path))
+    shutil.rmtree(build_archive.get_build_cache_dir(root), ignore_errors=True)
 
 
 def clean_build(root: Path | None = None) -> None:
     """
-    Deletes build artifact directories: decompiled_raw/<version> and decompiled/<version>
-    for release and prerelease. Only deletes them if they exist.
+    Deletes build artifacts: decompiled_raw/<version>, decompiled/<version> and the packed
+    source archive (and the prune sync manifest) for release and prerelease, plus the shared object store and manifests
+    (ctx dedup). Only deletes them if they exist.
     """
+    from . import content_store, prune
+
     root = root or config_impl.get_project_root()
     for version in VALID_SERVER_VERSIONS:
         raw_dir = config_impl.get_decompiled_raw_dir(root, version)
@@ -35,6 +44,13 @@ def clean_build(root: Path | None = None) -> None:
         decompiled_dir = config_impl.get_decompiled_dir(root, version)
         if decompiled_dir.is_dir():
             shutil.rmtree(decompiled_dir)
+        prune.sync_manifest_path(decompiled_dir).unlink(missing_ok=True)
+        archive_path = config_impl.get_source_archive_path(root, version)
+        if archive_path.is_file():
+            archive_path.unlink()
+    for shared_dir in (content_store.get_objects_dir(root), content_store.get_manifests_dir(root)):
+        if shared_dir.is_dir():
+            shutil.rmtree(shared_dir)
 
 
 def reset_workspace(root: Path | None = None) -> None:
@@ -2,5 +2,6 @@
 
 from .config_provider import ConfigProvider
 from .index_repository import IndexRepository
+from .source_store import SourceStore
 
-__all__ = ["ConfigProvider", "IndexRepository"]
+__all__ = ["ConfigProvider", "IndexRepository", "SourceStore"]
@@ -3,11 +3,15 @@
 from pathlib import Path
 from typing import Protocol
 
+from .source_store import SourceStore
+
 
 class ConfigProvider(Protocol):
-    """Provides project root, DB path, decompiled dir and config dict."""
+    """Provides project root, DB path, decompiled dir, source store and config dict."""
 
     def get_project_root(self) -> Path: ...
     def get_db_path(self, root: Path | None, version: str | None) -> Path: ...
     def get_decompiled_dir(self, root: Path | None, version: str) -> Path: ...
+    def get_source_store(self, root: Path | None, version: str) -> SourceStore: ...
     def load_config(self, root: Path | None) -> dict: ...
+    def get_active_server(self, root: Path | None) -> str | None: ...
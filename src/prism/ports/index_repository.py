@@ -15,6 +15,7 @@ class IndexRepository(Protocol):
         package_prefix: str | None = None,
         kind: str | None = None,
         unique_classes: bool = False,
+        offset: int = 0,
     ) -> list[dict] | list[Any]: ...
     def get_class_and_methods(self, db_path: Path, package: str, class_name: str) -> dict | None: ...
     def get_method(self, db_path: Path, package: str, class_name: str, method_name: str) -> dict | None: ...
@@ -27,3 +28,14 @@ class IndexRepository(Protocol):
         offset: int = 0,
     ) -> list[dict]: ...
     def get_stats(self, db_path: Path) -> tuple[int, int, int]: ...
+    def get_build_info(self, db_path: Path) -> dict | None: ...
+    def get_grep_candidates(self, db_path: Path, literals: list[str]) -> list[str] | None: ...
+    def get_api_diff(
+        self,
+        db_path: Path,
+        package_prefix: str | None = None,
+        change: str | None = None,
+        member_kind: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> tuple[list[dict], int, dict] | None: ...
@@ -0,0 +1,13 @@
+# Port: read access to the pruned decompiled sources of one version.
+
+from typing import Iterator, Protocol
+
+
+class SourceStore(Protocol):
+    """Decompiled sources addressed by relative POSIX path (e.g. com/hypixel/hytale/Foo.java)."""
+
+    def exists(self) -> bool: ...
+    def iter_files(self, suffix: str = ".java") -> Iterator[str]: ...
+    def is_file(self, rel_path: str) -> bool: ...
+    def read_bytes(self, rel_path: str) -> bytes: ...
+    def read_text(self, rel_path: str) -> str: ...
@@ -0,0 +1,6 @@
+# Makes the prism package importable without installing it (as main.py does).
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,293 @@
+# Writes the .class fixtures next to their sources (com/hypixel/hytale/fixture/*.java).
+#
+# The classfiles mirror what javac --release 17 emits for those sources: Shapes with -g
+# (parameter names in the LocalVariableTable), Registry and its nested classes with -parameters
+# (MethodParameters). Method bodies are placeholders; classfile.py never reads bytecode.
+# Run from anywhere: python tests/fixtures/classfile/assemble.py
+
+import struct
+from pathlib import Path
+
+OUT_DIR = Path(__file__).resolve().parent / "com" / "hypixel" / "hytale" / "fixture"
+PKG = "com/hypixel/hytale/fixture/"
+MAJOR_JAVA_17 = 61
+
+# Placeholder body per return descriptor (value-less return, as in the .java files)
+_RETURN_CODE = {"V": b"\xb1", "J": b"\x09\xad", "F": b"\x0b\xae", "D": b"\x0e\xaf"}
+_RETURN_CODE.update(dict.fromkeys("IZCSB", b"\x03\xac"))
+
+
+class ClassWriter:
+    """Builds one classfile: constant pool entries are interned, members and attributes appended."""
+
+    def __init__(self, name: str, access: int, super_name: str | None, interfaces: tuple[str, ...] = ()):
+        self.pool: list[bytes] = [b""]  # Slot 0 is unused
+        self.index: dict[bytes, int] = {}
+        self.name = name
+        self.access = access
+        self.this_class = self.class_ref(name)
+        self.super_class = self.class_ref(super_name) if super_name else 0
+        self.interfaces = [self.class_ref(i) for i in interfaces]
+        self.fields: list[bytes] = []
+        self.methods: list[bytes] = []
+        self.attributes: list[bytes] = []
+
+    def _const(self, entry: bytes, wide: bool = False) -> int:
+        if entry not in self.index:
+            self.index[entry] = len(self.pool)
+            self.pool.append(entry)
+            if wide:
+                self.pool.append(b"")  # long/double take two slots
+        return self.index[entry]
+
+    def utf8(self, text: str) -> int:
+        raw = text.encode("utf-8")
+        return self._const(struct.pack(">BH", 1, len(raw)) + raw)
+
+    def class_ref(self, name: str) -> int:
+        return self._const(struct.pack(">BH", 7, self.utf8(name)))
+
+    def string(self, text: str) -> int:
+        return self._const(struct.pack(">BH", 8, self.utf8(text)))
+
+    def method_ref(self, owner: str, name: str, descriptor: str) -> int:
+        nat = self._const(struct.pack(">BHH", 12, self.utf8(name), self.utf8(descriptor)))
+        return self._const(struct.pack(">BHH", 10, self.class_ref(owner), nat))
+
+    def constant(self, descriptor: str, value) -> int:
+        if descriptor == "Ljava/lang/String;":
+            return self.string(value)
+        if descriptor == "J":
+            return self._const(struct.pack(">Bq", 5, value), wide=True)
+        if descriptor == "D":
+            return self._const(struct.pack(">Bd", 6, value), wide=True)
+        if descriptor == "F":
+            return self._const(struct.pack(">Bf", 4, value))
+        return self._const(struct.pack(">Bi", 3, int(value)))
+
+    def attribute(self, name: str, payload: bytes) -> bytes:
+        return struct.pack(">HI", self.utf8(name), len(payload)) + payload
+
+    def u2_attribute(self, name: str, index: int) -> bytes:
+        return self.attribute(name, struct.pack(">H", index))
+
+    def annotations(self, descriptors: tuple[str, ...]) -> bytes:
+        payload = struct.pack(">H", len(descriptors))
+        for desc in descriptors:
+            payload += struct.pack(">HH", self.utf8(desc), 0)
+        return self.attribute("RuntimeVisibleAnnotations", payload)
+
+    def _member(self, access: int, name: str, descriptor: str, attributes: list[bytes]) -> bytes:
+        head = struct.pack(">HHHH", access, self.utf8(name), self.utf8(descriptor), len(attributes))
+        return head + b"".join(attributes)
+
+    def field(self, access: int, name: str, descriptor: str, value=None, signature: str | None = None) -> None:
+        attributes = []
+        if value is not None:
+            attributes.append(self.u2_attribute("ConstantValue", self.constant(descriptor, value)))
+        if signature:
+            attributes.append(self.u2_attribute("Signature", self.utf8(signature)))
+        if access & 0x1000:
+            attributes.append(self.attribute("Synthetic", b""))
+        self.fields.append(self._member(access, name, descriptor, attributes))
+
+    def method(
+        self,
+        access: int,
+        name: str,
+        descriptor: str,
+        signature: str | None = None,
+        local_names: tuple[str, ...] | None = None,
+        parameters: tuple[tuple[str, int], ...] | None = None,
+        annotations: tuple[str, ...] = (),
+    ) -> None:
+        """
+        local_names: LocalVariableTable names by slot order, `this` included (javac -g).
+        parameters: (name, flags) MethodParameters entries (javac -parameters).
+        """
+        attributes = []
+        if not access & 0x0400:  # Not abstract: placeholder body
+            code = _RETURN_CODE.get(descriptor[descriptor.index(")") + 1], b"\x01\xb0")
+            if name == "<init>":
+                super_init = self.method_ref("java/lang/Object", "<init>", "()V")
+                code = b"\x2a\xb7" + struct.pack(">H", super_init) + b"\xb1"
+            code_attrs = []
+            if local_names is not None:
+                types = ([] if access & 0x0008 else [f"L{self.name};"]) + _param_descriptors(descriptor)
+                entries = list(zip(local_names, types))
+                table = struct.pack(">H", len(entries))
+                slot = 0
+                for local, desc in entries:
+                    table += struct.pack(">HHHHH", 0, len(code), self.utf8(local), self.utf8(desc), slot)
+                    slot += 2 if desc in ("J", "D") else 1
+                code_attrs.append(self.attribute("LocalVariableTable", table))
+            max_locals = len(_param_descriptors(descriptor)) + 2
+            payload = struct.pack(">HHI", 2, max_locals, len(code)) + code + struct.pack(">HH", 0, len(code_attrs))
+            attributes.append(self.attribute("Code", payload + b"".join(code_attrs)))
+        if parameters is not None:
+            payload = struct.pack(">B", len(parameters))
+            for param, flags in parameters:
+                payload += struct.pack(">HH", self.utf8(param), flags)
+            attributes.append(self.attribute("MethodParameters", payload))
+        if signature:
+            attributes.append(self.u2_attribute("Signature", self.utf8(signature)))
+        if "Ljava/lang/Deprecated;" in annotations:
+            attributes.append(self.attribute("Deprecated", b""))
+        if annotations:
+            attributes.append(self.annotations(annotations))
+        self.methods.append(self._member(access, name, descriptor, attributes))
+
+    def inner_classes(self, entries: tuple[tuple[str, str | None, str | None, int], ...]) -> None:
+        """(inner, outer, simple_name, access) entries; None for anonymous classes."""
+        payload = struct.pack(">H", len(entries))
+        for inner, outer, simple, access in entries:
+            payload += struct.pack(
+                ">HHHH",
+                self.class_ref(inner),
+                self.class_ref(outer) if outer else 0,
+                self.utf8(simple) if simple else 0,
+                access,
+            )
+        self.attributes.append(self.attribute("InnerClasses", payload))
+
+    def to_bytes(self, source_file: str, signature: str | None = None, extra: tuple[bytes, ...] = ()) -> bytes:
+        attributes = [self.u2_attribute("SourceFile", self.utf8(source_file))]
+        if signature:
+            attributes.append(self.u2_attribute("Signature", self.utf8(signature)))
+        attributes += list(extra) + self.attributes
+        body = struct.pack(">HHH", self.access, self.this_class, self.super_class)
+        body += struct.pack(">H", len(self.interfaces)) + b"".join(struct.pack(">H", i) for i in self.interfaces)
+        body += struct.pack(">H", len(self.fields)) + b"".join(self.fields)
+        body += struct.pack(">H", len(self.methods)) + b"".join(self.methods)
+        body += struct.pack(">H", len(attributes)) + b"".join(attributes)
+        pool = b"".join(self.pool)
+        return struct.pack(">IHHH", 0xCAFEBABE, 0, MAJOR_JAVA_17, len(self.pool)) + pool + body
+
+
+def _param_descriptors(descriptor: str) -> list[str]:
+    out = []
+    i = 1
+    while descriptor[i] != ")":
+        start = i
+        while descriptor[i] == "[":
+            i += 1
+        i = descriptor.index(";", i) + 1 if descriptor[i] == "L" else i + 1
+        out.append(descriptor[start:i])
+    return out
+
+
+def shapes() -> dict[str, bytes]:
+    cw = ClassWriter(PKG + "Shapes", 0x0021, PKG + "Base", ("java/lang/Comparable", "java/lang/Runnable"))
+    cw.field(0x0019, "MAX_SHAPES", "I", 64)
+    cw.field(0x0019, "TIMEOUT_MS", "J", 1500)
+    cw.field(0x0019, "SCALE", "F", 1.5)
+    cw.field(0x0019, "RATIO", "D", 0.25)
+    cw.field(0x0019, "ENABLED", "Z", 1)
+    cw.field(0x0019, "SEPARATOR", "C", ord(":"))
+    cw.field(0x0019, "NAME", "Ljava/lang/String;", "shapes")
+    cw.field(0x001A, "HIDDEN", "I", 3)
+    cw.field(0x0011, "size", "I", 4)
+    cw.method(0x0001, "<init>", "(I)V", local_names=("this", "size"))
+    cw.method(0x0001, "area", "(II)I", local_names=("this", "width", "height"))
+    cw.method(0x0001, "scaled", "(JI)J", local_names=("this", "value", "factor"))
+    cw.method(
+        0x0089, "join", "(Ljava/lang/String;[Ljava/lang/String;)Ljava/lang/String;",
+        local_names=("separator", "parts"),
+    )
+    cw.method(0x0001, "reset", "()V", local_names=("this",), annotations=("Ljava/lang/Deprecated;",))
+    cw.method(
+        0x0001, "names", "()Ljava/util/List;", "()Ljava/util/List<Ljava/lang/String;>;", local_names=("this",)
+    )
+    cw.method(0x0009, "counts", "([[J)[I", local_names=("grid",))
+    cw.method(0x0004, "hidden", "()V", local_names=("this",))
+    cw.method(0x0001, "compareTo", f"(L{PKG}Shapes;)I", local_names=("this", "other"))
+    cw.method(0x0001, "run", "()V", local_names=("this",))
+    cw.method(0x1041, "compareTo", "(Ljava/lang/Object;)I", local_names=("this",))  # Bridge
+    signature = f"L{PKG}Base;Ljava/lang/Comparable<L{PKG}Shapes;>;Ljava/lang/Runnable;"
+    return {"Shapes.class": cw.to_bytes("Shapes.java", signature)}
+
+
+def registry() -> dict[str, bytes]:
+    registry_name, mode, handle, hidden, anon = (
+        PKG + n for n in ("Registry", "Registry$Mode", "Registry$Handle", "Registry$Hidden", "Registry$1")
+    )
+    nest = (
+        (hidden, registry_name, "Hidden", 0x000A),
+        (handle, registry_name, "Handle", 0x0001),
+        (mode, registry_name, "Mode", 0x4019),
+        (anon, None, None, 0x0000),
+    )
+    out = {}
+
+    cw = ClassWriter(registry_name, 0x0021, "java/lang/Object", ("java/lang/Iterable",))
+    cw.field(0x0019, "KIND", "Ljava/lang/String;", "registry")
+    cw.field(0x0000, "task", "Ljava/lang/Runnable;")
+    cw.method(0x0001, "<init>", "()V", parameters=())
+    cw.method(
+        0x0001, "register", "(Ljava/lang/Comparable;Ljava/lang/Object;)Ljava/lang/Object;",
+        "<T:TV;>(TK;TT;)TT;", parameters=(("key", 0), ("value", 0)),
+    )
+    cw.method(
+        0x0001, "snapshot", "()Ljava/util/Map;", "()Ljava/util/Map<TK;Ljava/util/List<TV;>;>;", parameters=()
+    )
+    cw.method(
+        0x0089, "listOf", "([Ljava/lang/Object;)Ljava/util/List;",
+        "<E:Ljava/lang/Object;>([TE;)Ljava/util/List<TE;>;", parameters=(("items", 0),),
+    )
+    cw.method(0x0001, "iterator", "()Ljava/util/Iterator;", "()Ljava/util/Iterator<TV;>;", parameters=())
+    cw.method(
+        0x0001, "map", "(Ljava/util/function/Function;)Ljava/lang/Object;",
+        "<R:Ljava/lang/Object;>(Ljava/util/function/Function<-TV;+TR;>;)TR;", parameters=(("mapper", 0),),
+    )
+    cw.method(0x0000, "internal", "()V", parameters=())
+    cw.inner_classes(nest)
+    members = struct.pack(">H", 4) + b"".join(struct.pack(">H", cw.class_ref(c)) for c in (hidden, handle, mode, anon))
+    signature = "<K::Ljava/lang/Comparable<TK;>;V:Ljava/lang/Object;>Ljava/lang/Object;Ljava/lang/Iterable<TV;>;"
+    out["Registry.class"] = cw.to_bytes("Registry.java", signature, (cw.attribute("NestMembers", members),))
+
+    def nest_host(cw: ClassWriter) -> tuple[bytes, ...]:
+        return (cw.u2_attribute("NestHost", cw.class_ref(registry_name)),)
+
+    cw = ClassWriter(mode, 0x4031, "java/lang/Enum")
+    cw.field(0x4019, "FAST", f"L{mode};")
+    cw.field(0x4019, "SLOW", f"L{mode};")
+    cw.field(0x101A, "$VALUES", f"[L{mode};")
+    cw.method(0x0009, "values", f"()[L{mode};", parameters=())
+    cw.method(0x0009, "valueOf", f"(Ljava/lang/String;)L{mode};", parameters=(("name", 0x8000),))
+    cw.method(0x0002, "<init>", "(Ljava/lang/String;I)V", "()V", parameters=(("$enum$name", 0x1000), ("$enum$ordinal", 0x1000)))
+    cw.method(0x0001, "isFast", "()Z", parameters=())
+    cw.method(0x100A, "$values", f"()[L{mode};")
+    cw.method(0x0008, "<clinit>", "()V")
+    cw.inner_classes(((mode, registry_name, "Mode", 0x4019),))
+    out["Registry$Mode.class"] = cw.to_bytes("Registry.java", f"Ljava/lang/Enum<L{mode};>;", nest_host(cw))
+
+    cw = ClassWriter(handle, 0x0021, "java/lang/Object")
+    cw.field(0x1010, "this$0", f"L{registry_name};")
+    cw.method(0x0001, "<init>", f"(L{registry_name};)V", parameters=(("this$0", 0x8010),))
+    cw.method(0x0001, "key", "()Ljava/lang/Comparable;", "()TK;", parameters=())
+    cw.inner_classes(((handle, registry_name, "Handle", 0x0001),))
+    out["Registry$Handle.class"] = cw.to_bytes("Registry.java", None, nest_host(cw))
+
+    cw = ClassWriter(hidden, 0x0020, "java/lang/Object")
+    cw.method(0x0002, "<init>", "()V", parameters=())
+    cw.method(0x0001, "run", "()V", parameters=())
+    cw.inner_classes(((hidden, registry_name, "Hidden", 0x000A),))
+    out["Registry$Hidden.class"] = cw.to_bytes("Registry.java", None, nest_host(cw))
+
+    cw = ClassWriter(anon, 0x0020, "java/lang/Object", ("java/lang/Runnable",))
+    cw.field(0x1010, "this$0", f"L{registry_name};")
+    cw.method(0x0000, "<init>", f"(L{registry_name};)V", parameters=(("this$0", 0x8010),))
+    cw.method(0x0001, "run", "()V", parameters=())
+    cw.inner_classes(((anon, None, None, 0x0000),))
+    enclosing = cw.attribute("EnclosingMethod", struct.pack(">HH", cw.class_ref(registry_name), 0))
+    out["Registry$1.class"] = cw.to_bytes("Registry.java", None, (enclosing,) + nest_host(cw))
+    return out
+
+
+def main() -> None:
+    for name, data in {**shapes(), **registry()}.items():
+        (OUT_DIR / name).write_bytes(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+package com.hypixel.hytale.fixture;
+
+import java.util.Iterator;
+import java.util.List;
+import java.util.Map;
+import java.util.function.Function;
+
+public class Registry<K extends Comparable<K>, V> implements Iterable<V> {
+    public static final String KIND = "registry";
+    Runnable task = new Runnable() {
+        public void run() {
+        }
+    };
+
+    public <T extends V> T register(K key, T value) {
+        return null;
+    }
+
+    public Map<K, List<V>> snapshot() {
+        return null;
+    }
+
+    public static <E> List<E> listOf(E... items) {
+        return null;
+    }
+
+    public Iterator<V> iterator() {
+        return null;
+    }
+
+    public <R> R map(Function<? super V, ? extends R> mapper) {
+        return null;
+    }
+
+    void internal() {
+    }
+
+    public enum Mode {
+        FAST,
+        SLOW;
+
+        public boolean isFast() {
+            return false;
+        }
+    }
+
+    public class Handle {
+        public K key() {
+            return null;
+        }
+    }
+
+    private static class Hidden {
+        public void run() {
+        }
+    }
+}
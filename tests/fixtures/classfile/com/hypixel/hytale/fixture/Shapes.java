@@ -0,0 +1,52 @@
+package com.hypixel.hytale.fixture;
+
+import java.util.List;
+
+public class Shapes extends Base implements Comparable<Shapes>, Runnable {
+    public static final int MAX_SHAPES = 64;
+    public static final long TIMEOUT_MS = 1500L;
+    public static final float SCALE = 1.5f;
+    public static final double RATIO = 0.25;
+    public static final boolean ENABLED = true;
+    public static final char SEPARATOR = ':';
+    public static final String NAME = "shapes";
+    private static final int HIDDEN = 3;
+    public final int size = 4;
+
+    public Shapes(int size) {
+    }
+
+    public int area(int width, int height) {
+        return 0;
+    }
+
+    public long scaled(long value, int factor) {
+        return 0L;
+    }
+
+    public static String join(String separator, String... parts) {
+        return null;
+    }
+
+    @Deprecated
+    public void reset() {
+    }
+
+    public List<String> names() {
+        return null;
+    }
+
+    public static int[] counts(long[][] grid) {
+        return null;
+    }
+
+    protected void hidden() {
+    }
+
+    public int compareTo(Shapes other) {
+        return 0;
+    }
+
+    public void run() {
+    }
+}
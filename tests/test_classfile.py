@@ -0,0 +1,87 @@
+# Bytecode extraction (classfile) against the regex extractor, on the fixtures in
+# fixtures/classfile (sources plus the classfiles javac emits for them, see assemble.py).
+
+from pathlib import Path
+
+import pytest
+
+from prism.infrastructure import classfile, extractor
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "classfile" / "com" / "hypixel" / "hytale" / "fixture"
+PACKAGE = "com.hypixel.hytale.fixture"
+
+
+def bytecode_entry(class_file: str):
+    return classfile.to_api_entry(classfile.parse_class((FIXTURE_DIR / class_file).read_bytes()))
+
+
+def regex_rows(java_file: str) -> dict[str, tuple]:
+    rows = extractor._extract_from_java((FIXTURE_DIR / java_file).read_text(encoding="utf-8"), java_file)
+    return {row[1]: row for row in rows}
+
+
+def test_top_level_class_matches_regex_extractor():
+    # Constants of every primitive kind, varargs, LocalVariableTable names (long params take two
+    # slots), annotations; private/instance fields, protected methods and the bridge are dropped
+    file_path, row = bytecode_entry("Shapes.class")
+    assert file_path == "com/hypixel/hytale/fixture/Shapes.java"
+    assert row == regex_rows("Shapes.java")["Shapes"]
+
+
+@pytest.mark.parametrize("class_file, class_name", [
+    ("Registry$Mode.class", "Mode"),
+    ("Registry$Handle.class", "Handle"),
+])
+def test_nested_classes_match_regex_extractor(class_file, class_name):
+    file_path, row = bytecode_entry(class_file)
+    assert file_path == "com/hypixel/hytale/fixture/Registry.java"
+    assert row == regex_rows("Registry.java")[class_name]
+
+
+def test_enum_implicit_members_are_filtered():
+    _file_path, (_pkg, _name, kind, methods, parent, _interfaces, constants) = bytecode_entry("Registry$Mode.class")
+    assert kind == "enum"
+    assert parent is None
+    assert [m["method"] for m in methods] == ["isFast"]
+    assert constants == []
+
+
+@pytest.mark.parametrize("class_file", ["Registry$Hidden.class", "Registry$1.class"])
+def test_private_and_anonymous_classes_are_not_api(class_file):
+    assert bytecode_entry(class_file) is None
+
+
+def test_generic_signatures():
+    # The regex extractor does not match generic class declarations; the bytecode rows keep the
+    # exact signatures of generic methods, wildcards and generic varargs
+    file_path, row = bytecode_entry("Registry.class")
+    assert "Registry" not in regex_rows("Registry.java")
+    assert file_path == "com/hypixel/hytale/fixture/Registry.java"
+    method = lambda name, returns, params, is_static=False: {
+        "method": name, "returns": returns, "params": params, "is_static": is_static, "annotation": None,
+    }
+    assert row == (
+        PACKAGE,
+        "Registry",
+        "class",
+        [
+            method("register", "<T extends V> T", "K key, T value"),
+            method("snapshot", "Map<K, List<V>>", ""),
+            method("listOf", "<E> List<E>", "E... items", is_static=True),
+            method("iterator", "Iterator<V>", ""),
+            method("map", "<R> R", "Function<? super V, ? extends R> mapper"),
+        ],
+        None,
+        "Iterable",
+        [{"name": "KIND", "type": "String", "value": "registry"}],
+    )
+
+
+def test_class_type_parameters():
+    info = classfile.parse_class((FIXTURE_DIR / "Registry.class").read_bytes())
+    assert classfile.class_supertypes(info) == (["K extends Comparable<K>", "V"], None, ["Iterable<V>"])
+
+
+def test_rejects_non_classfile():
+    with pytest.raises(ValueError):
+        classfile.parse_class((FIXTURE_DIR / "Shapes.java").read_bytes())
@@ -0,0 +1,30 @@
+# Literal extraction for the trigram prefilter of prism_grep: every literal must occur in every match.
+
+import re
+
+import pytest
+
+from prism.application.grep import required_literals
+
+
+@pytest.mark.parametrize("pattern, text, expected", [
+    (r"getPlayerInventory", "getPlayerInventory", ["getPlayerInventory"]),
+    (r"\x67etPlayerInventory", "getPlayerInventory", ["etPlayerInventory"]),
+    (r"\x41BC", "ABC", ["BC"]),
+    (r"\u0067etPlayer", "getPlayer", ["etPlayer"]),
+    (r"\U00000067etPlayer", "getPlayer", ["etPlayer"]),
+    (r"\N{LATIN SMALL LETTER G}etPlayer", "getPlayer", ["etPlayer"]),
+    (r"\012return", "\nreturn", ["return"]),
+    (r"\0return", "\0return", ["return"]),
+    (r"(get)\1Player", "getgetPlayer", ["Player"]),
+    (r"foo\.bar\(\)", "foo.bar()", ["foo.bar()"]),
+    (r"\bPlayer\w+", "PlayerRef", ["Player"]),
+    (r"get(Player|Entity)Ref", "getEntityRef", ["get", "Ref"]),
+    (r"colou?r", "color", ["colo", "r"]),
+    (r"Player|Entity", "Entity", []),
+])
+def test_literals_occur_in_every_match(pattern, text, expected):
+    assert re.search(pattern, text)
+    literals = required_literals(pattern)
+    assert literals == expected
+    assert all(lit in text for lit in literals)